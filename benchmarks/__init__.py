@@ -0,0 +1 @@
+"""Standalone performance benchmarks; run with ``python -m benchmarks.<name>``."""
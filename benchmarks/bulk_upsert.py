@@ -0,0 +1,94 @@
+"""Benchmark: 作业曲目批量入库 (50k music_id)。
+
+对比旧实现（单条 INSERT ... VALUES 覆盖整个歌单）与分块 executemany + 流式读取：
+
+    python -m benchmarks.bulk_upsert --count 50000
+
+旧实现每行 4 个绑定变量，50k 行即 200k 个变量；在 SQLITE_MAX_VARIABLE_NUMBER
+较小的 SQLite 构建上会直接失败，此时结果中记为 FAILED。
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import tempfile
+import time
+from pathlib import Path
+
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from ncm.data.models.base import Base
+from ncm.data.models.download_job import DownloadJob
+from ncm.data.models.download_task import DownloadTask
+from ncm.data.repositories.async_download_task_repo import AsyncDownloadTaskRepository
+
+
+async def _prepare(db_path: Path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{db_path}")
+    async with engine.begin() as conn:
+        await conn.exec_driver_sql("PRAGMA journal_mode=WAL;")
+        await conn.run_sync(Base.metadata.create_all)
+    factory = async_sessionmaker(engine, expire_on_commit=False)
+    async with factory() as session:
+        job = DownloadJob(job_name="bench", job_type="playlist", source_type="playlist",
+                          source_id="0", storage_path="/tmp")
+        session.add(job)
+        await session.commit()
+        job_id = job.id
+    return engine, factory, job_id
+
+
+async def bench_legacy(db_path: Path, music_ids: list[str]) -> float:
+    engine, factory, job_id = await _prepare(db_path)
+    try:
+        start = time.perf_counter()
+        async with factory() as session:
+            data = [{"music_id": mid, "job_id": job_id, "progress_flags": 0, "status": "pending"} for mid in music_ids]
+            stmt = insert(DownloadTask).values(data).on_conflict_do_nothing(index_elements=["job_id", "music_id"])
+            await session.execute(stmt)
+            await session.commit()
+        return time.perf_counter() - start
+    finally:
+        await engine.dispose()
+
+
+async def bench_chunked(db_path: Path, music_ids: list[str], chunk_size: int) -> tuple[float, int]:
+    engine, factory, job_id = await _prepare(db_path)
+    repo = AsyncDownloadTaskRepository()
+    try:
+        start = time.perf_counter()
+        for i in range(0, len(music_ids), chunk_size):
+            async with factory() as session:
+                await repo.upsert_music_ids(session, job_id, music_ids[i:i + chunk_size])
+                await session.commit()
+        pending = 0
+        async with factory() as session:
+            async for _ in repo.stream_pending_by_job(session, job_id):
+                pending += 1
+        return time.perf_counter() - start, pending
+    finally:
+        await engine.dispose()
+
+
+async def main(count: int, chunk_size: int) -> None:
+    music_ids = [str(1_000_000 + i) for i in range(count)]
+    with tempfile.TemporaryDirectory() as tmp:
+        try:
+            legacy = f"{await bench_legacy(Path(tmp) / 'legacy.sqlite', music_ids):.3f}s"
+        except Exception as e:
+            legacy = f"FAILED ({type(e).__name__})"
+        chunked, pending = await bench_chunked(Path(tmp) / "chunked.sqlite", music_ids, chunk_size)
+
+    print(f"ids={count} chunk_size={chunk_size}")
+    print(f"legacy single INSERT ... VALUES : {legacy}")
+    print(f"chunked executemany + stream    : {chunked:.3f}s (pending={pending})")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=50_000)
+    parser.add_argument("--chunk-size", type=int, default=500)
+    args = parser.parse_args()
+    asyncio.run(main(args.count, args.chunk_size))
@@ -0,0 +1,141 @@
+"""Benchmark: 请求加密与 EAPI 响应解密的吞吐量。
+
+对比旧实现（每次请求生成新密钥、解析 RSA 公钥、新建 cipher 对象、json.dumps 临时编码器）
+与当前实现（密钥按周期轮换、RSA 公钥与 ECB cipher 缓存、复用 JSON 编码器）：
+
+    python -m benchmarks.crypto --seconds 1
+
+每项在给定时长内循环执行，输出每秒操作数 (ops/s)。
+"""
+
+from __future__ import annotations
+
+import argparse
+import base64
+import hashlib
+import json
+import time
+from typing import Callable, Dict
+
+from Crypto.Cipher import AES
+from Crypto.PublicKey import RSA
+from Crypto.Util.Padding import pad, unpad
+from Crypto.Util.number import bytes_to_long, long_to_bytes
+
+from ncm.client.protocol import crypto
+from ncm.client.protocol.cookies import process_cookie
+from ncm.client.protocol.options import RequestOptions
+from ncm.core.config import get_config_manager
+
+# 典型请求参数：歌曲详情（WEAPI）与播放链接（EAPI）
+SONG_DETAIL = {"c": json.dumps([{"id": 1800000000 + i} for i in range(50)]), "csrf_token": "0" * 32}
+PLAY_URL = {"ids": "[1800000000]", "level": "lossless", "encodeType": "flac", "header": json.dumps({
+    "osver": "Microsoft-Windows-10", "deviceId": "0" * 32, "appver": "3.1.17.204416", "os": "pc",
+    "requestId": "1700000000000_0001", "__csrf": "",
+}), "e_r": True}
+# 约 50KB 的加密响应体，对应中等规模的歌单详情
+RESPONSE = {"code": 200, "songs": [
+    {"id": i, "name": f"Song {i}", "ar": [{"id": i, "name": f"Artist {i}"}], "al": {"id": i, "name": f"Album {i}"}}
+    for i in range(500)
+]}
+
+
+class Legacy:
+    """旧实现"""
+
+    @staticmethod
+    def _rsa(text: str) -> str:
+        key = RSA.import_key(crypto.RSA_PUBLIC_KEY)
+        c = pow(bytes_to_long(text.encode("iso-8859-1")), key.e, key.n)
+        return long_to_bytes(c, key.size_in_bytes()).hex()
+
+    @staticmethod
+    def _cbc(data: bytes, key: bytes) -> str:
+        return base64.b64encode(AES.new(key, AES.MODE_CBC, crypto.IV).encrypt(pad(data, 16))).decode()
+
+    @classmethod
+    def encrypt_weapi(cls, data: Dict) -> Dict[str, str]:
+        text = json.dumps(data, separators=(",", ":"), ensure_ascii=False)
+        secret_key = crypto._generate_random_string(16)
+        first = cls._cbc(text.encode(), crypto.PRESET_KEY)
+        second = cls._cbc(first.encode(), secret_key.encode())
+        return {"params": second, "encSecKey": cls._rsa(secret_key[::-1])}
+
+    @staticmethod
+    def encrypt_eapi(url: str, data: Dict) -> Dict[str, str]:
+        text = json.dumps(data, separators=(",", ":"), ensure_ascii=False)
+        digest = hashlib.md5(f"nobody{url}use{text}md5forencrypt".encode()).hexdigest()
+        data_string = f"{url}-36cd479b6b5-{text}-36cd479b6b5-{digest}"
+        encrypted = AES.new(crypto.EAPI_KEY, AES.MODE_ECB).encrypt(pad(data_string.encode(), 16))
+        return {"params": encrypted.hex().upper()}
+
+    @staticmethod
+    def decrypt_eapi_response(data: bytes) -> Dict:
+        return json.loads(unpad(AES.new(crypto.EAPI_KEY, AES.MODE_ECB).decrypt(data), 16).decode())
+
+
+def measure(fn: Callable[[], object], seconds: float) -> float:
+    fn()
+    count = 0
+    start = time.perf_counter()
+    deadline = start + seconds
+    while True:
+        for _ in range(50):
+            fn()
+        count += 50
+        now = time.perf_counter()
+        if now >= deadline:
+            return count / (now - start)
+
+
+def main(seconds: float) -> None:
+    settings = get_config_manager().load_sync().client
+    rotation = settings.crypto_rotation_seconds or 300
+    encrypted_response = AES.new(crypto.EAPI_KEY, AES.MODE_ECB).encrypt(
+        pad(json.dumps(RESPONSE, separators=(",", ":")).encode(), 16)
+    )
+    options = RequestOptions()
+
+    def _per_request(fn: Callable[[], object]) -> Callable[[], object]:
+        """以 crypto_rotation_seconds=0（每个请求重新生成密钥与匿名标识）执行 fn"""
+        def _run():
+            settings.crypto_rotation_seconds = 0
+            try:
+                return fn()
+            finally:
+                settings.crypto_rotation_seconds = rotation
+        return _run
+
+    def _cookie():
+        return process_cookie("MUSIC_U=x", "/api/v3/song/detail", options)
+
+    cases = [
+        ("weapi encrypt", lambda: Legacy.encrypt_weapi(SONG_DETAIL),
+         lambda: crypto.encrypt_weapi(SONG_DETAIL)),
+        ("weapi encrypt, rotation=0", lambda: Legacy.encrypt_weapi(SONG_DETAIL),
+         _per_request(lambda: crypto.encrypt_weapi(SONG_DETAIL))),
+        ("eapi encrypt", lambda: Legacy.encrypt_eapi("/api/song/enhance/player/url/v1", PLAY_URL),
+         lambda: crypto.encrypt_eapi("/api/song/enhance/player/url/v1", PLAY_URL)),
+        (f"eapi decrypt ({len(encrypted_response) // 1024} KiB)",
+         lambda: Legacy.decrypt_eapi_response(encrypted_response),
+         lambda: crypto.decrypt_eapi_response(encrypted_response)),
+        ("process_cookie", _per_request(_cookie), _cookie),
+    ]
+
+    # 输出必须一致（WEAPI 密钥随机，只比较 EAPI）
+    assert Legacy.encrypt_eapi("/api/x", PLAY_URL) == crypto.encrypt_eapi("/api/x", PLAY_URL)
+    assert Legacy.decrypt_eapi_response(encrypted_response) == crypto.decrypt_eapi_response(encrypted_response)
+
+    settings.crypto_rotation_seconds = rotation
+    print(f"{'case':<32}{'legacy ops/s':>14}{'current ops/s':>15}{'speedup':>9}")
+    for name, legacy, current in cases:
+        before = measure(legacy, seconds)
+        after = measure(current, seconds)
+        print(f"{name:<32}{before:>14,.0f}{after:>15,.0f}{after / before:>8.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=1.0, help="每项的测量时长")
+    args = parser.parse_args()
+    main(args.seconds)
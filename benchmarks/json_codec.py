@@ -0,0 +1,138 @@
+"""Benchmark: 大型 NCM 响应的 JSON 解析与序列化。
+
+对比标准库 json（旧实现）与 ncm.core.jsonlib（orjson / msgspec 可用时使用快速后端）：
+
+    python -m benchmarks.json_codec --tracks 1000 --seconds 1
+
+覆盖上游响应解析 (loads)、API 响应渲染 (JSONResponse.render) 与 WebSocket 快照哈希三条路径，
+payload 模拟 playlist_detail（含 tracks 与 trackIds）与 song_detail（含 songs 与 privileges）。
+每项输出单次操作的平均耗时 (ms)。
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import time
+from typing import Any, Callable, Dict, List
+
+from fastapi.responses import JSONResponse
+
+from ncm.core import jsonlib
+from ncm.server.framework.responses import FastJSONResponse
+
+
+def _song(i: int) -> Dict[str, Any]:
+    """一首歌曲的详情，字段与 /api/v3/song/detail 返回的结构一致"""
+    return {
+        "name": f"歌曲 {i} (Live)", "id": 1800000000 + i, "pst": 0, "t": 0,
+        "ar": [{"id": 10000 + i % 300, "name": f"歌手 {i % 300}", "tns": [], "alias": []},
+               {"id": 20000 + i % 50, "name": f"Artist {i % 50}", "tns": [], "alias": []}],
+        "alia": [f"别名 {i}"], "pop": 100.0, "st": 0, "rt": "", "fee": 8, "v": 42, "crbt": None, "cf": "",
+        "al": {"id": 30000 + i // 10, "name": f"专辑 {i // 10}",
+               "picUrl": f"https://p1.music.126.net/{'x' * 22}==/{109951160000000000 + i}.jpg",
+               "tns": [], "pic_str": str(109951160000000000 + i), "pic": 109951160000000000 + i},
+        "dt": 180000 + i, "h": {"br": 320000, "fid": 0, "size": 7200000 + i, "vd": -45000.0, "sr": 44100},
+        "m": {"br": 192000, "fid": 0, "size": 4320000 + i, "vd": -42000.0, "sr": 44100},
+        "l": {"br": 128000, "fid": 0, "size": 2880000 + i, "vd": -40000.0, "sr": 44100},
+        "sq": {"br": 900000, "fid": 0, "size": 20000000 + i, "vd": -45000.0, "sr": 44100},
+        "hr": None, "a": None, "cd": "01", "no": i % 12 + 1, "rtUrl": None, "ftype": 0, "rtUrls": [],
+        "djId": 0, "copyright": 1, "s_id": 0, "mark": 8192, "originCoverType": 1, "originSongSimpleData": None,
+        "tagPicList": None, "resourceState": True, "version": 7, "songJumpInfo": None, "entertainmentTags": None,
+        "awardTags": None, "single": 0, "noCopyrightRcmd": None, "mv": 0, "rtype": 0, "rurl": None,
+        "mst": 9, "cp": 7001, "publishTime": 1600000000000 + i,
+    }
+
+
+def _privilege(i: int) -> Dict[str, Any]:
+    return {
+        "id": 1800000000 + i, "fee": 8, "payed": 0, "st": 0, "pl": 320000, "dl": 999000, "sp": 7, "cp": 1,
+        "subp": 1, "cs": False, "maxbr": 999000, "fl": 320000, "toast": False, "flag": 260, "preSell": False,
+        "playMaxbr": 999000, "downloadMaxbr": 999000, "maxBrLevel": "lossless", "playMaxBrLevel": "lossless",
+        "downloadMaxBrLevel": "lossless", "plLevel": "exhigh", "dlLevel": "lossless", "flLevel": "exhigh",
+        "rscl": None, "freeTrialPrivilege": {"resConsumable": False, "userConsumable": False},
+        "chargeInfoList": [{"rate": br, "chargeUrl": None, "chargeMessage": None, "chargeType": 0}
+                           for br in (128000, 192000, 320000, 999000)],
+    }
+
+
+def playlist_detail(tracks: int) -> Dict[str, Any]:
+    return {
+        "code": 200, "relatedVideos": None, "urls": None, "privileges": [_privilege(i) for i in range(tracks)],
+        "playlist": {
+            "id": 7000000000, "name": "我喜欢的音乐", "coverImgId": 109951160000000000, "userId": 1,
+            "trackCount": tracks, "description": "描述 " * 20, "tags": ["华语", "流行"],
+            "tracks": [_song(i) for i in range(tracks)],
+            "trackIds": [{"id": 1800000000 + i, "v": 42, "t": 0, "at": 1700000000000 + i, "alg": None,
+                          "uid": 1, "rcmdReason": "", "sc": None} for i in range(tracks)],
+        },
+    }
+
+
+def song_detail(songs: int) -> Dict[str, Any]:
+    return {
+        "code": 200,
+        "songs": [_song(i) for i in range(songs)],
+        "privileges": [_privilege(i) for i in range(songs)],
+    }
+
+
+def measure(fn: Callable[[], object], seconds: float) -> float:
+    """返回单次执行的平均耗时 (ms)"""
+    fn()
+    count = 0
+    start = time.perf_counter()
+    deadline = start + seconds
+    while True:
+        fn()
+        count += 1
+        now = time.perf_counter()
+        if now >= deadline:
+            return (now - start) / count * 1000
+
+
+def _legacy_snapshot_hash(snapshot: Any) -> str:
+    payload = json.dumps(snapshot, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _snapshot_hash(snapshot: Any) -> str:
+    return hashlib.sha256(jsonlib.dumps(snapshot, sort_keys=True, default=str)).hexdigest()
+
+
+def main(tracks: int, seconds: float) -> None:
+    payloads = {
+        f"playlist_detail ({tracks} tracks)": playlist_detail(tracks),
+        f"song_detail ({min(tracks, 1000)} songs)": song_detail(min(tracks, 1000)),
+    }
+    legacy_response = JSONResponse.__new__(JSONResponse)
+    fast_response = FastJSONResponse.__new__(FastJSONResponse)
+
+    print(f"backend: {jsonlib.BACKEND}")
+    print(f"{'case':<52}{'legacy ms':>11}{'current ms':>12}{'speedup':>9}")
+    for name, payload in payloads.items():
+        raw = json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        # 解析与渲染结果必须一致
+        assert jsonlib.loads(raw) == json.loads(raw)
+        assert json.loads(fast_response.render(payload)) == json.loads(legacy_response.render(payload))
+        # 模拟 WebSocket 快照：列表中每个任务一个字典
+        snapshot = {"tasks": payload.get("songs") or payload["playlist"]["tracks"], "ts": time.time()}
+
+        cases: List[tuple] = [
+            (f"loads {name} {len(raw) // 1024} KiB", lambda: json.loads(raw), lambda: jsonlib.loads(raw)),
+            (f"render {name}", lambda: legacy_response.render(payload), lambda: fast_response.render(payload)),
+            (f"snapshot hash {name}", lambda: _legacy_snapshot_hash(snapshot), lambda: _snapshot_hash(snapshot)),
+        ]
+        for case, legacy, current in cases:
+            before = measure(legacy, seconds)
+            after = measure(current, seconds)
+            print(f"{case:<52}{before:>11.2f}{after:>12.2f}{before / after:>8.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tracks", type=int, default=1000, help="歌单曲目数")
+    parser.add_argument("--seconds", type=float, default=1.0, help="每项的测量时长")
+    args = parser.parse_args()
+    main(args.tracks, args.seconds)
@@ -0,0 +1,176 @@
+"""Check: 仓储层热点查询的 EXPLAIN QUERY PLAN。
+
+在迁移到 head 的临时库中写入样本数据并 ANALYZE，随后逐个调用
+AsyncDownloadTaskRepository 的热点查询，捕获其实际执行的 SELECT 语句并取查询计划：
+
+    python -m benchmarks.query_plans --tasks 20000
+
+任一语句对 download_task 做全表扫描（SCAN download_task 且未使用索引），
+或要求索引有序的分页查询出现 "USE TEMP B-TREE FOR ORDER BY" 时，以非零状态码退出，
+可在修改查询或索引后作为回归检查运行。
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import re
+import sqlite3
+import sys
+import tempfile
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Awaitable, Callable, List
+from zoneinfo import ZoneInfo
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+import ncm.data.models  # noqa: F401
+from ncm.data.migration.auto import run_migrations
+from ncm.data.repositories.async_download_task_repo import AsyncDownloadTaskRepository
+
+_FULL_SCAN = re.compile(r"^SCAN download_task(?!_fts)\b(?!.*\bUSING\b)")
+_SORT = "USE TEMP B-TREE FOR ORDER BY"
+_STATUSES = ("completed",) * 6 + ("pending", "failed", "downloading", "cancelled")
+
+
+@dataclass
+class Case:
+    name: str
+    run: Callable[[AsyncSession], Awaitable[object]]
+    # 分页查询须由索引直接提供顺序
+    index_order: bool = False
+
+
+def _cases(repo: AsyncDownloadTaskRepository) -> List[Case]:
+    after = (datetime(2026, 6, 1), 10_000)
+    end = datetime(2026, 7, 1)
+
+    async def _drain(iterator):
+        return [row async for row in iterator]
+
+    return [
+        Case("get_by_job_and_music", lambda s: repo.get_by_job_and_music(s, 3, "42")),
+        Case("get_by_job_and_status", lambda s: repo.get_by_job_and_status(s, 3, "failed")),
+        Case("stream_pending_by_job", lambda s: _drain(repo.stream_pending_by_job(s, 3)), index_order=True),
+        Case("stream_completed_files", lambda s: _drain(repo.stream_completed_files(s))),
+        Case("find_completed_by_music_and_quality",
+             lambda s: repo.find_completed_by_music_and_quality(s, "42", "lossless")),
+        Case("get_by_statuses", lambda s: repo.get_by_statuses(s, ["pending", "downloading"])),
+        Case("count_by_status", repo.count_by_status),
+        Case("count_completed_by_day",
+             lambda s: repo.count_completed_by_day(s, end - timedelta(days=30), end, ZoneInfo("Asia/Shanghai"))),
+        Case("list_page", lambda s: repo.list_page(s, after_id=5_000)),
+        Case("search", lambda s: repo.search(s, with_total=False), index_order=True),
+        Case("search status", lambda s: repo.search(s, status="failed", with_total=False), index_order=True),
+        Case("search_after", lambda s: repo.search_after(s, after=after), index_order=True),
+        Case("search_after status", lambda s: repo.search_after(s, status="completed", after=after),
+             index_order=True),
+        Case("count_search job+status", lambda s: repo.count_search(s, job_id=3, status="completed")),
+        Case("search keyword", lambda s: repo.search(s, keyword="Artist 12", with_total=True)),
+    ]
+
+
+def _prepare(db_path: Path, tasks: int) -> None:
+    """迁移到 head，写入样本数据并收集统计信息"""
+    url = f"sqlite:///{db_path}"
+    os.environ["ALEMBIC_DB_PATH"] = str(db_path)
+    engine = create_engine(url)
+    try:
+        run_migrations(engine, url)
+    finally:
+        engine.dispose()
+
+    base = datetime(2026, 1, 1)
+    conn = sqlite3.connect(db_path)
+    try:
+        conn.executemany(
+            "INSERT INTO download_job (job_name, job_type, source_type, source_id, storage_path, target_quality) "
+            "VALUES (?, 'playlist', 'playlist', ?, '/tmp', 'lossless')",
+            [(f"job {i}", str(i)) for i in range(20)],
+        )
+        rows = []
+        for i in range(tasks):
+            status = _STATUSES[i % len(_STATUSES)]
+            created = base + timedelta(minutes=i)
+            rows.append((
+                str(i % (tasks // 2 or 1)), f"Song {i}", f"Artist {i % 500}", f"Album {i % 2000}",
+                i % 20 + 1, status, created, created + timedelta(minutes=3) if status == "completed" else None,
+                f"/music/{i}.flac" if status == "completed" else None,
+            ))
+        conn.executemany(
+            "INSERT OR IGNORE INTO download_task (music_id, music_title, music_artist, music_album, job_id, "
+            "status, created_at, completed_at, file_path, progress_flags) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, 0)",
+            rows,
+        )
+        conn.commit()
+        conn.execute("ANALYZE")
+        conn.commit()
+    finally:
+        conn.close()
+
+
+async def _capture(db_path: Path) -> List[tuple[Case, List[tuple[str, tuple]]]]:
+    """执行各查询并记录其 SELECT 语句与参数"""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{db_path}")
+    captured: List[tuple[str, tuple]] = []
+
+    def _record(_conn, _cursor, statement, parameters, _context, _executemany):
+        if statement.lstrip().upper().startswith(("SELECT", "WITH")) and "sqlite_master" not in statement:
+            captured.append((statement, tuple(parameters or ())))
+
+    event.listen(engine.sync_engine, "before_cursor_execute", _record)
+    factory = async_sessionmaker(engine, expire_on_commit=False)
+    repo = AsyncDownloadTaskRepository()
+    results = []
+    try:
+        for case in _cases(repo):
+            captured.clear()
+            async with factory() as session:
+                await case.run(session)
+            results.append((case, list(captured)))
+    finally:
+        await engine.dispose()
+    return results
+
+
+def check(db_path: Path, captured) -> int:
+    failures = 0
+    conn = sqlite3.connect(db_path)
+    try:
+        for case, statements in captured:
+            for statement, parameters in statements:
+                plan = [row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {statement}", parameters)]
+                problems = [line for line in plan if _FULL_SCAN.search(line)]
+                if case.index_order:
+                    problems += [line for line in plan if _SORT in line]
+                failures += bool(problems)
+                print(f"[{'FAIL' if problems else ' ok '}] {case.name}")
+                for line in plan:
+                    print(f"         {'!' if line in problems else ' '} {line}")
+    finally:
+        conn.close()
+    return failures
+
+
+def main(tasks: int) -> int:
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / "plans.sqlite"
+        _prepare(db_path, tasks)
+        captured = asyncio.run(_capture(db_path))
+        failures = check(db_path, captured)
+
+    print(f"\n{failures} statement(s) with full scans or unindexed ordering" if failures
+          else "\nall hot queries use indexes")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tasks", type=int, default=20000)
+    args = parser.parse_args()
+    sys.exit(main(args.tasks))
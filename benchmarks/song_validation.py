@@ -0,0 +1,98 @@
+"""Benchmark: 扫描歌单时歌曲详情的校验耗时与常驻内存。
+
+对比旧实现（逐条 Song.model_validate / Privilege.model_validate 完整模型）
+与当前实现（SongLite / PrivilegeLite 精简投影，经 TypeAdapter 整批校验）：
+
+    python -m benchmarks.song_validation --tracks 5000
+
+输出最快一轮的校验耗时 (ms) 与校验结果占用的内存 (KiB)。
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List
+
+from benchmarks.json_codec import _privilege, _song
+from ncm.client.apis.song.detail_models import (
+    PRIVILEGE_LITE_LIST,
+    SONG_LITE_LIST,
+    Privilege,
+    Song,
+    SongDetailLite,
+    SongDetailResponseOnlyOne,
+)
+
+
+def tracks(n: int) -> List[Dict[str, Any]]:
+    result = []
+    for i in range(n):
+        privilege = _privilege(i)
+        privilege.update(rightSource=0, code=200)
+        result.append({"code": 200, "song": _song(i), "privilege": privilege})
+    return result
+
+
+def legacy(items: List[Dict[str, Any]]) -> list:
+    return [
+        SongDetailResponseOnlyOne(
+            song=Song.model_validate(t["song"]), privilege=Privilege.model_validate(t["privilege"]), code=t["code"]
+        )
+        for t in items
+    ]
+
+
+def current(items: List[Dict[str, Any]]) -> list:
+    songs = SONG_LITE_LIST.validate_python([t["song"] for t in items])
+    privileges = PRIVILEGE_LITE_LIST.validate_python([t["privilege"] for t in items])
+    return [SongDetailLite(song=s, privilege=p, code=t["code"]) for s, p, t in zip(songs, privileges, items)]
+
+
+def best_of(fn: Callable[[], object], rounds: int) -> float:
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def retained(fn: Callable[[], object]) -> int:
+    tracemalloc.start()
+    result = fn()
+    # 测量时 result 仍被引用，统计的是结果对象本身的常驻内存
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del result
+    return size // 1024
+
+
+def main(n: int, rounds: int) -> None:
+    items = tracks(n)
+    old, new = legacy(items), current(items)
+    # 流水线读取的字段必须一致
+    for a, b in zip(old, new):
+        assert (a.song.name, [x.name for x in a.song.ar], a.song.al.name, a.song.al.picUrl, a.song.dt,
+                a.song.cd, a.song.no, a.song.publishTime) == \
+               (b.song.name, [x.name for x in b.song.ar], b.song.al.name, b.song.al.picUrl, b.song.dt,
+                b.song.cd, b.song.no, b.song.publishTime)
+        assert a.privilege.resolve_dl_level("hires") == b.privilege.resolve_dl_level("hires")
+        assert (a.privilege.is_grey, a.privilege.is_copyright_restricted) == \
+               (b.privilege.is_grey, b.privilege.is_copyright_restricted)
+    del old, new
+
+    before_ms, after_ms = best_of(lambda: legacy(items), rounds), best_of(lambda: current(items), rounds)
+    before_kib, after_kib = retained(lambda: legacy(items)), retained(lambda: current(items))
+    print(f"{n} tracks{'legacy':>14}{'current':>12}{'ratio':>9}")
+    print(f"{'validate ms':<16}{before_ms:>12.1f}{after_ms:>12.1f}{before_ms / after_ms:>8.1f}x")
+    print(f"{'retained KiB':<16}{before_kib:>12,}{after_kib:>12,}{before_kib / after_kib:>8.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tracks", type=int, default=5000, help="歌曲数")
+    parser.add_argument("--rounds", type=int, default=5, help="计时轮数")
+    args = parser.parse_args()
+    main(args.tracks, args.rounds)
@@ -0,0 +1,127 @@
+"""Benchmark: 单个任务生命周期内的状态/进度写入语句数。
+
+对比旧实现（SELECT -> Python 中修改 -> flush -> refresh）与单条 UPDATE（... RETURNING）：
+
+    python -m benchmarks.task_update --tasks 500
+
+每个任务模拟一次完整工作流：downloading -> 5 个进度标志 -> completed，
+统计每任务执行的 SQL 语句数与总耗时。
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import tempfile
+import time
+from pathlib import Path
+from typing import Optional
+
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from ncm.data.models.base import Base
+from ncm.data.models.download_job import DownloadJob
+from ncm.data.models.download_task import DownloadTask, TaskProgress
+from ncm.data.repositories.async_download_task_repo import AsyncDownloadTaskRepository
+
+FLAGS = (
+    TaskProgress.MUSIC_DOWNLOADED,
+    TaskProgress.METADATA_COMPLETED,
+    TaskProgress.COVER_COMPLETED,
+    TaskProgress.LYRICS_COMPLETED,
+    TaskProgress.FILE_FINALIZED,
+)
+
+
+class LegacyRepository:
+    """旧实现：读-改-写 + refresh"""
+
+    async def _load(self, session: AsyncSession, task_id: int) -> Optional[DownloadTask]:
+        result = await session.execute(select(DownloadTask).where(DownloadTask.id == task_id))
+        return result.scalar_one_or_none()
+
+    async def update_progress(self, session: AsyncSession, task_id: int, progress_flag: int):
+        task = await self._load(session, task_id)
+        task.progress_flags = task.progress_flags | progress_flag
+        await session.flush()
+        await session.refresh(task)
+        return task
+
+    async def update_status(self, session: AsyncSession, task_id: int, status: str):
+        task = await self._load(session, task_id)
+        task.status = status
+        await session.flush()
+        await session.refresh(task)
+        return task
+
+
+class AtomicRepository:
+    """新实现：单条 UPDATE，不回读行（与工作流热路径一致）"""
+
+    def __init__(self):
+        self._repo = AsyncDownloadTaskRepository()
+
+    async def update_progress(self, session: AsyncSession, task_id: int, progress_flag: int):
+        return await self._repo.update_progress(session, task_id, progress_flag, returning=False)
+
+    async def update_status(self, session: AsyncSession, task_id: int, status: str):
+        return await self._repo.update_status(session, task_id, status, returning=False)
+
+
+async def run(db_path: Path, repo, tasks: int) -> tuple[float, float]:
+    engine = create_async_engine(f"sqlite+aiosqlite:///{db_path}")
+    statements = 0
+
+    def _count(*_args):
+        nonlocal statements
+        statements += 1
+
+    try:
+        async with engine.begin() as conn:
+            await conn.exec_driver_sql("PRAGMA journal_mode=WAL;")
+            await conn.run_sync(Base.metadata.create_all)
+        factory = async_sessionmaker(engine, expire_on_commit=False)
+        async with factory() as session:
+            job = DownloadJob(job_name="bench", job_type="playlist", source_type="playlist",
+                              source_id="0", storage_path="/tmp")
+            session.add(job)
+            await session.flush()
+            session.add_all(DownloadTask(music_id=str(i), job_id=job.id) for i in range(tasks))
+            await session.commit()
+
+        event.listen(engine.sync_engine, "before_cursor_execute", _count)
+        start = time.perf_counter()
+        for task_id in range(1, tasks + 1):
+            # 与 AsyncTaskService 一致：每次更新一个独立事务
+            async with factory() as session:
+                await repo.update_status(session, task_id, "downloading")
+                await session.commit()
+            for flag in FLAGS:
+                async with factory() as session:
+                    await repo.update_progress(session, task_id, flag)
+                    await session.commit()
+            async with factory() as session:
+                await repo.update_status(session, task_id, "completed")
+                await session.commit()
+        elapsed = time.perf_counter() - start
+        return statements / tasks, elapsed
+    finally:
+        await engine.dispose()
+
+
+async def main(tasks: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        legacy = await run(Path(tmp) / "legacy.sqlite", LegacyRepository(), tasks)
+        atomic = await run(Path(tmp) / "atomic.sqlite", AtomicRepository(), tasks)
+
+    print(f"tasks={tasks}, 7 updates per task")
+    print(f"legacy select/mutate/refresh : {legacy[0]:.1f} statements/task, {legacy[1]:.3f}s")
+    print(f"atomic UPDATE                : {atomic[0]:.1f} statements/task, {atomic[1]:.3f}s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tasks", type=int, default=500)
+    args = parser.parse_args()
+    asyncio.run(main(args.tasks))
@@ -5,6 +5,7 @@ from .exceptions import (
     AuthenticationError,
     MusicSessionUnavailableError,
     RateLimitError,
+    CircuitOpenError,
     EncryptionError,
     ValidationError
 )
@@ -22,6 +23,7 @@ __all__ = [
     "MusicSessionUnavailableError",
 
     "RateLimitError",
+    "CircuitOpenError",
     "EncryptionError",
     "ValidationError",
 
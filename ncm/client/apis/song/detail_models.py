@@ -1,5 +1,7 @@
+from dataclasses import dataclass as std_dataclass
 from typing import List, Optional, Any
-from pydantic import BaseModel
+from pydantic import BaseModel, TypeAdapter
+from pydantic.dataclasses import dataclass
 
 QUALITY_LIST = [
     "dolby",
@@ -195,40 +197,9 @@ class FreeTrialPrivilege(BaseModel):
     freeLimitTagType: Optional[Any] = None
 
 
-class Privilege(BaseModel):
-    id: int
-    fee: int
-    payed: int
-    st: int
-    pl: int
-    dl: int
-    sp: int
-    cp: int
-    subp: int
-    cs: bool
-    maxbr: int
-    fl: int
-    toast: bool
-    flag: int
-    preSell: bool
-    playMaxbr: int
-    downloadMaxbr: int
-    maxBrLevel: str
-    playMaxBrLevel: str
-    downloadMaxBrLevel: str
-    plLevel: str
-    dlLevel: str
-    flLevel: str
-    rscl: Optional[Any] = None
-    freeTrialPrivilege: FreeTrialPrivilege
-    rightSource: int
-    chargeInfoList: List[ChargeInfo]
-    code: int
-    message: Optional[Any] = None
-    plLevels: Optional[Any] = None
-    dlLevels: Optional[Any] = None
-    ignoreCache: Optional[Any] = None
-    bd: Optional[Any] = None
+class _PrivilegeLevels:
+    """Privilege 与 PrivilegeLite 共用的权限判断与音质解析"""
+    __slots__ = ()
 
     @property
     def is_copyright_restricted(self) -> bool:
@@ -239,9 +210,6 @@ class Privilege(BaseModel):
     def is_grey(self) -> bool:
         """灰色歌曲"""
         return self.st < 0
-    
-
-
 
     def resolve_level(self, user_level: str, target_level: str) -> str:
         if user_level not in QUALITY_INDEX:
@@ -252,7 +220,7 @@ class Privilege(BaseModel):
             QUALITY_INDEX[user_level],
             QUALITY_INDEX[target_level],
         )]
-        
+
     def resolve_pl_level(self, target: str) -> str:
         """最大当前用户可试听音质"""
         return self.resolve_level(self.plLevel, target)
@@ -260,18 +228,51 @@ class Privilege(BaseModel):
     def resolve_dl_level(self, target: str) -> str:
         """最大当前用户可下载音质"""
         return self.resolve_level(self.dlLevel, target)
-    
+
     def resolve_fl_level(self, target: str) -> str:
         """最大免费用户可播放音质"""
         return self.resolve_level(self.flLevel, target)
-    
+
     def resolve_max_br_level(self, target: str) -> str:
         """该音乐最高音质"""
         return self.resolve_level(self.maxBrLevel, target)
-    
-    
 
 
+class Privilege(_PrivilegeLevels, BaseModel):
+    id: int
+    fee: int
+    payed: int
+    st: int
+    pl: int
+    dl: int
+    sp: int
+    cp: int
+    subp: int
+    cs: bool
+    maxbr: int
+    fl: int
+    toast: bool
+    flag: int
+    preSell: bool
+    playMaxbr: int
+    downloadMaxbr: int
+    maxBrLevel: str
+    playMaxBrLevel: str
+    downloadMaxBrLevel: str
+    plLevel: str
+    dlLevel: str
+    flLevel: str
+    rscl: Optional[Any] = None
+    freeTrialPrivilege: FreeTrialPrivilege
+    rightSource: int
+    chargeInfoList: List[ChargeInfo]
+    code: int
+    message: Optional[Any] = None
+    plLevels: Optional[Any] = None
+    dlLevels: Optional[Any] = None
+    ignoreCache: Optional[Any] = None
+    bd: Optional[Any] = None
+
 
 class SongDetailResponse(BaseModel):
     songs: List[Song]
@@ -283,3 +284,54 @@ class SongDetailResponseOnlyOne(BaseModel):
     song: Song
     privilege: Privilege
     code: int
+
+
+# 下载流水线使用的精简投影：只校验、保存流水线读取的字段，其余字段直接丢弃。
+# 使用 slots 数据类，扫描大歌单时成千上万个任务的详情常驻内存；需要完整字段时按需加载 Song / Privilege。
+
+@dataclass(slots=True)
+class ArtistLite:
+    id: int
+    name: str
+
+
+@dataclass(slots=True)
+class AlbumLite:
+    id: int
+    name: str
+    picUrl: str
+
+
+@dataclass(slots=True)
+class SongLite:
+    id: int
+    name: str
+    ar: List[ArtistLite]
+    al: AlbumLite
+    dt: int
+    cd: str
+    no: int
+    publishTime: int
+
+
+@dataclass(slots=True)
+class PrivilegeLite(_PrivilegeLevels):
+    id: int
+    st: int
+    toast: bool
+    plLevel: str
+    dlLevel: str
+    flLevel: str
+    maxBrLevel: str
+
+
+@std_dataclass(slots=True)
+class SongDetailLite:
+    song: SongLite
+    privilege: PrivilegeLite
+    code: int
+
+
+# 批量校验：一次 validate_python 处理整个列表，避免逐条构造校验器调用的开销
+SONG_LITE_LIST = TypeAdapter(List[SongLite])
+PRIVILEGE_LITE_LIST = TypeAdapter(List[PrivilegeLite])
@@ -43,6 +43,11 @@ class RateLimitError(APIError):
     pass
 
 
+class CircuitOpenError(RateLimitError):
+    """Requests to an endpoint family are suspended after sustained upstream failures."""
+    pass
+
+
 class EncryptionError(NCMError):
     """Encryption/decryption failed."""
     pass
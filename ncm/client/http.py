@@ -4,12 +4,17 @@ from urllib.parse import urlencode
 import json
 
 from ncm.client.protocol.session import get_session
+from ncm.client.protocol.cache import get_response_cache
+from ncm.client.protocol.singleflight import get_single_flight, is_coalesced
+from ncm.client.protocol.ratelimit import account_tag, get_rate_limiter
+from ncm.client.protocol.batch import get_request_batcher
 from ncm.client.protocol.options import RequestOptions, APIResponse, CryptoType
 from ncm.client.protocol.cookies import process_cookie, cookie_dict_to_string
 from ncm.client.protocol.headers import build_headers, choose_user_agent, build_eapi_header
 from ncm.client.protocol.router import build_url
 from ncm.client.protocol.crypto import get_crypto_function, decrypt_eapi_response
 from ncm.client.exceptions import NetworkError, APIError, AuthenticationError, RateLimitError
+from ncm.core import jsonlib
 from ncm.core.logging import get_logger
 
 logger = get_logger(__name__)
@@ -19,8 +24,6 @@ async def request(
     data: Optional[Dict[str, Any]] = None,
     options: Optional[RequestOptions] = None
 ) -> APIResponse:
-    method = "POST"
-
     """
     Unified HTTP request function — the only exported entry you need to call.
     Returns an APIResponse dataclass.
@@ -30,12 +33,93 @@ async def request(
     if data is None:
         data = {}
 
-    client = await get_session(options)
-
     # process cookie and headers
     cookie_dict = process_cookie(options.cookie, uri, options)
+
+    # response cache: idempotent endpoints listed in client.response_cache_ttl
+    cache = get_response_cache()
+    cache_ttl = cache.ttl_for(uri)
+    coalesce = is_coalesced(uri)
+    request_key = cache.make_key(uri, data, cookie_dict.get("MUSIC_U")) if cache_ttl or coalesce else None
+    if cache_ttl and options.cache:
+        cached = await cache.get(request_key)
+        if cached is not None:
+            return cached
+
+    cache_key = request_key if cache_ttl else None
+    if coalesce:
+        # single-flight: identical in-flight reads share one upstream call
+        flight_key = f"{request_key}:{options.crypto}:{options.encrypt_response}"
+        return await get_single_flight().do(
+            flight_key, lambda: _fetch(uri, data, options, cookie_dict, cache_key, cache_ttl)
+        )
+    return await _fetch(uri, data, options, cookie_dict, cache_key, cache_ttl)
+
+
+async def _fetch(
+    uri: str,
+    data: Dict[str, Any],
+    options: RequestOptions,
+    cookie_dict: Dict[str, str],
+    cache_key: Optional[str],
+    cache_ttl: int
+) -> APIResponse:
+    """Send directly or via /api/batch; caches or invalidates on success."""
+    batcher = get_request_batcher()
+    if batcher.accepts(uri):
+        response = await batcher.submit(uri, data, options, cookie_dict)
+    else:
+        response = await _send(uri, data, options, cookie_dict)
+
+    if _api_code(response.body, response.status) == 200:
+        cache = get_response_cache()
+        if cache_key:
+            await cache.put(cache_key, uri, response, cache_ttl)
+        else:
+            await cache.invalidate_after(uri)
+    return response
+
+
+async def _send(
+    uri: str,
+    data: Dict[str, Any],
+    options: RequestOptions,
+    cookie_dict: Dict[str, str]
+) -> APIResponse:
+    """Send one upstream request through the shared per-family (and per-account) rate limiter and circuit breaker."""
+    limiter = get_rate_limiter()
+    family = await limiter.acquire(uri, account_tag(cookie_dict.get("MUSIC_U")))
+    try:
+        response = await _transmit(uri, data, options, cookie_dict)
+    except RateLimitError:
+        limiter.record_throttle(family)
+        raise
+    except NetworkError:
+        limiter.record_failure(family)
+        raise
+    except APIError as e:
+        # business errors mean NCM answered normally; only 5xx count against the breaker
+        if isinstance(e.code, int) and e.code >= 500:
+            limiter.record_failure(family)
+        else:
+            limiter.record_success(family)
+        raise
+    limiter.record_success(family)
+    return response
+
+
+async def _transmit(
+    uri: str,
+    data: Dict[str, Any],
+    options: RequestOptions,
+    cookie_dict: Dict[str, str]
+) -> APIResponse:
+    """Build, encrypt and send one upstream request."""
+    method = "POST"
     csrf_token = cookie_dict.get("__csrf", "")
 
+    client = await get_session(options)
+
     headers = build_headers(options, cookie_dict)
 
     if options.user_agent:
@@ -136,45 +220,59 @@ async def request(
             if options.crypto == CryptoType.EAPI and options.encrypt_response:
                 body_data = decrypt_eapi_response(resp.content)
             else:
-                body_data = resp.json()
+                body_data = jsonlib.loads(resp.content)
         except Exception:
             body_data = {"message": resp.text}
             logger.exception(Exception)
 
-
-        api_code = body_data.get("code", resp.status_code)
-        if isinstance(api_code, str):
-            try:
-                api_code = int(api_code)
-            except Exception:
-                api_code = resp.status_code
-
-        # Normalize some codes
-        if api_code in (201, 302, 400, 502, 800, 801, 802, 803):
-            status = 200
-        else:
-            status = api_code if 100 <= api_code < 600 else 400
-
-        api_response = APIResponse(
-            status=status,
-            body=body_data,
-            cookies=response_cookies,
-            headers=dict(resp.headers)
-        )
-
-        # error handling
-        if status != 200:
-            if api_code == 301:
-                raise AuthenticationError("需要登录", api_code, body_data)
-            elif api_code == 503:
-                raise RateLimitError("请求过于频繁", api_code, body_data)
-            else:
-                raise APIError(f"API请求失败: {body_data.get('message','未知错误')}", api_code, body_data)
-
-        return api_response
+        return _parse_response(body_data, resp.status_code, response_cookies, dict(resp.headers))
 
     except (APIError, AuthenticationError, RateLimitError):
         raise
     except Exception as e:
         # network or unknown
         raise NetworkError(str(e))
+
+
+def _api_code(body_data: Dict[str, Any], status_code: int) -> int:
+    api_code = body_data.get("code", status_code)
+    if isinstance(api_code, str):
+        try:
+            api_code = int(api_code)
+        except Exception:
+            api_code = status_code
+    return api_code
+
+
+def _parse_response(
+    body_data: Dict[str, Any],
+    status_code: int,
+    cookies: List[str],
+    headers: Dict[str, str]
+) -> APIResponse:
+    """Normalize the NCM code into an HTTP-like status; raise for error codes."""
+    api_code = _api_code(body_data, status_code)
+
+    # Normalize some codes
+    if api_code in (201, 302, 400, 502, 800, 801, 802, 803):
+        status = 200
+    else:
+        status = api_code if 100 <= api_code < 600 else 400
+
+    api_response = APIResponse(
+        status=status,
+        body=body_data,
+        cookies=cookies,
+        headers=headers
+    )
+
+    # error handling
+    if status != 200:
+        if api_code == 301:
+            raise AuthenticationError("需要登录", api_code, body_data)
+        elif api_code in (429, 503):
+            raise RateLimitError("请求过于频繁", api_code, body_data)
+        else:
+            raise APIError(f"API请求失败: {body_data.get('message','未知错误')}", api_code, body_data)
+
+    return api_response
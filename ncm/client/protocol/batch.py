@@ -0,0 +1,154 @@
+# api/batch.py
+"""Merge concurrent NCM API calls into /api/batch requests."""
+
+import asyncio
+import dataclasses
+import json
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set
+
+from ncm.client.protocol.options import APIResponse, CryptoType, RequestOptions
+from ncm.core.config import get_config_manager
+from ncm.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+BATCH_URI = "/api/batch"
+
+Send = Callable[[str, Dict[str, Any], RequestOptions, Dict[str, str]], Awaitable[APIResponse]]
+Parse = Callable[[Dict[str, Any], int, List[str], Dict[str, str]], APIResponse]
+
+
+@dataclass
+class _Call:
+    uri: str
+    data: Dict[str, Any]
+    options: RequestOptions
+    cookie_dict: Dict[str, str]
+    future: asyncio.Future
+
+
+class RequestBatcher:
+    """请求批处理器 - 把 batch_window_ms 内的请求合并为 /api/batch 请求
+
+    同一账号、同一代理的请求进入同一窗口。/api/batch 以 URI 作为子请求的键，
+    因此一个批次中每个 URI 至多一个子请求：窗口内的请求按 URI 轮转拆分为若干批次并发发送，
+    例如同一首歌的详情、歌词与播放链接合并为一次往返。
+    批次只有一个请求时直接发送；批次请求失败或缺少某个子响应时，相应请求回退为单独发送。
+    """
+
+    def __init__(self, send: Send, parse: Parse):
+        self._send = send
+        self._parse = parse
+        self._pending: Dict[tuple, List[_Call]] = {}
+        self._flushers: Set[asyncio.Task] = set()
+        self._batches = 0
+        self._batched_calls = 0
+        self._direct_calls = 0
+        self._fallbacks = 0
+
+    def accepts(self, uri: str) -> bool:
+        settings = get_config_manager().load_sync().client
+        return settings.batch_enabled and uri in settings.batch_uris
+
+    async def submit(self, uri: str, data: Dict[str, Any], options: RequestOptions,
+                     cookie_dict: Dict[str, str]) -> APIResponse:
+        key = (cookie_dict.get("MUSIC_U"), options.proxy)
+        future = asyncio.get_running_loop().create_future()
+        calls = self._pending.setdefault(key, [])
+        calls.append(_Call(uri, data, options, cookie_dict, future))
+        if len(calls) == 1:
+            flusher = asyncio.create_task(self._flush_later(key))
+            self._flushers.add(flusher)
+            flusher.add_done_callback(self._flushers.discard)
+        return await future
+
+    async def _flush_later(self, key: tuple) -> None:
+        await asyncio.sleep(get_config_manager().load_sync().client.batch_window_ms / 1000)
+        calls = self._pending.pop(key, [])
+
+        # 按 URI 轮转拆分：第 i 个批次包含每个 URI 的第 i 个请求
+        by_uri: Dict[str, List[_Call]] = {}
+        for call in calls:
+            by_uri.setdefault(call.uri, []).append(call)
+        rounds: List[List[_Call]] = []
+        for uri_calls in by_uri.values():
+            for i, call in enumerate(uri_calls):
+                if i == len(rounds):
+                    rounds.append([])
+                rounds[i].append(call)
+
+        await asyncio.gather(*(self._send_round(r) for r in rounds))
+
+    async def _send_round(self, calls: List[_Call]) -> None:
+        if len(calls) == 1:
+            self._direct_calls += 1
+            await self._send_single(calls[0])
+            return
+
+        first = calls[0]
+        batch_data = {call.uri: json.dumps(call.data, ensure_ascii=False, separators=(",", ":")) for call in calls}
+        batch_options = dataclasses.replace(first.options, crypto=CryptoType.EAPI, encrypt_response=True)
+        try:
+            response = await self._send(BATCH_URI, batch_data, batch_options, first.cookie_dict)
+        except Exception as e:
+            logger.debug(f"Batch request failed, sending {len(calls)} calls individually: {e}")
+            self._fallbacks += len(calls)
+            await asyncio.gather(*(self._send_single(call) for call in calls))
+            return
+
+        self._batches += 1
+        missing = []
+        for call in calls:
+            sub = response.body.get(call.uri)
+            if not isinstance(sub, dict):
+                missing.append(call)
+                continue
+            self._batched_calls += 1
+            try:
+                self._resolve(call, self._parse(sub, 200, [], {}))
+            except Exception as e:
+                self._reject(call, e)
+
+        if missing:
+            self._fallbacks += len(missing)
+            await asyncio.gather(*(self._send_single(call) for call in missing))
+
+    async def _send_single(self, call: _Call) -> None:
+        try:
+            self._resolve(call, await self._send(call.uri, call.data, call.options, call.cookie_dict))
+        except Exception as e:
+            self._reject(call, e)
+
+    @staticmethod
+    def _resolve(call: _Call, response: APIResponse) -> None:
+        if not call.future.done():
+            call.future.set_result(response)
+
+    @staticmethod
+    def _reject(call: _Call, error: Exception) -> None:
+        if not call.future.done():
+            call.future.set_exception(error)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取批处理统计信息"""
+        return {
+            "batches": self._batches,
+            "batched_calls": self._batched_calls,
+            "avg_batch_size": round(self._batched_calls / self._batches, 2) if self._batches else 0.0,
+            "direct_calls": self._direct_calls,
+            "fallbacks": self._fallbacks,
+            "pending": sum(len(calls) for calls in self._pending.values()),
+        }
+
+
+_request_batcher: Optional[RequestBatcher] = None
+
+
+def get_request_batcher() -> RequestBatcher:
+    global _request_batcher
+    if _request_batcher is None:
+        # http 导入本模块，发送与解析函数在此延迟导入以避免循环依赖
+        from ncm.client.http import _parse_response, _send
+        _request_batcher = RequestBatcher(_send, _parse_response)
+    return _request_batcher
@@ -0,0 +1,249 @@
+# api/cache.py
+"""Response cache for idempotent NCM API calls."""
+
+import asyncio
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+from ncm.client.protocol.options import APIResponse
+from ncm.core import jsonlib
+from ncm.core.config import ClientSettings, get_config_manager
+from ncm.core.logging import get_logger
+from ncm.core.path import get_cache_path, prepare_path
+
+logger = get_logger(__name__)
+
+RESPONSE_CACHE_FILE_NAME = "ncm_api_cache.sqlite"
+
+# 每次请求都会变化、与响应内容无关的参数，不参与缓存键
+_VOLATILE_FIELDS = frozenset({"csrf_token", "e_r", "header", "timestamp", "checkToken"})
+
+# 写接口成功后需要失效的缓存 URI
+_INVALIDATED_BY: Dict[str, tuple[str, ...]] = {
+    "/api/playlist/track/add": ("/api/v6/playlist/detail", "/api/user/playlist"),
+    "/api/playlist/track/delete": ("/api/v6/playlist/detail", "/api/user/playlist"),
+    "/api/playlist/create": ("/api/user/playlist",),
+    "/api/playlist/subscribe": ("/api/user/playlist",),
+    "/api/playlist/unsubscribe": ("/api/user/playlist",),
+}
+
+
+@dataclass
+class _Entry:
+    uri: str
+    status: int
+    body: bytes
+    expires_at: float
+
+
+class _SqliteStore:
+    """持久层：单个 SQLite 文件，所有访问在线程池中串行执行"""
+
+    def __init__(self, path: str):
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS response_cache ("
+                "key TEXT PRIMARY KEY, uri TEXT NOT NULL, status INTEGER NOT NULL, "
+                "body BLOB NOT NULL, expires_at REAL NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS ix_response_cache_uri ON response_cache (uri)")
+            self._conn.execute("DELETE FROM response_cache WHERE expires_at <= ?", (time.time(),))
+            self._conn.commit()
+
+    def get(self, key: str, now: float) -> Optional[_Entry]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT uri, status, body, expires_at FROM response_cache WHERE key = ? AND expires_at > ?",
+                (key, now),
+            ).fetchone()
+        return _Entry(*row) if row else None
+
+    def put(self, key: str, entry: _Entry) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO response_cache (key, uri, status, body, expires_at) VALUES (?, ?, ?, ?, ?)",
+                (key, entry.uri, entry.status, entry.body, entry.expires_at),
+            )
+            self._conn.commit()
+
+    def delete(self, uri: Optional[str]) -> None:
+        with self._lock:
+            if uri is None:
+                self._conn.execute("DELETE FROM response_cache")
+            else:
+                self._conn.execute("DELETE FROM response_cache WHERE uri = ?", (uri,))
+            self._conn.commit()
+
+    def purge_expired(self, now: float) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM response_cache WHERE expires_at <= ?", (now,))
+            self._conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class ResponseCache:
+    """NCM 响应缓存 - 内存 LRU + 可选 SQLite 持久层
+
+    仅缓存 client.response_cache_ttl 中列出的上游 URI 的成功响应（code == 200）。
+    缓存键为 URI + 账号（MUSIC_U）+ 去掉易变字段后的明文参数；
+    内存层按序列化后的响应体字节数限制容量，超出时淘汰最久未使用的条目。
+    命中时返回响应体的新副本，调用方修改不会影响缓存。
+    """
+
+    # 每写入多少次清理一次持久层中的过期条目
+    PURGE_EVERY = 500
+
+    def __init__(self):
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._bytes = 0
+        self._store: Optional[_SqliteStore] = None
+        self._store_failed = False
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._puts = 0
+
+    @staticmethod
+    def _settings() -> ClientSettings:
+        return get_config_manager().load_sync().client
+
+    def ttl_for(self, uri: str) -> int:
+        """返回 uri 的缓存 TTL（秒），0 表示不缓存"""
+        settings = self._settings()
+        if not settings.response_cache_enabled:
+            return 0
+        return settings.response_cache_ttl.get(uri, 0)
+
+    @staticmethod
+    def make_key(uri: str, data: Dict[str, Any], account: Optional[str] = None) -> str:
+        params = {k: v for k, v in data.items() if k not in _VOLATILE_FIELDS}
+        raw = json.dumps([uri, account or "", params], sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+    def _get_store(self) -> Optional[_SqliteStore]:
+        if self._store is None and not self._store_failed and self._settings().response_cache_persist:
+            try:
+                path = prepare_path(get_cache_path(RESPONSE_CACHE_FILE_NAME))
+                self._store = _SqliteStore(str(path))
+            except sqlite3.Error as e:
+                self._store_failed = True
+                logger.warning(f"Response cache persistence disabled: {e}")
+        return self._store
+
+    async def get(self, key: str) -> Optional[APIResponse]:
+        now = time.time()
+        entry = self._entries.get(key)
+        if entry is not None and entry.expires_at <= now:
+            self._discard(key)
+            entry = None
+
+        if entry is None:
+            store = self._get_store()
+            if store is not None:
+                try:
+                    entry = await asyncio.to_thread(store.get, key, now)
+                except sqlite3.Error as e:
+                    logger.warning(f"Response cache read failed: {e}")
+                if entry is not None:
+                    self._put_memory(key, entry)
+
+        if entry is None:
+            self._misses += 1
+            return None
+
+        if key in self._entries:
+            self._entries.move_to_end(key)
+        self._hits += 1
+        return APIResponse(status=entry.status, body=jsonlib.loads(entry.body), headers={"x-ncm-cache": "hit"})
+
+    async def put(self, key: str, uri: str, response: APIResponse, ttl: int) -> None:
+        body = jsonlib.dumps(response.body)
+        entry = _Entry(uri=uri, status=response.status, body=body, expires_at=time.time() + ttl)
+        self._put_memory(key, entry)
+        self._puts += 1
+
+        store = self._get_store()
+        if store is not None:
+            try:
+                await asyncio.to_thread(store.put, key, entry)
+                if self._puts % self.PURGE_EVERY == 0:
+                    await asyncio.to_thread(store.purge_expired, time.time())
+            except sqlite3.Error as e:
+                logger.warning(f"Response cache write failed: {e}")
+
+    def _put_memory(self, key: str, entry: _Entry) -> None:
+        max_bytes = self._settings().response_cache_max_mb * 1024 * 1024
+        self._discard(key)
+        if len(entry.body) > max_bytes:
+            return
+        self._entries[key] = entry
+        self._bytes += len(entry.body)
+        while self._bytes > max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= len(evicted.body)
+            self._evictions += 1
+
+    def _discard(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= len(entry.body)
+
+    async def invalidate(self, uri: Optional[str] = None) -> int:
+        """失效 uri 的全部缓存；uri 为 None 时清空缓存。返回移除的内存条目数"""
+        keys = [k for k, e in self._entries.items() if uri is None or e.uri == uri]
+        for key in keys:
+            self._discard(key)
+
+        store = self._get_store()
+        if store is not None:
+            try:
+                await asyncio.to_thread(store.delete, uri)
+            except sqlite3.Error as e:
+                logger.warning(f"Response cache invalidation failed: {e}")
+        return len(keys)
+
+    async def invalidate_after(self, uri: str) -> None:
+        """写接口 uri 调用成功后，失效受其影响的缓存"""
+        for target in _INVALIDATED_BY.get(uri, ()):
+            await self.invalidate(target)
+
+    async def close(self) -> None:
+        if self._store is not None:
+            await asyncio.to_thread(self._store.close)
+            self._store = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取缓存统计信息"""
+        lookups = self._hits + self._misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "hits": self._hits,
+            "misses": self._misses,
+            "hit_rate": round(self._hits / lookups, 4) if lookups else 0.0,
+            "evictions": self._evictions,
+            "persist": self._store is not None,
+        }
+
+
+_response_cache: Optional[ResponseCache] = None
+
+
+def get_response_cache() -> ResponseCache:
+    global _response_cache
+    if _response_cache is None:
+        _response_cache = ResponseCache()
+    return _response_cache
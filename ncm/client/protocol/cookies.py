@@ -1,9 +1,13 @@
 # api/cookies.py
 import random
 import time
-from typing import Dict, Any, Optional, Union
+from typing import Dict, Any, Optional, Tuple, Union
 
 from .options import RequestOptions, OSType
+from ncm.core.config import get_config_manager
+
+# 匿名 Cookie 标识缓存: ({name: value}, 生成时间)
+_anonymous_ids: Optional[Tuple[Dict[str, str], float]] = None
 
 
 def _gen_hex(n: int) -> str:
@@ -11,6 +15,26 @@ def _gen_hex(n: int) -> str:
     return secrets.token_hex(n // 2) if n % 2 == 0 else secrets.token_hex((n + 1) // 2)
 
 
+def _get_anonymous_ids() -> Dict[str, str]:
+    """
+    Random identifiers injected when the caller's cookie lacks them, regenerated every
+    client.crypto_rotation_seconds (0 = per request) instead of on every call.
+    """
+    global _anonymous_ids
+    rotation = get_config_manager().load_sync().client.crypto_rotation_seconds
+    now = time.monotonic()
+    if rotation <= 0 or _anonymous_ids is None or now - _anonymous_ids[1] >= rotation:
+        ntes_nuid = _gen_hex(32)
+        timestamp = str(int(time.time() * 1000))
+        _anonymous_ids = ({
+            "_ntes_nuid": ntes_nuid,
+            "_ntes_nnid": f"{ntes_nuid},{timestamp}",
+            "deviceId": _gen_hex(32),
+            "NMTID": _gen_hex(16),
+        }, now)
+    return _anonymous_ids[0]
+
+
 def _default_os_config():
     return {
         OSType.PC: {"os": "pc", "appver": "3.1.17.204416", "osver": "Microsoft-Windows-10"},
@@ -38,17 +62,16 @@ def process_cookie(cookie: Optional[Union[str, Dict[str, str]]], uri: str, optio
     os_cfg_map = _default_os_config()
     os_cfg = os_cfg_map.get(options.os_type, os_cfg_map[OSType.PC]) if hasattr(options, "os_type") else os_cfg_map[OSType.PC]
 
-    ntes_nuid = _gen_hex(32)
-    timestamp = str(int(time.time() * 1000))
+    anonymous_ids = _get_anonymous_ids()
 
     processed = {
         "__remember_me": "true",
         "ntes_kaola_ad": "1",
-        "_ntes_nuid": cookie_dict.get("_ntes_nuid", ntes_nuid),
-        "_ntes_nnid": cookie_dict.get("_ntes_nnid", f"{ntes_nuid},{timestamp}"),
+        "_ntes_nuid": cookie_dict.get("_ntes_nuid", anonymous_ids["_ntes_nuid"]),
+        "_ntes_nnid": cookie_dict.get("_ntes_nnid", anonymous_ids["_ntes_nnid"]),
         "WEVNSM": cookie_dict.get("WEVNSM", "1.0.0"),
         "osver": cookie_dict.get("osver", os_cfg["osver"]),
-        "deviceId": cookie_dict.get("deviceId", options.device_id or _gen_hex(32)),
+        "deviceId": cookie_dict.get("deviceId", options.device_id or anonymous_ids["deviceId"]),
         "os": cookie_dict.get("os", os_cfg["os"]),
         "channel": cookie_dict.get("channel", cookie_dict.get("channel", "netease")),
         "appver": cookie_dict.get("appver", os_cfg["appver"]),
@@ -57,7 +80,7 @@ def process_cookie(cookie: Optional[Union[str, Dict[str, str]]], uri: str, optio
 
     # add NMTID for non-login
     if "login" not in uri:
-        processed.setdefault("NMTID", _gen_hex(16))
+        processed.setdefault("NMTID", anonymous_ids["NMTID"])
 
     if not cookie_dict.get("MUSIC_U"):
         # add anonymous token placeholder if MUSIC_U missing (client may override)
@@ -8,7 +8,9 @@ import json
 import hashlib
 import random
 import string
-from typing import Dict, Any, Union
+import time
+from functools import lru_cache
+from typing import Dict, Any, Optional, Tuple, Union
 from Crypto.Cipher import AES
 from Crypto.PublicKey import RSA
 from Crypto.Cipher import PKCS1_v1_5
@@ -18,6 +20,8 @@ import base64
 
 from .options import CryptoType
 from ncm.client.exceptions import EncryptionError
+from ncm.core import jsonlib
+from ncm.core.config import get_config_manager
 
 # Constants from original implementation
 IV = b'0102030405060708'
@@ -31,6 +35,23 @@ RSA_PUBLIC_KEY = """-----BEGIN PUBLIC KEY-----
 MIGfMA0GCSqGSIb3DQEBAQUAA4GNADCBiQKBgQDgtQn2JZ34ZC28NWYpAUd98iZ37BUrX/aKzmFbt7clFSs6sXqHauqKWqdtLkF2KexO40H1YTX8z2lSgBBOAxLsvaklV8k4cBFK9snQXE9/DDaFt6Rr7iVZMldczhC0JNgTz+SHXT6CBHuX3e9SdB1Ua44oncaTWz7OBGLbCiK45wIDAQAB
 -----END PUBLIC KEY-----"""
 
+# 复用同一个编码器实例；json.dumps 传入非默认参数时每次都会新建 JSONEncoder
+_json_encode = json.JSONEncoder(separators=(',', ':'), ensure_ascii=False).encode
+
+# WEAPI 会话密钥缓存: (secret_key, encSecKey, 生成时间)
+_weapi_key: Optional[Tuple[bytes, str, float]] = None
+
+
+@lru_cache(maxsize=4)
+def _import_rsa_key(public_key_pem: str) -> RSA.RsaKey:
+    return RSA.import_key(public_key_pem)
+
+
+@lru_cache(maxsize=8)
+def _ecb_cipher(key: bytes):
+    """ECB 模式没有链式状态，cipher 对象可以跨消息复用"""
+    return AES.new(key, AES.MODE_ECB)
+
 
 def _generate_random_string(length: int = 16) -> str:
     """Generate random string for encryption key."""
@@ -67,9 +88,8 @@ def _aes_encrypt_weapi(data_bytes: bytes, key: bytes, iv: bytes, mode: int = AES
 def _aes_encrypt_ecb_hex(text: str, key: bytes) -> str:
     """AES ECB encryption returning hex string."""
     try:
-        cipher = AES.new(key, AES.MODE_ECB)
         padded_text = pad(text.encode('utf-8'), AES.block_size)
-        encrypted = cipher.encrypt(padded_text)
+        encrypted = _ecb_cipher(key).encrypt(padded_text)
         return encrypted.hex().upper()
     except Exception as e:
         raise EncryptionError(f"AES ECB encryption failed: {str(e)}")
@@ -78,9 +98,8 @@ def _aes_encrypt_ecb_hex(text: str, key: bytes) -> str:
 def _aes_decrypt_ecb_hex(ciphertext: str, key: bytes) -> str:
     """AES ECB decryption from hex string."""
     try:
-        cipher = AES.new(key, AES.MODE_ECB)
         encrypted_data = bytes.fromhex(ciphertext)
-        decrypted = cipher.decrypt(encrypted_data)
+        decrypted = _ecb_cipher(key).decrypt(encrypted_data)
         unpadded = unpad(decrypted, AES.block_size)
         return unpadded.decode('utf-8')
     except Exception as e:
@@ -90,8 +109,7 @@ def _aes_decrypt_ecb_hex(ciphertext: str, key: bytes) -> str:
 def _aes_decrypt_ecb(encrypted_data: bytes, key: bytes) -> str:
     """AES ECB decryption from hex string."""
     try:
-        cipher = AES.new(key, AES.MODE_ECB)
-        decrypted = cipher.decrypt(encrypted_data)
+        decrypted = _ecb_cipher(key).decrypt(encrypted_data)
         unpadded = unpad(decrypted, AES.block_size)
         return unpadded.decode('utf-8')
     except Exception as e:
@@ -118,8 +136,8 @@ def _rsa_encrypt_raw_forge_style(text: str, public_key_pem: str) -> str:
     警告: 这种模式（原始/无填充 RSA）是极度不安全的。
     """
     try:
-        # 1. 导入密钥
-        key = RSA.import_key(public_key_pem)
+        # 1. 导入密钥（解析结果已缓存）
+        key = _import_rsa_key(public_key_pem)
 
         # 2. 对照 forge: 字符串输入和编码处理
         # forge.encrypt 默认将 string 转换为 Latin-1 字节
@@ -151,6 +169,24 @@ def _rsa_encrypt_raw_forge_style(text: str, public_key_pem: str) -> str:
         raise EncryptionError(f"Raw RSA encryption failed: {str(e)}")
 
 
+def _get_weapi_key() -> Tuple[bytes, str]:
+    """
+    Return (secret_key, encSecKey), regenerated every client.crypto_rotation_seconds.
+
+    The RSA step only depends on the secret key, so reusing the pair skips the modexp;
+    a rotation period of 0 generates a fresh key for every request.
+    """
+    global _weapi_key
+    rotation = get_config_manager().load_sync().client.crypto_rotation_seconds
+    now = time.monotonic()
+    if rotation <= 0 or _weapi_key is None or now - _weapi_key[2] >= rotation:
+        # Generate random 16-character secret key; RSA encrypt the reversed key
+        secret_key = _generate_random_string(16)
+        encrypted_key = _rsa_encrypt_raw_forge_style(secret_key[::-1], RSA_PUBLIC_KEY)
+        _weapi_key = (secret_key.encode('utf-8'), encrypted_key, now)
+    return _weapi_key[0], _weapi_key[1]
+
+
 def encrypt_weapi(data: Dict[str, Any]) -> Dict[str, str]:
     """
     WEAPI encryption (Web API).
@@ -159,22 +195,15 @@ def encrypt_weapi(data: Dict[str, Any]) -> Dict[str, str]:
     This is the default encryption method for web requests.
     """
     try:
-        text = json.dumps(data, separators=(',', ':'), ensure_ascii=False)
-
-        # print(text)
+        text = _json_encode(data)
 
-        # Generate random 16-character secret key
-        secret_key = _generate_random_string(16)
+        secret_key, encrypted_key = _get_weapi_key()
 
         # First AES encryption with preset key
         first_encrypted = _aes_encrypt_weapi(text.encode('utf-8'), PRESET_KEY, IV)
 
-        # Second AES encryption with random secret key
-        second_encrypted = _aes_encrypt_weapi(first_encrypted.encode('utf-8'), secret_key.encode('utf-8'), IV)
-
-        # RSA encrypt the reversed secret key
-        reversed_key = secret_key[::-1]
-        encrypted_key = _rsa_encrypt_raw_forge_style(reversed_key, RSA_PUBLIC_KEY)
+        # Second AES encryption with the session secret key
+        second_encrypted = _aes_encrypt_weapi(first_encrypted.encode('utf-8'), secret_key, IV)
 
         return {
             'params': second_encrypted,
@@ -192,7 +221,7 @@ def encrypt_linuxapi(data: Dict[str, Any]) -> Dict[str, str]:
     Used for Linux client API requests.
     """
     try:
-        text = json.dumps(data, separators=(',', ':'), ensure_ascii=False)
+        text = _json_encode(data)
         encrypted = _aes_encrypt_ecb_hex(text, LINUXAPI_KEY)
 
         return {
@@ -210,7 +239,7 @@ def encrypt_eapi(url: str, data: Dict[str, Any]) -> Dict[str, str]:
     Used for mobile client API requests.
     """
     try:
-        text = json.dumps(data, separators=(',', ':'), ensure_ascii=False) if isinstance(data, dict) else str(data)
+        text = _json_encode(data) if isinstance(data, dict) else str(data)
 
         # Create message for MD5 hash
         message = f"nobody{url}use{text}md5forencrypt"
@@ -241,7 +270,7 @@ def decrypt_eapi_response(encrypted_data: Union[str, bytes]) -> Dict[str, Any]:
         else:
             en_data = encrypted_data
         decrypted = _aes_decrypt_ecb(en_data, EAPI_KEY)
-        return json.loads(decrypted)
+        return jsonlib.loads(decrypted)
     except Exception as e:
         raise EncryptionError(f"EAPI response decryption failed: {str(e)}")
 
@@ -49,6 +49,8 @@ class RequestOptions:
     # Other options
     check_token: bool = False
     timeout: int = 30
+    # False 时跳过响应缓存读取（仍会用新响应刷新缓存）
+    cache: bool = True
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for serialization."""
@@ -64,7 +66,8 @@ class RequestOptions:
             "device_id": self.device_id,
             "headers": self.headers,
             "check_token": self.check_token,
-            "timeout": self.timeout
+            "timeout": self.timeout,
+            "cache": self.cache
         }
 
 
@@ -149,5 +152,6 @@ def _create_options(
         device_id=kwargs.get('device_id'),
         headers=kwargs.get('headers', {}),
         check_token=kwargs.get('check_token', False),
-        timeout=kwargs.get('timeout', 30)
+        timeout=kwargs.get('timeout', 30),
+        cache=kwargs.get('cache', True)
     )
\ No newline at end of file
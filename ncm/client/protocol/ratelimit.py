@@ -0,0 +1,193 @@
+# api/ratelimit.py
+"""Adaptive per-endpoint-family rate limiting and circuit breaking for NCM API calls."""
+
+import asyncio
+import hashlib
+import time
+from typing import Any, Dict, Optional
+
+from ncm.client.exceptions import CircuitOpenError, RateLimitError
+from ncm.core.config import ClientSettings, get_config_manager
+from ncm.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+# 上游 URI 前缀 -> 接口族；同一族共享令牌桶与熔断状态
+_FAMILIES = (
+    ("/api/v3/song/detail", "song_detail"),
+    ("/api/song/lyric", "lyric"),
+    ("/api/song/enhance/", "song_url"),
+    ("/api/v6/playlist/", "playlist"),
+    ("/api/playlist/", "playlist"),
+    ("/api/search/", "search"),
+    ("/api/user/", "user"),
+    ("/api/v1/user/", "user"),
+    ("/api/w/nuser/", "user"),
+    ("/api/login/", "login"),
+    ("/api/register/", "login"),
+    ("/api/batch", "batch"),
+)
+
+
+def endpoint_family(uri: str) -> str:
+    for prefix, family in _FAMILIES:
+        if uri.startswith(prefix):
+            return family
+    return "other"
+
+
+def account_tag(music_u: Optional[str]) -> Optional[str]:
+    """账号的短标识（MUSIC_U 的哈希前缀），用于统计键，不暴露 Cookie 本身"""
+    if not music_u:
+        return None
+    return hashlib.sha1(music_u.encode("utf-8")).hexdigest()[:8]
+
+
+class _Family:
+    """单个接口族的令牌桶与熔断器状态"""
+
+    def __init__(self, name: str, settings: ClientSettings):
+        self.name = name
+        self.rate = settings.rate_limit_initial_rps
+        self.tokens = float(settings.rate_limit_burst)
+        self.updated = time.monotonic()
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self.probing = False
+        self.requests = 0
+        self.throttled = 0
+        self.rejected = 0
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        return "half_open" if self.probing else "open"
+
+
+class AdaptiveRateLimiter:
+    """自适应限流器 - 按接口族的令牌桶 + 熔断器，所有调用方共享
+
+    速率采用 AIMD：每次成功加 INCREASE_RPS，被限流（429/503、RateLimitError）时乘以 DECREASE_FACTOR，
+    在 [rate_limit_min_rps, rate_limit_max_rps] 之间逼近 NCM 可容忍的最高速率。
+    令牌不足时调用方按预约顺序等待；预计等待超过 rate_limit_max_wait_seconds 则直接报错。
+
+    连续 circuit_failure_threshold 次失败（限流、网络错误、5xx）后熔断：
+    open 期间直接抛出 CircuitOpenError；circuit_open_seconds 后进入 half_open，只放行一个探测请求，
+    探测成功则恢复，失败则重新熔断。
+    """
+
+    INCREASE_RPS = 0.2
+    DECREASE_FACTOR = 0.5
+
+    def __init__(self):
+        self._families: Dict[str, _Family] = {}
+
+    @staticmethod
+    def _settings() -> ClientSettings:
+        return get_config_manager().load_sync().client
+
+    async def acquire(self, uri: str, account: Optional[str] = None) -> str:
+        """为 uri 的一次上游请求获取令牌，返回其限流键（接口族名，按账号区分时为 ``family@account``）"""
+        name = endpoint_family(uri)
+        settings = self._settings()
+        if account and settings.rate_limit_per_account:
+            name = f"{name}@{account}"
+        if not settings.rate_limit_enabled:
+            return name
+
+        family = self._families.get(name)
+        if family is None:
+            family = self._families[name] = _Family(name, settings)
+
+        now = time.monotonic()
+        self._check_circuit(family, settings, now)
+
+        family.tokens = min(float(settings.rate_limit_burst), family.tokens + (now - family.updated) * family.rate)
+        family.updated = now
+        family.tokens -= 1
+        family.requests += 1
+        if family.tokens < 0:
+            wait = -family.tokens / family.rate
+            if wait > settings.rate_limit_max_wait_seconds:
+                family.tokens += 1
+                family.rejected += 1
+                raise RateLimitError(f"{name} 接口本地限流排队超时", 429, {"family": name, "wait": round(wait, 2)})
+            await asyncio.sleep(wait)
+        return name
+
+    def _check_circuit(self, family: _Family, settings: ClientSettings, now: float) -> None:
+        if family.opened_at is None:
+            return
+        remaining = settings.circuit_open_seconds - (now - family.opened_at)
+        if remaining > 0:
+            family.rejected += 1
+            raise CircuitOpenError(
+                f"{family.name} 接口已熔断，请稍后重试", 503,
+                {"family": family.name, "retry_after": round(remaining, 1)}
+            )
+        # half_open：放行一个探测请求，其余请求再等待一个周期（探测请求被取消时也不会一直卡住）
+        family.probing = True
+        family.opened_at = now
+
+    def record_success(self, name: str) -> None:
+        family = self._families.get(name)
+        if family is None:
+            return
+        family.failures = 0
+        if family.opened_at is not None:
+            family.opened_at = None
+            family.probing = False
+            logger.info(f"NCM {name} 接口恢复，熔断关闭")
+        family.rate = min(self._settings().rate_limit_max_rps, family.rate + self.INCREASE_RPS)
+
+    def record_throttle(self, name: str) -> None:
+        family = self._families.get(name)
+        if family is None:
+            return
+        settings = self._settings()
+        family.throttled += 1
+        family.rate = max(settings.rate_limit_min_rps, family.rate * self.DECREASE_FACTOR)
+        # 丢弃剩余突发额度，立即按新速率放行
+        family.tokens = min(family.tokens, 0.0)
+        logger.warning(f"NCM {name} 接口被限流，速率降至 {family.rate:.2f} req/s")
+        self.record_failure(name)
+
+    def record_failure(self, name: str) -> None:
+        family = self._families.get(name)
+        if family is None:
+            return
+        family.failures += 1
+        if family.probing:
+            family.opened_at = time.monotonic()
+            family.probing = False
+            logger.warning(f"NCM {name} 接口探测失败，继续熔断")
+        elif family.opened_at is None and family.failures >= self._settings().circuit_failure_threshold:
+            family.opened_at = time.monotonic()
+            logger.warning(f"NCM {name} 接口连续失败 {family.failures} 次，熔断 "
+                           f"{self._settings().circuit_open_seconds:g} 秒")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取各接口族的限流与熔断状态"""
+        return {
+            name: {
+                "state": family.state,
+                "rate": round(family.rate, 2),
+                "tokens": round(family.tokens, 2),
+                "failures": family.failures,
+                "requests": family.requests,
+                "throttled": family.throttled,
+                "rejected": family.rejected,
+            }
+            for name, family in self._families.items()
+        }
+
+
+_rate_limiter: Optional[AdaptiveRateLimiter] = None
+
+
+def get_rate_limiter() -> AdaptiveRateLimiter:
+    global _rate_limiter
+    if _rate_limiter is None:
+        _rate_limiter = AdaptiveRateLimiter()
+    return _rate_limiter
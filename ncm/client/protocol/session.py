@@ -4,71 +4,48 @@ import httpx
 from typing import Optional
 
 from ncm.client import RequestOptions
+from ncm.client.protocol.router import API_DOMAIN, DOMAIN
+from ncm.client.protocol.transport import TrafficClass, get_transport_registry
 from ncm.core.logging import get_logger
 
 logger = get_logger(__name__)
 
-_session: Optional[httpx.AsyncClient] = None
-_session_proxy: Optional[str] = None
-_lock = asyncio.Lock()
-
-
-async def _create_session(options: RequestOptions) -> httpx.AsyncClient:
-    logger.debug(
-        "Create new AsyncClient (proxy=%s)",
-        options.proxy
-    )
-    return httpx.AsyncClient(
-        timeout=30.0,
-        follow_redirects=True,
-        http2=True,
-        proxy=options.proxy,
-        verify=False if options.proxy else True,
-    )
-
 
 async def get_session(
     options: Optional[RequestOptions] = None
 ) -> httpx.AsyncClient:
     """
-    Get or create a shared AsyncClient instance.
-    Recreate session when proxy changes.
+    Get the shared API AsyncClient for options.proxy.
+    Clients are pooled per proxy by the transport registry, so switching proxies never closes a client in use.
     """
-    global _session, _session_proxy
-
     if options is None:
         raise ValueError("RequestOptions is required")
+    return await get_transport_registry().get_client(TrafficClass.API, options.proxy)
 
-    async with _lock:
-        need_recreate = (
-            _session is None
-            or _session.is_closed
-            or _session_proxy != options.proxy
-        )
 
-        if need_recreate:
-            if _session is not None and not _session.is_closed:
-                logger.debug(
-                    "Proxy changed (%s -> %s), closing old session",
-                    _session_proxy,
-                    options.proxy,
-                )
-                await _session.aclose()
+async def warm_up(proxy: Optional[str] = None, timeout: float = 5.0) -> int:
+    """
+    预热连接：提前与 NCM 各域名完成 DNS 解析、TLS 与 HTTP/2 握手，连接保留在池中供随后的请求复用。
+    失败不影响调用方，返回成功预热的域名数。
+    """
+    client = await get_session(RequestOptions(proxy=proxy))
 
-            _session = await _create_session(options)
-            _session_proxy = options.proxy
+    async def _touch(url: str) -> bool:
+        try:
+            await client.head(url, timeout=timeout)
+            return True
+        except Exception as e:
+            logger.debug(f"Warm-up of {url} failed: {e}")
+            return False
 
-        return _session
+    results = await asyncio.gather(*(_touch(url) for url in (DOMAIN, API_DOMAIN)))
+    warmed = sum(results)
+    logger.debug(f"Warmed up {warmed}/{len(results)} NCM hosts (proxy={proxy})")
+    return warmed
 
 
 async def close_session() -> None:
     """
-    Close shared session (optional cleanup).
+    Close all pooled clients (API, audio and image) (optional cleanup).
     """
-    global _session, _session_proxy
-
-    async with _lock:
-        if _session is not None and not _session.is_closed:
-            await _session.aclose()
-        _session = None
-        _session_proxy = None
+    await get_transport_registry().close()
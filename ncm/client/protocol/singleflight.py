@@ -0,0 +1,94 @@
+# api/singleflight.py
+"""Single-flight coalescing of identical in-flight NCM API calls."""
+
+import asyncio
+import copy
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from ncm.client.protocol.options import APIResponse
+from ncm.core.config import get_config_manager
+from ncm.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+# 只读接口（URI 前缀）；写接口与登录、注册等有副作用的请求不合并
+_COALESCED_URI_PREFIXES = (
+    "/api/v3/song/detail",
+    "/api/v6/playlist/detail",
+    "/api/song/lyric",
+    "/api/song/enhance/player/url",
+    "/api/song/enhance/download/url",
+    "/api/user/playlist",
+    "/api/v1/user/detail/",
+    "/api/w/nuser/account/get",
+    "/api/search/",
+)
+
+
+def is_coalesced(uri: str) -> bool:
+    """uri 是否参与请求合并"""
+    if not get_config_manager().load_sync().client.coalesce_requests:
+        return False
+    return uri.startswith(_COALESCED_URI_PREFIXES)
+
+
+def _clone(response: APIResponse) -> APIResponse:
+    return APIResponse(
+        status=response.status,
+        body=copy.deepcopy(response.body),
+        cookies=list(response.cookies),
+        headers=dict(response.headers),
+    )
+
+
+class SingleFlight:
+    """请求合并器 - 相同键的并发调用共享一次上游请求
+
+    首个调用者（leader）在独立任务中执行请求，后到的调用者（follower）等待同一任务；
+    follower 拿到响应体的副本，异常则原样抛给所有等待者。
+    leader 被取消时上游请求继续执行，不影响仍在等待的 follower。
+    """
+
+    def __init__(self):
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self._leaders = 0
+        self._followers = 0
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[APIResponse]]) -> APIResponse:
+        task = self._inflight.get(key)
+        if task is not None:
+            self._followers += 1
+            return _clone(await asyncio.shield(task))
+
+        self._leaders += 1
+        task = asyncio.ensure_future(fn())
+        self._inflight[key] = task
+        task.add_done_callback(lambda t: self._done(key, t))
+        return await asyncio.shield(task)
+
+    def _done(self, key: str, task: asyncio.Task) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        # 所有等待者都已取消时，避免 "exception was never retrieved" 警告
+        if not task.cancelled() and task.exception() is not None:
+            logger.debug(f"Coalesced request failed: {task.exception()}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取合并统计信息；hits 为被合并的调用数，misses 为实际发出的上游请求数"""
+        total = self._leaders + self._followers
+        return {
+            "inflight": len(self._inflight),
+            "hits": self._followers,
+            "misses": self._leaders,
+            "hit_rate": round(self._followers / total, 4) if total else 0.0,
+        }
+
+
+_single_flight: Optional[SingleFlight] = None
+
+
+def get_single_flight() -> SingleFlight:
+    global _single_flight
+    if _single_flight is None:
+        _single_flight = SingleFlight()
+    return _single_flight
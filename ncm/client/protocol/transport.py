@@ -0,0 +1,323 @@
+# api/transport.py
+"""Shared, tuned HTTP clients per traffic class (API, audio CDN, image CDN)."""
+
+import asyncio
+import ipaddress
+import socket
+import time
+from enum import Enum
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpcore
+import httpx
+from httpx._utils import get_environment_proxies
+
+from ncm.core.config import ClientSettings, TransportProfile, get_config_manager
+from ncm.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+class TrafficClass(str, Enum):
+    API = "api"
+    AUDIO = "audio"
+    IMAGE = "image"
+
+
+class _CachingNetworkBackend(httpcore.AsyncNetworkBackend):
+    """在 httpcore 网络后端外加一层 DNS 缓存；TLS 的 SNI 与证书校验仍使用原始主机名"""
+
+    def __init__(self, backend: httpcore.AsyncNetworkBackend, ttl: float):
+        self._backend = backend
+        self._ttl = ttl
+        self._cache: Dict[Tuple[str, int], Tuple[float, List[str]]] = {}
+        # 同一主机的并发解析共享一次 getaddrinfo
+        self._resolving: Dict[Tuple[str, int], asyncio.Future] = {}
+        self.hits = 0
+        self.misses = 0
+
+    async def _resolve(self, host: str, port: int) -> List[str]:
+        key = (host, port)
+        cached = self._cache.get(key)
+        if cached is not None and cached[0] > time.monotonic():
+            self.hits += 1
+            return cached[1]
+        pending = self._resolving.get(key)
+        if pending is not None:
+            self.hits += 1
+            return await asyncio.shield(pending)
+
+        self.misses += 1
+        pending = self._resolving[key] = asyncio.ensure_future(self._lookup(host, port))
+        try:
+            return await asyncio.shield(pending)
+        finally:
+            if self._resolving.get(key) is pending:
+                del self._resolving[key]
+
+    async def _lookup(self, host: str, port: int) -> List[str]:
+        infos = await asyncio.get_running_loop().getaddrinfo(host, port, type=socket.SOCK_STREAM)
+        addresses = list(dict.fromkeys(info[4][0] for info in infos))
+        self._cache[(host, port)] = (time.monotonic() + self._ttl, addresses)
+        return addresses
+
+    async def connect_tcp(self, host, port, timeout=None, local_address=None, socket_options=None):
+        try:
+            ipaddress.ip_address(host)
+            is_literal = True
+        except ValueError:
+            is_literal = False
+        if is_literal or self._ttl <= 0:
+            return await self._backend.connect_tcp(host, port, timeout, local_address, socket_options)
+
+        # 与 httpcore 自带后端一致：解析计入连接超时，解析失败映射为 ConnectError（httpx.ConnectError）
+        try:
+            addresses = await asyncio.wait_for(self._resolve(host, port), timeout)
+        except asyncio.TimeoutError as e:
+            raise httpcore.ConnectTimeout(f"DNS lookup for {host} timed out") from e
+        except OSError as e:
+            raise httpcore.ConnectError(str(e)) from e
+
+        error: Optional[Exception] = None
+        for address in addresses:
+            try:
+                return await self._backend.connect_tcp(address, port, timeout, local_address, socket_options)
+            except (httpcore.ConnectError, httpcore.ConnectTimeout) as e:
+                error = e
+        # 缓存的地址全部不可用时丢弃缓存，下次重新解析
+        self._cache.pop((host, port), None)
+        raise error or httpcore.ConnectError(f"No address for {host}")
+
+    async def connect_unix_socket(self, path, timeout=None, socket_options=None):
+        return await self._backend.connect_unix_socket(path, timeout, socket_options)
+
+    async def sleep(self, seconds: float) -> None:
+        await self._backend.sleep(seconds)
+
+
+class _HostSlot:
+    def __init__(self, limit: int):
+        self.semaphore = asyncio.Semaphore(limit)
+        self.in_flight = 0
+        self.waiting = 0
+        self.requests = 0
+
+
+class _ReleasingStream(httpx.AsyncByteStream):
+    """响应体读完或关闭时归还主机并发名额（流式下载会长时间占用名额）"""
+
+    def __init__(self, stream: httpx.AsyncByteStream, slot: _HostSlot):
+        self._stream = stream
+        self._slot: Optional[_HostSlot] = slot
+
+    async def __aiter__(self):
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self) -> None:
+        try:
+            await self._stream.aclose()
+        finally:
+            slot, self._slot = self._slot, None
+            if slot is not None:
+                slot.in_flight -= 1
+                slot.semaphore.release()
+
+
+class _HostLimitedTransport(httpx.AsyncBaseTransport):
+    """对每个主机的并发请求数设上限，并记录各主机的请求统计"""
+
+    def __init__(self, transport: httpx.AsyncHTTPTransport, max_per_host: int, dns_ttl: float):
+        self._transport = transport
+        # httpx 没有公开替换网络后端的参数，这里替换其 httpcore 连接池的后端
+        self.backend = _CachingNetworkBackend(transport._pool._network_backend, dns_ttl)
+        transport._pool._network_backend = self.backend
+        self._max_per_host = max_per_host
+        self._hosts: Dict[str, _HostSlot] = {}
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        host = request.url.netloc.decode("ascii")
+        slot = self._hosts.get(host)
+        if slot is None:
+            slot = self._hosts[host] = _HostSlot(self._max_per_host)
+
+        slot.waiting += 1
+        try:
+            await slot.semaphore.acquire()
+        finally:
+            slot.waiting -= 1
+        slot.in_flight += 1
+        slot.requests += 1
+        try:
+            response = await self._transport.handle_async_request(request)
+        except BaseException:
+            slot.in_flight -= 1
+            slot.semaphore.release()
+            raise
+        response.stream = _ReleasingStream(response.stream, slot)
+        return response
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+    def get_stats(self) -> Dict[str, Any]:
+        connections = self._transport._pool.connections
+        return {
+            "connections": len(connections),
+            "idle_connections": sum(1 for c in connections if c.is_idle()),
+            "hosts": {
+                host: {"in_flight": slot.in_flight, "waiting": slot.waiting, "requests": slot.requests}
+                for host, slot in self._hosts.items()
+            },
+        }
+
+
+class TransportRegistry:
+    """HTTP 传输注册表 - 按 (流量类别, 代理) 提供共享的 AsyncClient
+
+    API 请求、音频下载与封面获取各自使用一组连接池（配置见 client.transports），
+    同一类别内的所有调用方共享连接，默认启用 HTTP/2 多路复用；
+    每个客户端对单个主机的并发请求数受 max_per_host 限制，DNS 解析结果缓存 dns_cache_ttl_seconds 秒。
+
+    客户端总数超过 http_max_clients 时淘汰最早创建的一个，并在一个请求超时后再关闭，不打断其上的请求。
+    已存在的客户端无锁返回，只有创建时加锁。
+    """
+
+    def __init__(self):
+        self._clients: Dict[Tuple[TrafficClass, Optional[str]], httpx.AsyncClient] = {}
+        # 每个客户端的传输：直连或显式代理一个，另加环境变量代理各一个 [(代理标识, 传输)]
+        self._transports: Dict[Tuple[TrafficClass, Optional[str]], List[Tuple[str, _HostLimitedTransport]]] = {}
+        self._lock = asyncio.Lock()
+        # 被淘汰、等待关闭的客户端（其上可能仍有进行中的请求）
+        self._retiring: Dict[asyncio.Task, httpx.AsyncClient] = {}
+
+    @staticmethod
+    def _settings() -> ClientSettings:
+        return get_config_manager().load_sync().client
+
+    @staticmethod
+    def _profile(settings: ClientSettings, traffic: TrafficClass) -> TransportProfile:
+        profile = settings.transports.get(traffic.value)
+        return profile if profile is not None else TransportProfile()
+
+    async def get_client(self, traffic: TrafficClass, proxy: Optional[str] = None) -> httpx.AsyncClient:
+        key = (traffic, proxy)
+        client = self._clients.get(key)
+        if client is not None and not client.is_closed:
+            return client
+
+        async with self._lock:
+            client = self._clients.get(key)
+            if client is not None and not client.is_closed:
+                return client
+
+            # 已关闭的客户端先移出，不计入上限
+            self._clients.pop(key, None)
+            self._transports.pop(key, None)
+            settings = self._settings()
+            while len(self._clients) >= settings.http_max_clients:
+                old_key, old = next(iter(self._clients.items()))
+                self._clients.pop(old_key)
+                self._transports.pop(old_key, None)
+                logger.debug("Transport pool full, retiring client %s (proxy=%s)", old_key[0].value, old_key[1])
+                self._retire(old, self._profile(settings, old_key[0]).timeout_seconds)
+
+            client = self._create_client(key, settings)
+            return client
+
+    def _create_client(self, key: Tuple[TrafficClass, Optional[str]], settings: ClientSettings) -> httpx.AsyncClient:
+        traffic, proxy = key
+        profile = self._profile(settings, traffic)
+        logger.debug("Create new AsyncClient (class=%s, proxy=%s)", traffic.value, proxy)
+
+        def build(proxy_url: Optional[str], verify: bool) -> _HostLimitedTransport:
+            inner = httpx.AsyncHTTPTransport(
+                http2=profile.http2,
+                limits=httpx.Limits(
+                    max_connections=profile.max_connections,
+                    max_keepalive_connections=profile.max_keepalive_connections,
+                    keepalive_expiry=profile.keepalive_expiry_seconds,
+                ),
+                proxy=proxy_url,
+                verify=verify,
+            )
+            return _HostLimitedTransport(inner, profile.max_per_host, settings.dns_cache_ttl_seconds)
+
+        mounts: Dict[str, Optional[_HostLimitedTransport]] = {}
+        if proxy:
+            transport = build(proxy, verify=False)
+            transports = [(proxy, transport)]
+        else:
+            # 显式传入 transport 后 httpx 不再读取环境变量中的代理；按 trust_env 的规则
+            # (HTTP_PROXY / HTTPS_PROXY / ALL_PROXY / NO_PROXY) 为各 URL 模式挂载对应的传输，None 表示直连
+            transport = build(None, verify=True)
+            transports = [("direct", transport)]
+            by_url: Dict[str, _HostLimitedTransport] = {}
+            for pattern, proxy_url in get_environment_proxies().items():
+                if proxy_url is not None and proxy_url not in by_url:
+                    by_url[proxy_url] = build(proxy_url, verify=True)
+                    transports.append((proxy_url, by_url[proxy_url]))
+                mounts[pattern] = by_url[proxy_url] if proxy_url is not None else None
+
+        client = httpx.AsyncClient(
+            timeout=profile.timeout_seconds,
+            follow_redirects=True,
+            transport=transport,
+            mounts=mounts,
+        )
+        self._clients[key] = client
+        self._transports[key] = transports
+        return client
+
+    def _retire(self, client: httpx.AsyncClient, delay: float) -> None:
+        task = asyncio.create_task(self._close_later(client, delay))
+        self._retiring[task] = client
+        task.add_done_callback(lambda t: self._retiring.pop(t, None))
+
+    @staticmethod
+    async def _close_later(client: httpx.AsyncClient, delay: float) -> None:
+        # 等待进行中的请求结束（最长一个请求超时），再关闭连接
+        await asyncio.sleep(delay)
+        await client.aclose()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取各客户端的连接池与主机并发统计"""
+        transports = [
+            (traffic, label, transport)
+            for (traffic, _), entries in self._transports.items()
+            for label, transport in entries
+        ]
+        return {
+            "clients": [
+                {"class": traffic.value, "proxy": label, **transport.get_stats()}
+                for traffic, label, transport in transports
+            ],
+            "retiring": len(self._retiring),
+            "dns_cache": {
+                "hits": sum(t.backend.hits for _, _, t in transports),
+                "misses": sum(t.backend.misses for _, _, t in transports),
+            },
+        }
+
+    async def close(self) -> None:
+        """关闭所有客户端"""
+        async with self._lock:
+            clients = list(self._clients.values()) + list(self._retiring.values())
+            for task in list(self._retiring):
+                task.cancel()
+            self._clients.clear()
+            self._transports.clear()
+            self._retiring.clear()
+            for client in clients:
+                if not client.is_closed:
+                    await client.aclose()
+
+
+_transport_registry: Optional[TransportRegistry] = None
+
+
+def get_transport_registry() -> TransportRegistry:
+    global _transport_registry
+    if _transport_registry is None:
+        _transport_registry = TransportRegistry()
+    return _transport_registry
@@ -3,7 +3,7 @@ import json
 import asyncio
 import secrets
 from pathlib import Path
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Literal
 from pydantic import BaseModel, Field, field_validator
 from ncm.core.constants import CONFIG_FILE_NAME
 from ncm.core.time import UTC_CLOCK
@@ -16,6 +16,9 @@ class DownloadSettings(BaseModel):
     max_concurrent_downloads: int = Field(default=3, ge=1, le=100)
     # 单个下载最大线程数
     max_threads_per_download: int = Field(default=4, ge=1, le=64)
+    # 同一歌曲同音质在多个作业间的去重方式：
+    # auto 依次尝试 reflink -> hardlink -> copy；hardlink 仅在两个作业写入的标签一致时使用
+    dedup_mode: Literal["auto", "reflink", "hardlink", "copy"] = Field(default="auto")
 
     @field_validator("cron_expr")
     @classmethod
@@ -33,6 +36,115 @@ class DownloadSettings(BaseModel):
 
 
 
+class DatabaseSettings(BaseModel):
+    # 以下 PRAGMA 在每个新建的 SQLite 连接上执行
+    # 内存映射读取上限 (MiB)，0 表示关闭
+    mmap_size_mb: int = Field(default=256, ge=0, le=65536)
+    # 每个连接的页缓存 (MiB)
+    cache_size_mb: int = Field(default=32, ge=1, le=4096)
+    # WAL 自动检查点阈值 (页)
+    wal_autocheckpoint: int = Field(default=1000, ge=0)
+    # 等待写锁的超时时间 (毫秒)
+    busy_timeout_ms: int = Field(default=30000, ge=0)
+    # 只读连接池大小；仪表盘、统计与 WebSocket 快照等读请求走该池，不与写入方排队
+    read_pool_size: int = Field(default=4, ge=1, le=64)
+    # 完成超过该天数的任务移入归档表 download_task_archive，0 表示不归档
+    archive_after_days: int = Field(default=180, ge=0)
+    # 后台归档：每批移动的任务数、批间停顿（毫秒）与两轮之间的间隔（分钟）
+    archive_batch_size: int = Field(default=500, ge=1, le=10000)
+    archive_batch_pause_ms: int = Field(default=200, ge=0)
+    archive_interval_minutes: int = Field(default=60, ge=1)
+
+
+def _default_response_cache_ttl() -> Dict[str, int]:
+    return {
+        "/api/v3/song/detail": 600,
+        "/api/v6/playlist/detail": 120,
+        "/api/song/lyric": 86400,
+        "/api/song/lyric/v1": 86400,
+        "/api/user/playlist": 120,
+    }
+
+
+class TransportProfile(BaseModel):
+    timeout_seconds: float = Field(default=30.0, gt=0)
+    http2: bool = Field(default=True)
+    # 单个客户端的连接池上限与空闲连接保留时长
+    max_connections: int = Field(default=100, ge=1)
+    max_keepalive_connections: int = Field(default=20, ge=0)
+    keepalive_expiry_seconds: float = Field(default=60.0, ge=0)
+    # 对同一主机的并发请求上限（HTTP/2 下多个请求复用同一连接，按请求数计），超出的请求排队等待
+    max_per_host: int = Field(default=32, ge=1)
+
+
+def _default_transports() -> Dict[str, TransportProfile]:
+    return {
+        "api": TransportProfile(),
+        "audio": TransportProfile(max_connections=20, max_keepalive_connections=10,
+                                  keepalive_expiry_seconds=30.0, max_per_host=16),
+        "image": TransportProfile(max_connections=10, max_keepalive_connections=5,
+                                  keepalive_expiry_seconds=30.0, max_per_host=8),
+    }
+
+
+class ClientSettings(BaseModel):
+    # NCM 接口响应缓存：仅缓存下列上游 URI 的成功响应，值为 TTL（秒），0 表示不缓存
+    response_cache_enabled: bool = Field(default=True)
+    response_cache_ttl: Dict[str, int] = Field(default_factory=_default_response_cache_ttl)
+    # 内存 LRU 的容量上限 (MiB)，按序列化后的响应体字节数计
+    response_cache_max_mb: int = Field(default=64, ge=1, le=4096)
+    # 是否把缓存同时写入 cache 目录下的 SQLite 文件，重启后仍可命中
+    response_cache_persist: bool = Field(default=False)
+    # 合并同一账号、同一参数的并发只读请求，共享一次上游调用
+    coalesce_requests: bool = Field(default=True)
+    # WEAPI 会话密钥 (secret_key, encSecKey) 与匿名 Cookie 标识的轮换周期（秒），0 表示每个请求重新生成
+    crypto_rotation_seconds: int = Field(default=300, ge=0)
+    # 按接口族的自适应令牌桶：被限流（429/503）时速率减半，成功时逐步回升
+    rate_limit_enabled: bool = Field(default=True)
+    rate_limit_initial_rps: float = Field(default=10.0, gt=0)
+    rate_limit_min_rps: float = Field(default=0.5, gt=0)
+    rate_limit_max_rps: float = Field(default=50.0, gt=0)
+    rate_limit_burst: int = Field(default=10, ge=1)
+    # 本地排队等待超过该秒数时直接报 RateLimitError，而不是无限等待
+    rate_limit_max_wait_seconds: float = Field(default=30.0, ge=0)
+    # 连续失败（限流、网络错误、5xx）达到阈值后熔断该接口族，open 状态持续 circuit_open_seconds 秒
+    circuit_failure_threshold: int = Field(default=5, ge=1)
+    circuit_open_seconds: float = Field(default=30.0, gt=0)
+    # 令牌桶与熔断状态再按账号 (MUSIC_U) 区分，一个账号被限流不影响其他账号
+    rate_limit_per_account: bool = Field(default=True)
+    # 把短时间窗口内的多个只读请求合并为一次 /api/batch 请求；同一批次中每个 URI 至多一个子请求
+    batch_enabled: bool = Field(default=False)
+    batch_window_ms: int = Field(default=20, ge=1, le=1000)
+    batch_uris: List[str] = Field(default_factory=lambda: [
+        "/api/v3/song/detail",
+        "/api/song/lyric",
+        "/api/song/lyric/v1",
+        "/api/song/enhance/player/url/v1",
+    ])
+    # HTTP 传输：按流量类别 (api/audio/image) 的连接池配置，见 TransportProfile
+    transports: Dict[str, TransportProfile] = Field(default_factory=_default_transports)
+    # 每个流量类别按代理各建一个客户端，最多 http_max_clients 个
+    http_max_clients: int = Field(default=8, ge=1, le=64)
+    # DNS 解析结果缓存时长（秒），0 表示不缓存
+    dns_cache_ttl_seconds: int = Field(default=300, ge=0)
+    # 同步开始前预热与 NCM 各域名的连接
+    warm_up_on_sync: bool = Field(default=True)
+
+
+class SessionPoolSettings(BaseModel):
+    # 多账号会话池：详情、歌词等只读请求在多个有效账号间分摊；取播放链接仍使用当前账号
+    enabled: bool = Field(default=False)
+    # round_robin 轮询；least_throttled 优先最久未被限流的账号；pinned 同一下载任务固定使用一个账号
+    policy: Literal["round_robin", "least_throttled", "pinned"] = Field(default="least_throttled")
+    # 从数据库重新加载有效会话的间隔（秒）
+    refresh_seconds: int = Field(default=300, ge=10)
+    # 被限流或健康分低于 min_health 的账号在冷却期内不参与分配
+    throttle_cooldown_seconds: float = Field(default=60.0, ge=0)
+    min_health: float = Field(default=0.3, ge=0, le=1)
+    # 只使用与当前账号 VIP 类型相同的账号，保证返回的 privilege（可下载音质等）一致
+    same_vip_type_only: bool = Field(default=True)
+
+
 class SubscriptionSettings(BaseModel):
     target_quality: str = Field(default=r"hires")
     embed_metadata: bool = Field(default=True)
@@ -65,6 +177,9 @@ class AuthorizationSettings(BaseModel):
 class NcmConfig(BaseModel):
     download: DownloadSettings = Field(default_factory=DownloadSettings)
     subscription: SubscriptionSettings = Field(default_factory=SubscriptionSettings)
+    database: DatabaseSettings = Field(default_factory=DatabaseSettings)
+    client: ClientSettings = Field(default_factory=ClientSettings)
+    session_pool: SessionPoolSettings = Field(default_factory=SessionPoolSettings)
     auth: AuthorizationSettings = Field(default_factory=AuthorizationSettings)
 
 
@@ -0,0 +1,73 @@
+"""JSON 编解码：优先使用 orjson，其次 msgspec，均未安装时回退到标准库 json。
+
+输出为紧凑的 UTF-8 字节（不转义非 ASCII 字符），与
+``json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode()`` 等价；
+快速后端无法处理的输入（超过 64 位的整数、非字符串键等）自动交给标准库处理。
+解析时 orjson 会把超过 64 位的整数读为浮点数；NCM 的 ID 均在 64 位范围内。
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any, Callable, Optional, Union
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:  # pragma: no cover - optional dependency
+    msgspec = None
+
+if orjson is not None:
+    BACKEND = "orjson"
+elif msgspec is not None:
+    BACKEND = "msgspec"
+else:
+    BACKEND = "json"
+
+_encoder = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"))
+_sorted_encoder = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"), sort_keys=True)
+_msgspec_decoder = msgspec.json.Decoder() if msgspec is not None else None
+
+
+def _std_dumps(obj: Any, sort_keys: bool, default: Optional[Callable[[Any], Any]]) -> bytes:
+    if default is None:
+        encoder = _sorted_encoder if sort_keys else _encoder
+        return encoder.encode(obj).encode("utf-8")
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"), sort_keys=sort_keys,
+                      default=default).encode("utf-8")
+
+
+def dumps(obj: Any, *, sort_keys: bool = False, default: Optional[Callable[[Any], Any]] = None) -> bytes:
+    """序列化为紧凑的 UTF-8 JSON 字节"""
+    try:
+        if orjson is not None:
+            return orjson.dumps(obj, default=default, option=orjson.OPT_SORT_KEYS if sort_keys else 0)
+        if msgspec is not None:
+            return msgspec.json.encode(obj, enc_hook=default, order="sorted" if sort_keys else None)
+    except (TypeError, ValueError, OverflowError):
+        pass
+    return _std_dumps(obj, sort_keys, default)
+
+
+def dumps_str(obj: Any, *, sort_keys: bool = False, default: Optional[Callable[[Any], Any]] = None) -> str:
+    """序列化为紧凑的 JSON 字符串"""
+    return dumps(obj, sort_keys=sort_keys, default=default).decode("utf-8")
+
+
+def loads(data: Union[bytes, bytearray, memoryview, str]) -> Any:
+    """解析 JSON；解析失败抛出 json.JSONDecodeError (ValueError)"""
+    try:
+        if orjson is not None:
+            return orjson.loads(data)
+        if _msgspec_decoder is not None:
+            return _msgspec_decoder.decode(data)
+    except Exception:
+        # 快速后端不支持的输入（如超过 64 位的整数）或非法 JSON，交给标准库处理并给出标准异常
+        pass
+    if isinstance(data, memoryview):
+        data = data.tobytes()
+    return json.loads(data)
@@ -1,7 +1,9 @@
 from __future__ import annotations
 
 from typing import Callable, Optional
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from ncm.core.config import DatabaseSettings, get_config_manager
 from ncm.core.constants import DATABASE_FILE_NAME
 from ncm.core.path import prepare_path, get_config_path
 
@@ -19,6 +21,9 @@ except ImportError:
 
 _ENGINE: Optional[AsyncEngine] = None
 _SESSION_FACTORY: Optional[async_sessionmaker[AsyncSession]] = None
+# 只读连接池（PRAGMA query_only）；WAL 模式下读不阻塞写，也不在写连接上排队
+_READ_ENGINE: Optional[AsyncEngine] = None
+_READ_SESSION_FACTORY: Optional[async_sessionmaker[AsyncSession]] = None
 
 class UnitOfWork:
     def __init__(self, session_factory: async_sessionmaker[AsyncSession]):
@@ -46,11 +51,58 @@ class UnitOfWork:
         finally:
             await self.session.close()
 
+def _sqlite_pragmas(settings: DatabaseSettings, read_only: bool) -> list[str]:
+    pragmas = [
+        "PRAGMA journal_mode=WAL",
+        "PRAGMA synchronous=NORMAL",
+        f"PRAGMA busy_timeout={settings.busy_timeout_ms}",
+        f"PRAGMA cache_size=-{settings.cache_size_mb * 1024}",
+        f"PRAGMA mmap_size={settings.mmap_size_mb * 1024 * 1024}",
+        "PRAGMA temp_store=MEMORY",
+        f"PRAGMA wal_autocheckpoint={settings.wal_autocheckpoint}",
+    ]
+    if read_only:
+        pragmas.append("PRAGMA query_only=ON")
+    return pragmas
+
+
+def _create_engine(url: str, read_only: bool = False) -> AsyncEngine:
+    """创建引擎；SQLite 连接在建立时（connect 事件）逐个执行调优 PRAGMA"""
+    settings = get_config_manager().load_sync().database
+    kwargs = {}
+    if read_only:
+        kwargs.update(pool_size=settings.read_pool_size, max_overflow=0)
+    engine = create_async_engine(
+        url,
+        future=True,
+        pool_pre_ping=True,
+        connect_args={"timeout": settings.busy_timeout_ms / 1000},
+        **kwargs
+    )
+    if url.startswith("sqlite"):
+        pragmas = _sqlite_pragmas(settings, read_only)
+
+        @event.listens_for(engine.sync_engine, "connect")
+        def _apply_pragmas(dbapi_connection, _connection_record):
+            cursor = dbapi_connection.cursor()
+            try:
+                for pragma in pragmas:
+                    cursor.execute(pragma)
+            finally:
+                cursor.close()
+
+    return engine
+
+
+def _is_memory_url(url: str) -> bool:
+    return url.startswith("sqlite") and "memory" in url
+
+
 def _ensure_session_factory(url: str) -> async_sessionmaker[AsyncSession]:
     global _ENGINE, _SESSION_FACTORY
     if _SESSION_FACTORY is None or _ENGINE is None:
         # Ensure database directory exists for SQLite
-        if url.startswith("sqlite") and "memory" not in url:
+        if url.startswith("sqlite") and not _is_memory_url(url):
             try:
                 # Extract path from URL (naive approach, but works for standard sqlite:///)
                 path_part = url.split(":///")[-1].split("?")[0]
@@ -59,29 +111,22 @@ def _ensure_session_factory(url: str) -> async_sessionmaker[AsyncSession]:
             except Exception:
                 pass
 
-        _ENGINE = create_async_engine(
-            url,
-            future=True,
-            pool_pre_ping=True,
-            connect_args={"timeout": 30}
-        )
-        async def _init_pragmas():
-            async with _ENGINE.begin() as conn:
-                await conn.exec_driver_sql("PRAGMA journal_mode=WAL;")
-                await conn.exec_driver_sql("PRAGMA synchronous=NORMAL;")
-                await conn.exec_driver_sql("PRAGMA busy_timeout=5000;")
-        import asyncio as _asyncio
-        try:
-            loop = _asyncio.get_event_loop()
-            if loop.is_running():
-                loop.create_task(_init_pragmas())
-            else:
-                loop.run_until_complete(_init_pragmas())
-        except Exception:
-            pass
+        _ENGINE = _create_engine(url)
         _SESSION_FACTORY = async_sessionmaker(_ENGINE, expire_on_commit=False)
     return _SESSION_FACTORY
 
+
+def _ensure_read_session_factory(url: str) -> async_sessionmaker[AsyncSession]:
+    global _READ_ENGINE, _READ_SESSION_FACTORY
+    write_factory = _ensure_session_factory(url)
+    if _is_memory_url(url):
+        # 内存库每个连接都是独立的数据库，只能与写入方共用连接
+        return write_factory
+    if _READ_SESSION_FACTORY is None or _READ_ENGINE is None:
+        _READ_ENGINE = _create_engine(url, read_only=True)
+        _READ_SESSION_FACTORY = async_sessionmaker(_READ_ENGINE, expire_on_commit=False)
+    return _READ_SESSION_FACTORY
+
 def make_uow_factory(session_factory: async_sessionmaker[AsyncSession]) -> Callable[[], UnitOfWork]:
     def _factory() -> UnitOfWork:
         return UnitOfWork(session_factory)
@@ -100,9 +145,23 @@ def get_uow_factory(db_url: Optional[str] = None) -> Callable[[], UnitOfWork]:
     session_factory = _ensure_session_factory(url)
     return make_uow_factory(session_factory)
 
+def get_read_uow_factory(db_url: Optional[str] = None) -> Callable[[], UnitOfWork]:
+    """
+    Get a UnitOfWork factory backed by the read-only connection pool.
+    Only for reads that tolerate write-behind lag (dashboards, stats, snapshots);
+    statements that write fail with "attempt to write a readonly database".
+    """
+    url = db_url or _DEFAULT_DB_URL
+    session_factory = _ensure_read_session_factory(url)
+    return make_uow_factory(session_factory)
+
 async def dispose_async_engine() -> None:
-    global _ENGINE, _SESSION_FACTORY
+    global _ENGINE, _SESSION_FACTORY, _READ_ENGINE, _READ_SESSION_FACTORY
+    if _READ_ENGINE is not None:
+        await _READ_ENGINE.dispose()
     if _ENGINE is not None:
         await _ENGINE.dispose()
     _ENGINE = None
     _SESSION_FACTORY = None
+    _READ_ENGINE = None
+    _READ_SESSION_FACTORY = None
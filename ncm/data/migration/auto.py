@@ -12,6 +12,9 @@ from ncm.core.path import get_app_base
 
 logger = logging.getLogger(__name__)
 
+# 引入 Alembic 时的初始结构；没有版本表的旧数据库即处于该版本
+BASELINE_REVISION = "221e5bb13e5a"
+
 def _get_alembic_config(db_url: str) -> Config:
     """
     Construct Alembic configuration object.
@@ -102,14 +105,12 @@ def run_migrations(engine: Engine, db_url: str):
                 
             elif has_data_tables:
                 # Legacy case: Tables exist but no alembic_version
-                # This implies an existing DB from before migrations were added.
-                # We assume the schema matches the 'head' state at the time of migration introduction.
-                logger.warning("Found existing tables without version tracking. Stamping as head...")
-                
-                # Mark database as up-to-date without running migrations
-                command.stamp(alembic_cfg, "head")
-                
-                # Run upgrade just in case (should be no-op if head matches)
+                # This implies an existing DB from before migrations were added,
+                # so its schema matches the baseline revision, not the current head.
+                logger.warning(f"Found existing tables without version tracking. Stamping as {BASELINE_REVISION}...")
+
+                # Mark the baseline only, then apply every later migration
+                command.stamp(alembic_cfg, BASELINE_REVISION)
                 command.upgrade(alembic_cfg, "head")
                 
             else:
@@ -39,6 +39,12 @@ target_metadata = Base.metadata
 # my_important_option = config.get_main_option("my_important_option")
 # ... etc.
 
+def include_object(object, name, type_, reflected, compare_to):
+    """Skip FTS5 virtual/shadow tables that are managed by raw SQL migrations."""
+    if type_ == "table" and name and name.startswith("download_task_fts"):
+        return False
+    return True
+
 def get_url():
     """Get database URL dynamically."""
     if os.environ.get("ALEMBIC_DB_PATH"):
@@ -64,6 +70,7 @@ def run_migrations_offline() -> None:
         target_metadata=target_metadata,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
+        include_object=include_object,
         render_as_batch=True # Important for SQLite
     )
 
@@ -92,6 +99,7 @@ def run_migrations_online() -> None:
         context.configure(
             connection=connection, 
             target_metadata=target_metadata,
+            include_object=include_object,
             render_as_batch=True # Important for SQLite
         )
 
@@ -0,0 +1,28 @@
+"""add_task_link_mode
+
+Revision ID: 3b7c2e9d4a10
+Revises: 221e5bb13e5a
+Create Date: 2026-10-19 10:12:31.402117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3b7c2e9d4a10'
+down_revision: Union[str, None] = '221e5bb13e5a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('download_task', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('link_mode', sa.String(), nullable=True))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('download_task', schema=None) as batch_op:
+        batch_op.drop_column('link_mode')
@@ -0,0 +1,49 @@
+"""add_composite_task_indexes
+
+Revision ID: 5e2a9c71b3d8
+Revises: 8d41f0a6c2b7
+Create Date: 2026-10-19 13:05:47.220419
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5e2a9c71b3d8'
+down_revision: Union[str, None] = '8d41f0a6c2b7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# 注意：这里直接使用 op.create_index / op.drop_index 而非 batch_alter_table，
+# 索引变更无需重建表，重建会丢失 download_task 上的 FTS 触发器
+_INDEXES = [
+    ('ix_download_task_job_status', ['job_id', 'status']),
+    ('ix_download_task_music_status', ['music_id', 'status']),
+    ('ix_download_task_status_completed_at', ['status', 'completed_at']),
+    ('ix_download_task_status_created_at', ['status', 'created_at']),
+    ('ix_download_task_created_at', ['created_at']),
+]
+
+# 已被上述复合索引的前缀列覆盖的单列索引
+_SUPERSEDED = [
+    ('ix_download_task_job_id', ['job_id']),
+    ('ix_download_task_music_id', ['music_id']),
+    ('ix_download_task_status', ['status']),
+]
+
+
+def upgrade() -> None:
+    for name, columns in _INDEXES:
+        op.create_index(name, 'download_task', columns, unique=False)
+    for name, _ in _SUPERSEDED:
+        op.drop_index(name, table_name='download_task')
+    op.execute('ANALYZE download_task')
+
+
+def downgrade() -> None:
+    for name, columns in _SUPERSEDED:
+        op.create_index(name, 'download_task', columns, unique=False)
+    for name, _ in reversed(_INDEXES):
+        op.drop_index(name, table_name='download_task')
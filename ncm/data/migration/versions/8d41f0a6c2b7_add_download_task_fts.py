@@ -0,0 +1,76 @@
+"""add_download_task_fts
+
+Revision ID: 8d41f0a6c2b7
+Revises: 3b7c2e9d4a10
+Create Date: 2026-10-19 11:40:05.913284
+
+"""
+import logging
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8d41f0a6c2b7'
+down_revision: Union[str, None] = '3b7c2e9d4a10'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+logger = logging.getLogger(__name__)
+
+# 外部内容 FTS5 表：只存索引，不重复存储文本；trigram 分词同时适用于中文与拉丁文子串搜索
+_CREATE_STATEMENTS = [
+    """
+    CREATE VIRTUAL TABLE download_task_fts USING fts5(
+        music_title, music_artist, music_album, music_id,
+        content='download_task', content_rowid='id',
+        tokenize='trigram case_sensitive 0'
+    )
+    """,
+    """
+    CREATE TRIGGER download_task_fts_ai AFTER INSERT ON download_task BEGIN
+        INSERT INTO download_task_fts(rowid, music_title, music_artist, music_album, music_id)
+        VALUES (new.id, new.music_title, new.music_artist, new.music_album, new.music_id);
+    END
+    """,
+    """
+    CREATE TRIGGER download_task_fts_ad AFTER DELETE ON download_task BEGIN
+        INSERT INTO download_task_fts(download_task_fts, rowid, music_title, music_artist, music_album, music_id)
+        VALUES ('delete', old.id, old.music_title, old.music_artist, old.music_album, old.music_id);
+    END
+    """,
+    """
+    CREATE TRIGGER download_task_fts_au
+    AFTER UPDATE OF music_title, music_artist, music_album, music_id ON download_task BEGIN
+        INSERT INTO download_task_fts(download_task_fts, rowid, music_title, music_artist, music_album, music_id)
+        VALUES ('delete', old.id, old.music_title, old.music_artist, old.music_album, old.music_id);
+        INSERT INTO download_task_fts(rowid, music_title, music_artist, music_album, music_id)
+        VALUES (new.id, new.music_title, new.music_artist, new.music_album, new.music_id);
+    END
+    """,
+    "INSERT INTO download_task_fts(download_task_fts) VALUES ('rebuild')",
+]
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    try:
+        bind.exec_driver_sql(
+            "CREATE VIRTUAL TABLE temp.fts_probe USING fts5(x, tokenize='trigram')"
+        )
+        bind.exec_driver_sql("DROP TABLE temp.fts_probe")
+    except sa.exc.OperationalError:
+        # SQLite 未编译 FTS5 或版本低于 3.34（无 trigram），搜索回退到 LIKE
+        logger.warning("SQLite FTS5 trigram tokenizer unavailable, skipping full-text index")
+        return
+    for statement in _CREATE_STATEMENTS:
+        op.execute(statement)
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS download_task_fts_au")
+    op.execute("DROP TRIGGER IF EXISTS download_task_fts_ad")
+    op.execute("DROP TRIGGER IF EXISTS download_task_fts_ai")
+    op.execute("DROP TABLE IF EXISTS download_task_fts")
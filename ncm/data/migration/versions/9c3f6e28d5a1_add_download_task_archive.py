@@ -0,0 +1,64 @@
+"""add_download_task_archive
+
+Revision ID: 9c3f6e28d5a1
+Revises: 5e2a9c71b3d8
+Create Date: 2026-10-19 14:22:09.517306
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9c3f6e28d5a1'
+down_revision: Union[str, None] = '5e2a9c71b3d8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('download_task_archive',
+    sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('music_id', sa.String(), nullable=False),
+    sa.Column('music_title', sa.String(), nullable=True),
+    sa.Column('music_artist', sa.String(), nullable=True),
+    sa.Column('music_album', sa.String(), nullable=True),
+    sa.Column('job_id', sa.Integer(), nullable=False),
+    sa.Column('quality', sa.String(), nullable=True),
+    sa.Column('progress_flags', sa.Integer(), nullable=False),
+    sa.Column('file_path', sa.String(), nullable=True),
+    sa.Column('file_name', sa.String(), nullable=True),
+    sa.Column('file_format', sa.String(), nullable=True),
+    sa.Column('file_size', sa.Integer(), nullable=True),
+    sa.Column('link_mode', sa.String(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('completed_at', sa.DateTime(), nullable=True),
+    sa.Column('archived_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['job_id'], ['download_job.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('job_id', 'music_id', name='uq_archive_job_music')
+    )
+    op.create_index('ix_download_task_archive_music_id', 'download_task_archive', ['music_id'], unique=False)
+    op.create_index('ix_download_task_archive_completed_at', 'download_task_archive', ['completed_at'], unique=False)
+    op.create_index('ix_download_task_archive_created_at', 'download_task_archive', ['created_at'], unique=False)
+
+
+def downgrade() -> None:
+    # 归档行先移回 download_task，避免降级丢失已完成任务
+    op.execute(
+        """
+        INSERT OR IGNORE INTO download_task (id, music_id, music_title, music_artist, music_album, job_id,
+            quality, progress_flags, file_path, file_name, file_format, file_size, link_mode, status,
+            created_at, updated_at, completed_at)
+        SELECT id, music_id, music_title, music_artist, music_album, job_id,
+            quality, progress_flags, file_path, file_name, file_format, file_size, link_mode, 'completed',
+            created_at, archived_at, completed_at
+        FROM download_task_archive
+        """
+    )
+    op.drop_index('ix_download_task_archive_created_at', table_name='download_task_archive')
+    op.drop_index('ix_download_task_archive_completed_at', table_name='download_task_archive')
+    op.drop_index('ix_download_task_archive_music_id', table_name='download_task_archive')
+    op.drop_table('download_task_archive')
@@ -0,0 +1,92 @@
+"""add_job_counter_triggers
+
+Revision ID: b4e81d07c6f2
+Revises: 9c3f6e28d5a1
+Create Date: 2026-10-19 15:03:41.886120
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b4e81d07c6f2'
+down_revision: Union[str, None] = '9c3f6e28d5a1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# download_job 的 total/completed/failed_tasks 由触发器在任务写入的同一事务内增量维护。
+# 归档（download_task 删除 + 归档表插入）与恢复前后计数不变；已归档任务按 completed 计。
+_TRIGGERS = {
+    "download_task_job_counters_ai": """
+    CREATE TRIGGER download_task_job_counters_ai AFTER INSERT ON download_task BEGIN
+        UPDATE download_job SET
+            total_tasks = COALESCE(total_tasks, 0) + 1,
+            completed_tasks = COALESCE(completed_tasks, 0) + (new.status IS 'completed'),
+            failed_tasks = COALESCE(failed_tasks, 0) + (new.status IS 'failed')
+        WHERE id = new.job_id;
+    END
+    """,
+    "download_task_job_counters_ad": """
+    CREATE TRIGGER download_task_job_counters_ad AFTER DELETE ON download_task BEGIN
+        UPDATE download_job SET
+            total_tasks = COALESCE(total_tasks, 0) - 1,
+            completed_tasks = COALESCE(completed_tasks, 0) - (old.status IS 'completed'),
+            failed_tasks = COALESCE(failed_tasks, 0) - (old.status IS 'failed')
+        WHERE id = old.job_id;
+    END
+    """,
+    "download_task_job_counters_au": """
+    CREATE TRIGGER download_task_job_counters_au AFTER UPDATE OF status, job_id ON download_task
+    WHEN old.status IS NOT new.status OR old.job_id IS NOT new.job_id BEGIN
+        UPDATE download_job SET
+            total_tasks = COALESCE(total_tasks, 0) - 1,
+            completed_tasks = COALESCE(completed_tasks, 0) - (old.status IS 'completed'),
+            failed_tasks = COALESCE(failed_tasks, 0) - (old.status IS 'failed')
+        WHERE id = old.job_id;
+        UPDATE download_job SET
+            total_tasks = COALESCE(total_tasks, 0) + 1,
+            completed_tasks = COALESCE(completed_tasks, 0) + (new.status IS 'completed'),
+            failed_tasks = COALESCE(failed_tasks, 0) + (new.status IS 'failed')
+        WHERE id = new.job_id;
+    END
+    """,
+    "download_task_archive_job_counters_ai": """
+    CREATE TRIGGER download_task_archive_job_counters_ai AFTER INSERT ON download_task_archive BEGIN
+        UPDATE download_job SET
+            total_tasks = COALESCE(total_tasks, 0) + 1,
+            completed_tasks = COALESCE(completed_tasks, 0) + 1
+        WHERE id = new.job_id;
+    END
+    """,
+    "download_task_archive_job_counters_ad": """
+    CREATE TRIGGER download_task_archive_job_counters_ad AFTER DELETE ON download_task_archive BEGIN
+        UPDATE download_job SET
+            total_tasks = COALESCE(total_tasks, 0) - 1,
+            completed_tasks = COALESCE(completed_tasks, 0) - 1
+        WHERE id = old.job_id;
+    END
+    """,
+}
+
+# 以现有任务初始化计数
+_BACKFILL = """
+UPDATE download_job SET
+    total_tasks = (SELECT count(*) FROM download_task t WHERE t.job_id = download_job.id)
+        + (SELECT count(*) FROM download_task_archive a WHERE a.job_id = download_job.id),
+    completed_tasks = (SELECT count(*) FROM download_task t WHERE t.job_id = download_job.id AND t.status = 'completed')
+        + (SELECT count(*) FROM download_task_archive a WHERE a.job_id = download_job.id),
+    failed_tasks = (SELECT count(*) FROM download_task t WHERE t.job_id = download_job.id AND t.status = 'failed')
+"""
+
+
+def upgrade() -> None:
+    for statement in _TRIGGERS.values():
+        op.execute(statement)
+    op.execute(_BACKFILL)
+
+
+def downgrade() -> None:
+    for name in reversed(list(_TRIGGERS)):
+        op.execute(f"DROP TRIGGER IF EXISTS {name}")
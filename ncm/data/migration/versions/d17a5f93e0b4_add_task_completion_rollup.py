@@ -0,0 +1,100 @@
+"""add_task_completion_rollup
+
+Revision ID: d17a5f93e0b4
+Revises: b4e81d07c6f2
+Create Date: 2026-10-19 15:48:12.304559
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd17a5f93e0b4'
+down_revision: Union[str, None] = 'b4e81d07c6f2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# 与 ncm.data.models.task_completion.COMPLETION_BUCKET_SECONDS 一致
+_BUCKET = "CAST(strftime('%s', {row}.completed_at) AS INTEGER) / 900"
+
+
+def _increment(row: str) -> str:
+    return f"""
+        INSERT INTO task_completion_rollup (bucket, completed) VALUES ({_BUCKET.format(row=row)}, 1)
+        ON CONFLICT (bucket) DO UPDATE SET completed = completed + 1;"""
+
+
+def _decrement(row: str) -> str:
+    return f"""
+        UPDATE task_completion_rollup SET completed = completed - 1
+        WHERE bucket = {_BUCKET.format(row=row)};"""
+
+
+# 计数口径与原先的实时统计一致：status 为 completed 且有 completed_at 的任务（含已归档任务）按完成时间计入
+_DONE = "{row}.status IS 'completed' AND {row}.completed_at IS NOT NULL"
+_CHANGED = "(old.status IS NOT new.status OR old.completed_at IS NOT new.completed_at)"
+
+_TRIGGERS = {
+    "download_task_rollup_ai": f"""
+    CREATE TRIGGER download_task_rollup_ai AFTER INSERT ON download_task
+    WHEN {_DONE.format(row='new')} BEGIN{_increment('new')}
+    END
+    """,
+    "download_task_rollup_ad": f"""
+    CREATE TRIGGER download_task_rollup_ad AFTER DELETE ON download_task
+    WHEN {_DONE.format(row='old')} BEGIN{_decrement('old')}
+    END
+    """,
+    "download_task_rollup_au_old": f"""
+    CREATE TRIGGER download_task_rollup_au_old AFTER UPDATE OF status, completed_at ON download_task
+    WHEN {_CHANGED} AND {_DONE.format(row='old')} BEGIN{_decrement('old')}
+    END
+    """,
+    "download_task_rollup_au_new": f"""
+    CREATE TRIGGER download_task_rollup_au_new AFTER UPDATE OF status, completed_at ON download_task
+    WHEN {_CHANGED} AND {_DONE.format(row='new')} BEGIN{_increment('new')}
+    END
+    """,
+    "download_task_archive_rollup_ai": f"""
+    CREATE TRIGGER download_task_archive_rollup_ai AFTER INSERT ON download_task_archive
+    WHEN new.completed_at IS NOT NULL BEGIN{_increment('new')}
+    END
+    """,
+    "download_task_archive_rollup_ad": f"""
+    CREATE TRIGGER download_task_archive_rollup_ad AFTER DELETE ON download_task_archive
+    WHEN old.completed_at IS NOT NULL BEGIN{_decrement('old')}
+    END
+    """,
+}
+
+_BACKFILL = f"""
+INSERT INTO task_completion_rollup (bucket, completed)
+SELECT bucket, count(*) FROM (
+    SELECT {_BUCKET.format(row='t')} AS bucket FROM download_task t
+    WHERE t.status = 'completed' AND t.completed_at IS NOT NULL
+    UNION ALL
+    SELECT {_BUCKET.format(row='a')} FROM download_task_archive a
+    WHERE a.completed_at IS NOT NULL
+)
+GROUP BY bucket
+"""
+
+
+def upgrade() -> None:
+    op.create_table('task_completion_rollup',
+    sa.Column('bucket', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('completed', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('bucket')
+    )
+    for statement in _TRIGGERS.values():
+        op.execute(statement)
+    op.execute(_BACKFILL)
+
+
+def downgrade() -> None:
+    for name in reversed(list(_TRIGGERS)):
+        op.execute(f"DROP TRIGGER IF EXISTS {name}")
+    op.drop_table('task_completion_rollup')
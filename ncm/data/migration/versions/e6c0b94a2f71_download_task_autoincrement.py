@@ -0,0 +1,50 @@
+"""download_task_autoincrement
+
+Revision ID: e6c0b94a2f71
+Revises: d17a5f93e0b4
+Create Date: 2026-10-19 18:21:07.512904
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e6c0b94a2f71'
+down_revision: Union[str, None] = 'd17a5f93e0b4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# 没有 AUTOINCREMENT 时 SQLite 以 max(rowid)+1 分配新 id：id 最大的任务被归档或随作业删除后，
+# 新任务会复用已归档任务的 id，导致恢复时主键冲突、按 id 查询时混淆两条任务。
+# 改为 AUTOINCREMENT，并把序列起点抬到归档表的最大 id 之上，id 从此不再复用。
+_ARCHIVE_MAX_ID = "(SELECT coalesce(max(id), 0) FROM download_task_archive)"
+
+
+def _rebuild(autoincrement: bool) -> None:
+    """重建 download_task（batch 模式保留列、约束与索引）；表上的触发器会随旧表删除，重建后原样恢复"""
+    bind = op.get_bind()
+    triggers = bind.execute(sa.text(
+        "SELECT sql FROM sqlite_master WHERE type = 'trigger' AND tbl_name = 'download_task' ORDER BY rowid"
+    )).scalars().all()
+    with op.batch_alter_table('download_task', recreate='always',
+                              table_kwargs={'sqlite_autoincrement': autoincrement}):
+        pass
+    for statement in triggers:
+        op.execute(statement)
+
+
+def upgrade() -> None:
+    _rebuild(autoincrement=True)
+    # 复制数据后 sqlite_sequence 已记录现有最大 id（空表时没有记录）
+    op.execute(f"UPDATE sqlite_sequence SET seq = max(seq, {_ARCHIVE_MAX_ID}) WHERE name = 'download_task'")
+    op.execute(
+        f"INSERT INTO sqlite_sequence (name, seq) SELECT 'download_task', {_ARCHIVE_MAX_ID} "
+        "WHERE NOT EXISTS (SELECT 1 FROM sqlite_sequence WHERE name = 'download_task')"
+    )
+
+
+def downgrade() -> None:
+    _rebuild(autoincrement=False)
@@ -3,10 +3,14 @@
 from .account_session import AccountSession
 from .download_job import DownloadJob
 from .download_task import DownloadTask, TaskProgress
+from .download_task_archive import DownloadTaskArchive
+from .task_completion import TaskCompletionRollup
 
 __all__ = [
     "AccountSession",
     "DownloadJob",
     "DownloadTask",
+    "DownloadTaskArchive",
+    "TaskCompletionRollup",
     "TaskProgress",
 ]
\ No newline at end of file
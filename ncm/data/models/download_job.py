@@ -36,7 +36,8 @@ class DownloadJob(Base):
     status = Column(String, default='created', index=True)
     # 'created', 'scanning', 'downloading', 'completed', 'failed', 'cancelled', 'paused'
     
-    # Statistics
+    # Statistics - maintained by triggers on download_task / download_task_archive
+    # (see migration add_job_counter_triggers); archived tasks count as completed
     total_tasks = Column(Integer, default=0)
     completed_tasks = Column(Integer, default=0)
     failed_tasks = Column(Integer, default=0)
@@ -1,6 +1,6 @@
 """Download task model for tracking individual music download tasks."""
 
-from sqlalchemy import Column, Integer, String, DateTime, UniqueConstraint, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, UniqueConstraint, ForeignKey, Index
 from ncm.data.models.base import Base
 from ncm.core.time import UTC_CLOCK, to_iso_format
 
@@ -13,13 +13,13 @@ class DownloadTask(Base):
     id = Column(Integer, primary_key=True, autoincrement=True)
     
     # Music information (simple)
-    music_id = Column(String, nullable=False, index=True)
+    music_id = Column(String, nullable=False)
     music_title = Column(String)
     music_artist = Column(String)
     music_album = Column(String)
     
     # Task configuration
-    job_id = Column(Integer, ForeignKey('download_job.id'), nullable=False, index=True)
+    job_id = Column(Integer, ForeignKey('download_job.id'), nullable=False)
     
     # Quality information - only record actual quality obtained from server
     quality = Column(String)  # Actual music quality returned by server
@@ -42,9 +42,12 @@ class DownloadTask(Base):
     file_name = Column(String)  # File name
     file_format = Column(String)  # 'mp3', 'flac', 'm4a'
     file_size = Column(Integer)  # File size in bytes
+    # 文件来源方式：None 表示本任务自行下载；'reflink' / 'hardlink' / 'copy' 表示从同音质的已完成任务去重得到
+    # hardlink 与来源文件共享同一 inode，删除时只移除本任务的目录项
+    link_mode = Column(String)
     
     # Status and error
-    status = Column(String, default='pending', index=True)  
+    status = Column(String, default='pending')
     # 'pending', 'downloading', 'processing', 'completed', 'failed', 'cancelled'
     error_message = Column(String)
     
@@ -55,8 +58,18 @@ class DownloadTask(Base):
     completed_at = Column(DateTime)  # Completion time
     
     # Composite unique constraint: only one task per music per job
+    # Composite indexes follow the hot access paths; their leading columns also
+    # serve the former single-column job_id / music_id / status lookups.
+    # Trailing `id` is implicit (rowid), so (created_at) also orders by (created_at, id).
+    # AUTOINCREMENT: ids are never reused, so they stay unique across download_task_archive.
     __table_args__ = (
         UniqueConstraint('job_id', 'music_id', name='uq_job_music'),
+        Index('ix_download_task_job_status', 'job_id', 'status'),
+        Index('ix_download_task_music_status', 'music_id', 'status'),
+        Index('ix_download_task_status_completed_at', 'status', 'completed_at'),
+        Index('ix_download_task_status_created_at', 'status', 'created_at'),
+        Index('ix_download_task_created_at', 'created_at'),
+        {'sqlite_autoincrement': True},
     )
     
     @property
@@ -78,12 +91,14 @@ class DownloadTask(Base):
             'file_name': self.file_name,
             'file_format': self.file_format,
             'file_size': self.file_size,
+            'link_mode': self.link_mode,
             'status': self.status,
             'error_message': self.error_message,
             'created_at': to_iso_format(self.created_at),
             'updated_at': to_iso_format(self.updated_at),
             'started_at': to_iso_format(self.started_at),
             'completed_at': to_iso_format(self.completed_at),
+            'archived': False,
         }
 
 
@@ -0,0 +1,81 @@
+"""Archive of old completed download tasks (cold storage)."""
+
+from sqlalchemy import Column, Integer, String, DateTime, UniqueConstraint, ForeignKey, Index
+from ncm.data.models.base import Base
+from ncm.core.time import UTC_CLOCK, to_iso_format
+
+
+class DownloadTaskArchive(Base):
+    """Completed task moved out of download_task.
+
+    Keeps the original task id and only what library lookups, dedup and search need;
+    transient columns (status, error_message, started_at, updated_at) are dropped.
+    Exposes the same read attributes as DownloadTask so callers can treat both alike.
+    """
+    __tablename__ = 'download_task_archive'
+
+    # Original download_task.id (not auto-generated)
+    id = Column(Integer, primary_key=True, autoincrement=False)
+
+    music_id = Column(String, nullable=False)
+    music_title = Column(String)
+    music_artist = Column(String)
+    music_album = Column(String)
+
+    job_id = Column(Integer, ForeignKey('download_job.id'), nullable=False)
+    quality = Column(String)
+    progress_flags = Column(Integer, default=0, nullable=False)
+
+    # 与 download_task 相同：已完成任务的最终文件路径
+    file_path = Column(String)
+    file_name = Column(String)
+    file_format = Column(String)
+    file_size = Column(Integer)
+    link_mode = Column(String)
+
+    created_at = Column(DateTime)
+    completed_at = Column(DateTime)
+    archived_at = Column(DateTime, default=lambda: UTC_CLOCK.now())
+
+    # 归档的只有已完成任务，以下字段不再存储
+    status = 'completed'
+    error_message = None
+    started_at = None
+    archived = True
+
+    __table_args__ = (
+        # (job_id, music_id) 在 download_task 与归档表之间整体唯一
+        UniqueConstraint('job_id', 'music_id', name='uq_archive_job_music'),
+        Index('ix_download_task_archive_music_id', 'music_id'),
+        Index('ix_download_task_archive_completed_at', 'completed_at'),
+        Index('ix_download_task_archive_created_at', 'created_at'),
+    )
+
+    @property
+    def updated_at(self):
+        return self.archived_at
+
+    def to_dict(self):
+        """Convert model to dictionary (same keys as DownloadTask.to_dict)."""
+        return {
+            'id': self.id,
+            'music_id': self.music_id,
+            'music_title': self.music_title,
+            'music_artist': self.music_artist,
+            'music_album': self.music_album,
+            'job_id': self.job_id,
+            'quality': self.quality,
+            'progress_flags': self.progress_flags,
+            'file_path': self.file_path,
+            'file_name': self.file_name,
+            'file_format': self.file_format,
+            'file_size': self.file_size,
+            'link_mode': self.link_mode,
+            'status': self.status,
+            'error_message': self.error_message,
+            'created_at': to_iso_format(self.created_at),
+            'updated_at': to_iso_format(self.archived_at),
+            'started_at': None,
+            'completed_at': to_iso_format(self.completed_at),
+            'archived': True,
+        }
@@ -0,0 +1,19 @@
+"""Rollup of task completions per UTC time bucket (dashboard counters)."""
+
+from sqlalchemy import Column, Integer
+from ncm.data.models.base import Base
+
+# 桶宽 15 分钟：所有现行时区偏移均为 15 分钟的整数倍，任意时区的自然日都能由整桶拼出
+COMPLETION_BUCKET_SECONDS = 15 * 60
+
+
+class TaskCompletionRollup(Base):
+    """Completed task count per bucket of completed_at (epoch seconds // COMPLETION_BUCKET_SECONDS).
+
+    Maintained by triggers on download_task / download_task_archive
+    (see migration add_task_completion_rollup) and rebuildable from task history.
+    """
+    __tablename__ = 'task_completion_rollup'
+
+    bucket = Column(Integer, primary_key=True, autoincrement=False)
+    completed = Column(Integer, nullable=False, default=0)
@@ -1,9 +1,11 @@
 from __future__ import annotations
 
 from typing import Optional, List
-from sqlalchemy import select
+from sqlalchemy import case, func, literal, select, union_all, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from ncm.data.models.download_job import DownloadJob
+from ncm.data.models.download_task import DownloadTask
+from ncm.data.models.download_task_archive import DownloadTaskArchive
 
 class AsyncDownloadJobRepository:
     async def get_by_id(self, session: AsyncSession, job_id: int) -> Optional[DownloadJob]:
@@ -85,6 +87,47 @@ class AsyncDownloadJobRepository:
         await session.refresh(job)
         return job
 
+    async def reconcile_counters(self, session: AsyncSession, job_id: Optional[int] = None) -> List[dict]:
+        """按任务表与归档表重新计算作业计数，修正与触发器维护值不一致的作业；返回被修正的作业及前后计数。"""
+        tasks = union_all(
+            select(DownloadTask.job_id, DownloadTask.status),
+            select(DownloadTaskArchive.job_id, literal("completed").label("status")),
+        ).subquery()
+        actual_stmt = (
+            select(
+                tasks.c.job_id,
+                func.count(),
+                func.sum(case((tasks.c.status == "completed", 1), else_=0)),
+                func.sum(case((tasks.c.status == "failed", 1), else_=0)),
+            )
+            .group_by(tasks.c.job_id)
+        )
+        jobs_stmt = select(DownloadJob.id, DownloadJob.total_tasks, DownloadJob.completed_tasks,
+                           DownloadJob.failed_tasks)
+        if job_id is not None:
+            actual_stmt = actual_stmt.where(tasks.c.job_id == job_id)
+            jobs_stmt = jobs_stmt.where(DownloadJob.id == job_id)
+
+        actual = {row[0]: tuple(row[1:]) for row in (await session.execute(actual_stmt)).all()}
+        repaired: List[dict] = []
+        for jid, *stored in (await session.execute(jobs_stmt)).all():
+            expected = actual.get(jid, (0, 0, 0))
+            if tuple(stored) == expected:
+                continue
+            total, completed, failed = expected
+            await session.execute(
+                update(DownloadJob)
+                .where(DownloadJob.id == jid)
+                .values(total_tasks=total, completed_tasks=completed, failed_tasks=failed),
+                execution_options={"synchronize_session": False},
+            )
+            repaired.append({
+                "job_id": jid,
+                "before": dict(zip(("total_tasks", "completed_tasks", "failed_tasks"), stored)),
+                "after": {"total_tasks": total, "completed_tasks": completed, "failed_tasks": failed},
+            })
+        return repaired
+
     async def delete(self, session: AsyncSession, job_id: int) -> bool:
         job = await self.get_by_id(session, job_id)
         if not job:
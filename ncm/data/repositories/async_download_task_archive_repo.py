@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import AsyncIterator, List, Optional
+
+from sqlalchemy import DateTime, String, delete, false, func, insert, literal, or_, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ncm.core.time import UTC_CLOCK
+from ncm.data.models.download_task import DownloadTask
+from ncm.data.models.download_task_archive import DownloadTaskArchive
+
+# 归档时从 download_task 原样搬运的列
+_ARCHIVED_COLUMNS = [name for name in DownloadTaskArchive.__table__.columns.keys() if name != "archived_at"]
+
+
+class AsyncDownloadTaskArchiveRepository:
+    async def archive_completed_before(self, session: AsyncSession, cutoff: datetime, limit: int = 500) -> int:
+        """把 completed_at 早于 cutoff 的已完成任务移入归档表（INSERT ... SELECT + DELETE），返回移动的行数。
+
+        download_task 使用 AUTOINCREMENT，id 不会复用，归档后新任务的 id 不会与归档任务冲突。
+        """
+        result = await session.execute(
+            select(DownloadTask.id)
+            .where(
+                DownloadTask.status == "completed",
+                DownloadTask.completed_at < cutoff,
+            )
+            .order_by(DownloadTask.completed_at)
+            .limit(limit)
+        )
+        ids = list(result.scalars())
+        if not ids:
+            return 0
+
+        source = select(
+            *(DownloadTask.__table__.c[name] for name in _ARCHIVED_COLUMNS),
+            literal(UTC_CLOCK.now(), DateTime),
+        ).where(DownloadTask.id.in_(ids))
+        await session.execute(
+            insert(DownloadTaskArchive.__table__).from_select(_ARCHIVED_COLUMNS + ["archived_at"], source)
+        )
+        await session.execute(
+            delete(DownloadTask).where(DownloadTask.id.in_(ids)),
+            execution_options={"synchronize_session": False},
+        )
+        return len(ids)
+
+    async def restore(self, session: AsyncSession, task_id: int) -> bool:
+        """把归档任务移回 download_task（状态为 completed），以便对其修改"""
+        source = select(
+            *(DownloadTaskArchive.__table__.c[name] for name in _ARCHIVED_COLUMNS),
+            literal("completed", String),
+            DownloadTaskArchive.archived_at,
+        ).where(DownloadTaskArchive.id == task_id)
+        result = await session.execute(
+            insert(DownloadTask.__table__).from_select(_ARCHIVED_COLUMNS + ["status", "updated_at"], source)
+        )
+        if not result.rowcount:
+            return False
+        await session.execute(
+            delete(DownloadTaskArchive).where(DownloadTaskArchive.id == task_id),
+            execution_options={"synchronize_session": False},
+        )
+        return True
+
+    async def get_by_id(self, session: AsyncSession, task_id: int) -> Optional[DownloadTaskArchive]:
+        result = await session.execute(select(DownloadTaskArchive).where(DownloadTaskArchive.id == task_id))
+        return result.scalar_one_or_none()
+
+    async def get_by_job_and_music(self, session: AsyncSession, job_id: int,
+                                   music_id: str) -> Optional[DownloadTaskArchive]:
+        result = await session.execute(
+            select(DownloadTaskArchive).where(
+                DownloadTaskArchive.job_id == job_id,
+                DownloadTaskArchive.music_id == music_id
+            )
+        )
+        return result.scalar_one_or_none()
+
+    async def stream_files(
+        self, session: AsyncSession, yield_per: int = 2000
+    ) -> AsyncIterator[tuple[int, str, Optional[str], str]]:
+        """流式产出归档任务的 (id, music_id, quality, file_path)，与 stream_completed_files 相同"""
+        query = (
+            select(
+                DownloadTaskArchive.id,
+                DownloadTaskArchive.music_id,
+                DownloadTaskArchive.quality,
+                DownloadTaskArchive.file_path,
+            )
+            .where(DownloadTaskArchive.file_path.is_not(None))
+            .execution_options(yield_per=yield_per)
+        )
+        result = await session.stream(query)
+        async for row in result:
+            yield row.id, row.music_id, row.quality, row.file_path
+
+    @staticmethod
+    def _search_filters(job_id: Optional[int], status: Optional[str], keyword: Optional[str]) -> list:
+        filters = []
+        if status and status != "completed":
+            # 归档表只有已完成任务
+            filters.append(false())
+        if job_id is not None:
+            filters.append(DownloadTaskArchive.job_id == job_id)
+        if keyword:
+            keyword = f"%{keyword}%"
+            filters.append(
+                or_(
+                    DownloadTaskArchive.music_title.ilike(keyword),
+                    DownloadTaskArchive.music_artist.ilike(keyword),
+                    DownloadTaskArchive.music_album.ilike(keyword),
+                    DownloadTaskArchive.music_id.ilike(keyword)
+                )
+            )
+        return filters
+
+    async def search(
+            self,
+            session: AsyncSession,
+            job_id: Optional[int] = None,
+            status: Optional[str] = None,
+            keyword: Optional[str] = None,
+            limit: int = 20,
+            offset: int = 0,
+            with_total: bool = True
+    ) -> tuple[List[DownloadTaskArchive], Optional[int]]:
+        """与 AsyncDownloadTaskRepository.search 相同的签名；关键词以 LIKE 匹配（归档表不建全文索引）"""
+        total = await self.count_search(session, job_id, status, keyword) if with_total else None
+        stmt = (
+            select(DownloadTaskArchive)
+            .where(*self._search_filters(job_id, status, keyword))
+            .order_by(DownloadTaskArchive.created_at.desc(), DownloadTaskArchive.id.desc())
+            .limit(limit)
+            .offset(offset)
+        )
+        result = await session.execute(stmt)
+        return list(result.scalars()), total
+
+    async def search_after(
+            self,
+            session: AsyncSession,
+            job_id: Optional[int] = None,
+            status: Optional[str] = None,
+            keyword: Optional[str] = None,
+            limit: int = 20,
+            after: Optional[tuple[datetime, int]] = None
+    ) -> List[DownloadTaskArchive]:
+        """键集分页：按 (created_at, id) 倒序，返回位于 after 之后的最多 limit 条归档任务。"""
+        stmt = select(DownloadTaskArchive).where(*self._search_filters(job_id, status, keyword))
+        if after is not None:
+            stmt = stmt.where(tuple_(DownloadTaskArchive.created_at, DownloadTaskArchive.id) < tuple_(*after))
+        stmt = stmt.order_by(DownloadTaskArchive.created_at.desc(), DownloadTaskArchive.id.desc()).limit(limit)
+        result = await session.execute(stmt)
+        return list(result.scalars())
+
+    async def count_search(self, session: AsyncSession, job_id: Optional[int] = None,
+                           status: Optional[str] = None, keyword: Optional[str] = None) -> int:
+        filters = self._search_filters(job_id, status, keyword)
+        stmt = select(func.count()).select_from(DownloadTaskArchive).where(*filters)
+        return (await session.execute(stmt)).scalar_one()
+
+    async def delete(self, session: AsyncSession, task_id: int) -> bool:
+        result = await session.execute(delete(DownloadTaskArchive).where(DownloadTaskArchive.id == task_id))
+        return bool(result.rowcount)
+
+    async def delete_by_job(self, session: AsyncSession, job_id: int) -> int:
+        result = await session.execute(delete(DownloadTaskArchive).where(DownloadTaskArchive.job_id == job_id))
+        return result.rowcount or 0
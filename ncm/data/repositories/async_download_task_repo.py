@@ -1,13 +1,28 @@
 from __future__ import annotations
 
 from datetime import datetime, timezone
-from typing import Optional, List
+from typing import AsyncIterator, Optional, List
 from zoneinfo import ZoneInfo
-from sqlalchemy import select, delete, func, or_
+from sqlalchemy import Integer, select, delete, update, func, or_, tuple_, text, literal_column, union_all
 from sqlalchemy.dialects.sqlite import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from ncm.data.models.download_task import DownloadTask
 from ncm.data.models.download_job import DownloadJob
+from ncm.data.models.download_task_archive import DownloadTaskArchive
+from ncm.data.models.task_completion import COMPLETION_BUCKET_SECONDS, TaskCompletionRollup
+
+_TASK_COLUMNS = frozenset(DownloadTask.__table__.columns.keys())
+_ARCHIVE_LOOKUP_CHUNK = 500
+
+# download_task_fts（trigram 分词）是否存在；按进程缓存
+_FTS_AVAILABLE: Optional[bool] = None
+# trigram 至少需要 3 个字符才能命中索引，更短的关键词回退到 LIKE
+_FTS_MIN_KEYWORD = 3
+
+
+def _fts_phrase(keyword: str) -> str:
+    """把关键词转义为 FTS5 短语查询"""
+    return '"' + keyword.replace('"', '""') + '"'
 
 
 class AsyncDownloadTaskRepository:
@@ -32,6 +47,27 @@ class AsyncDownloadTaskRepository:
         result = await session.execute(select(DownloadTask).where(DownloadTask.status == status))
         return list(result.scalars())
 
+    async def get_by_statuses(self, session: AsyncSession, statuses: List[str]) -> List[DownloadTask]:
+        result = await session.execute(select(DownloadTask).where(DownloadTask.status.in_(statuses)))
+        return list(result.scalars())
+
+    async def count_by_status(self, session: AsyncSession) -> dict[str, int]:
+        """按状态计数 (COUNT(*) ... GROUP BY status)"""
+        result = await session.execute(
+            select(DownloadTask.status, func.count()).group_by(DownloadTask.status)
+        )
+        return {status: count for status, count in result.all() if status is not None}
+
+    async def list_page(self, session: AsyncSession, after_id: int = 0, limit: int = 500) -> List[DownloadTask]:
+        """按 id 键集分页读取任务"""
+        result = await session.execute(
+            select(DownloadTask)
+            .where(DownloadTask.id > after_id)
+            .order_by(DownloadTask.id)
+            .limit(limit)
+        )
+        return list(result.scalars())
+
     async def get_by_job_and_status(self, session: AsyncSession, job_id: int, status: str) -> List[DownloadTask]:
         result = await session.execute(
             select(DownloadTask).where(
@@ -85,71 +121,117 @@ class AsyncDownloadTaskRepository:
             await session.refresh(task)
         return tasks
 
-    async def create_batch_ids_and_get_pending_music(
-        self, session: AsyncSession, job_id: int, music_ids: List[str]
-    ) -> List[DownloadTask]:
+    async def upsert_music_ids(self, session: AsyncSession, job_id: int, music_ids: List[str]) -> int:
+        """批量写入 (job_id, music_id)，已存在的任务忽略；返回新插入的行数。
+
+        以 executemany 方式逐行绑定参数，单条语句的绑定变量数与歌单长度无关，
+        不会触发 SQLite 的 SQLITE_MAX_VARIABLE_NUMBER 限制。
+        """
         if not music_ids:
-            return []
+            return 0
 
-        # 1. 准备数据
-        data = [{"music_id": mid, "job_id": job_id, "progress_flags": 0, "status": "pending"} for mid in music_ids]
+        # (job_id, music_id) 在热表与归档表之间整体唯一：已归档的曲目不再重新入队（分块查询，控制绑定变量数）
+        archived_ids: set[str] = set()
+        for i in range(0, len(music_ids), _ARCHIVE_LOOKUP_CHUNK):
+            archived = await session.execute(
+                select(DownloadTaskArchive.music_id).where(
+                    DownloadTaskArchive.job_id == job_id,
+                    DownloadTaskArchive.music_id.in_(music_ids[i:i + _ARCHIVE_LOOKUP_CHUNK]),
+                )
+            )
+            archived_ids.update(archived.scalars())
+        if archived_ids:
+            music_ids = [mid for mid in music_ids if mid not in archived_ids]
+            if not music_ids:
+                return 0
 
-        # 2. 执行 INSERT OR IGNORE
+        # 使用 Core 表对象而非 ORM 实体，走原生 executemany 并保留 rowcount
         # 注意：index_elements 必须与数据库的 UNIQUE 约束完全一致
-        stmt = insert(DownloadTask).values(data).on_conflict_do_nothing(
+        stmt = insert(DownloadTask.__table__).on_conflict_do_nothing(
             index_elements=["job_id", "music_id"]
         )
+        rows = [{"music_id": mid, "job_id": job_id, "progress_flags": 0, "status": "pending"} for mid in music_ids]
+        result = await session.execute(stmt, rows)
+        return max(result.rowcount or 0, 0)
 
-        await session.execute(stmt)
-        # 使用 flush 确保数据进入数据库事务，但不提交
-        await session.flush()
-
-        # 3. 获取 status 为 pending 的 DownloadTask
+    async def stream_pending_by_job(
+        self, session: AsyncSession, job_id: int, yield_per: int = 500
+    ) -> AsyncIterator[DownloadTask]:
+        """以流式游标按 id 顺序逐个产出作业下 status 为 pending 的任务。"""
         query = (
             select(DownloadTask)
             .where(
                 DownloadTask.job_id == job_id,
                 DownloadTask.status == "pending",
-                # 不过滤，针对以前因为各种原因未完成的任务也执行下载
-                # DownloadTask.music_id.in_(music_ids),
             )
             .order_by(DownloadTask.id)
+            .execution_options(yield_per=yield_per)
         )
+        result = await session.stream_scalars(query)
+        async for task in result:
+            yield task
 
-        result = await session.execute(query)
-        return list(result.scalars().all())
+    async def stream_completed_files(
+        self, session: AsyncSession, yield_per: int = 2000
+    ) -> AsyncIterator[tuple[int, str, Optional[str], str]]:
+        """流式产出所有已完成且有文件的任务 (id, music_id, quality, file_path)，仅查询所需列。"""
+        query = (
+            select(
+                DownloadTask.id,
+                DownloadTask.music_id,
+                DownloadTask.quality,
+                DownloadTask.file_path,
+            )
+            .where(
+                DownloadTask.status == "completed",
+                DownloadTask.file_path.is_not(None),
+            )
+            .execution_options(yield_per=yield_per)
+        )
+        result = await session.stream(query)
+        async for row in result:
+            yield row.id, row.music_id, row.quality, row.file_path
 
-    async def update(self, session: AsyncSession, task_id: int, **kwargs) -> Optional[DownloadTask]:
-        task = await self.get_by_id(session, task_id)
-        if not task:
+    async def _update_one(self, session: AsyncSession, task_id: int, values: dict,
+                          returning: bool) -> Optional[DownloadTask]:
+        """单条 UPDATE 语句完成更新；returning=True 时通过 RETURNING 取回最新行，否则返回 None。"""
+        stmt = update(DownloadTask).where(DownloadTask.id == task_id).values(**values)
+        if not returning:
+            await session.execute(stmt, execution_options={"synchronize_session": False})
             return None
-        for key, value in kwargs.items():
-            if hasattr(task, key):
-                setattr(task, key, value)
-        await session.flush()
-        await session.refresh(task)
-        return task
+        stmt = stmt.returning(DownloadTask).execution_options(populate_existing=True)
+        result = await session.execute(stmt, execution_options={"synchronize_session": False})
+        return result.scalar_one_or_none()
 
-    async def update_progress(self, session: AsyncSession, task_id: int, progress_flag: int) -> Optional[DownloadTask]:
-        task = await self.get_by_id(session, task_id)
-        if not task:
-            return None
-        task.progress_flags = task.progress_flags | progress_flag
-        await session.flush()
-        await session.refresh(task)
-        return task
+    async def update(self, session: AsyncSession, task_id: int, returning: bool = True,
+                     **kwargs) -> Optional[DownloadTask]:
+        values = {key: value for key, value in kwargs.items() if key in _TASK_COLUMNS}
+        if not values:
+            return await self.get_by_id(session, task_id) if returning else None
+        return await self._update_one(session, task_id, values, returning)
+
+    async def update_progress(self, session: AsyncSession, task_id: int, progress_flag: int,
+                              returning: bool = True) -> Optional[DownloadTask]:
+        # 在 SQL 中按位或，避免并发下读-改-写丢失标志位
+        values = {"progress_flags": DownloadTask.progress_flags.op("|")(progress_flag)}
+        return await self._update_one(session, task_id, values, returning)
+
+    async def apply_changes(self, session: AsyncSession, task_id: int, progress_flag: int = 0,
+                            **kwargs) -> None:
+        """合并写入：字段赋值与进度标志按位或在同一条 UPDATE 中完成。"""
+        values = {key: value for key, value in kwargs.items() if key in _TASK_COLUMNS}
+        if progress_flag:
+            values["progress_flags"] = DownloadTask.progress_flags.op("|")(progress_flag)
+        if values:
+            await self._update_one(session, task_id, values, returning=False)
 
     async def update_status(self, session: AsyncSession, task_id: int, status: str,
-                            error_message: Optional[str] = None) -> Optional[DownloadTask]:
-        task = await self.get_by_id(session, task_id)
-        if not task:
-            return None
-        task.status = status
+                            error_message: Optional[str] = None,
+                            returning: bool = True) -> Optional[DownloadTask]:
+        values = {"status": status}
         if error_message is not None:
-            task.error_message = error_message
-        await session.flush()
-        await session.refresh(task)
-        return task
+            values["error_message"] = error_message
+        return await self._update_one(session, task_id, values, returning)
 
     # async def increment_retry_count(self, session: AsyncSession, task_id: int) -> Optional[DownloadTask]:
     #     task = await self.get_by_id(session, task_id)
@@ -187,24 +269,32 @@ class AsyncDownloadTaskRepository:
         result = await session.execute(stmt)
         return result.scalar_one_or_none()
 
-    async def search(
-            self,
-            session: AsyncSession,
-            job_id: Optional[int] = None,
-            status: Optional[str] = None,
-            keyword: Optional[str] = None,
-            limit: int = 20,
-            offset: int = 0
-    ) -> tuple[List[DownloadTask], int]:
-        stmt = select(DownloadTask)
+    async def _fts_available(self, session: AsyncSession) -> bool:
+        global _FTS_AVAILABLE
+        if _FTS_AVAILABLE is None:
+            result = await session.execute(
+                text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'download_task_fts'")
+            )
+            _FTS_AVAILABLE = result.first() is not None
+        return _FTS_AVAILABLE
 
+    async def _search_filters(self, session: AsyncSession, job_id: Optional[int], status: Optional[str],
+                              keyword: Optional[str]) -> list:
+        filters = []
         if job_id is not None:
-            stmt = stmt.where(DownloadTask.job_id == job_id)
+            filters.append(DownloadTask.job_id == job_id)
         if status:
-            stmt = stmt.where(DownloadTask.status == status)
-        if keyword:
+            filters.append(DownloadTask.status == status)
+        if keyword and len(keyword) >= _FTS_MIN_KEYWORD and await self._fts_available(session):
+            matched = (
+                select(literal_column("rowid"))
+                .select_from(text("download_task_fts"))
+                .where(literal_column("download_task_fts").op("MATCH")(_fts_phrase(keyword)))
+            )
+            filters.append(DownloadTask.id.in_(matched))
+        elif keyword:
             keyword = f"%{keyword}%"
-            stmt = stmt.where(
+            filters.append(
                 or_(
                     DownloadTask.music_title.ilike(keyword),
                     DownloadTask.music_artist.ilike(keyword),
@@ -212,16 +302,59 @@ class AsyncDownloadTaskRepository:
                     DownloadTask.music_id.ilike(keyword)
                 )
             )
+        return filters
 
-        # Count query
-        count_stmt = select(func.count()).select_from(stmt.subquery())
-        total = (await session.execute(count_stmt)).scalar_one()
+    async def search(
+            self,
+            session: AsyncSession,
+            job_id: Optional[int] = None,
+            status: Optional[str] = None,
+            keyword: Optional[str] = None,
+            limit: int = 20,
+            offset: int = 0,
+            with_total: bool = True
+    ) -> tuple[List[DownloadTask], Optional[int]]:
+        filters = await self._search_filters(session, job_id, status, keyword)
+        total = await self.count_search(session, job_id, status, keyword) if with_total else None
 
-        # Result query
-        stmt = stmt.order_by(DownloadTask.created_at.desc()).limit(limit).offset(offset)
+        stmt = (
+            select(DownloadTask)
+            .where(*filters)
+            .order_by(DownloadTask.created_at.desc(), DownloadTask.id.desc())
+            .limit(limit)
+            .offset(offset)
+        )
         result = await session.execute(stmt)
         return list(result.scalars()), total
 
+    async def search_after(
+            self,
+            session: AsyncSession,
+            job_id: Optional[int] = None,
+            status: Optional[str] = None,
+            keyword: Optional[str] = None,
+            limit: int = 20,
+            after: Optional[tuple[datetime, int]] = None
+    ) -> List[DownloadTask]:
+        """键集分页：按 (created_at, id) 倒序，返回位于 after 之后的最多 limit 条任务。"""
+        stmt = select(DownloadTask).where(*await self._search_filters(session, job_id, status, keyword))
+        if after is not None:
+            stmt = stmt.where(tuple_(DownloadTask.created_at, DownloadTask.id) < tuple_(*after))
+        stmt = stmt.order_by(DownloadTask.created_at.desc(), DownloadTask.id.desc()).limit(limit)
+        result = await session.execute(stmt)
+        return list(result.scalars())
+
+    async def count_search(
+            self,
+            session: AsyncSession,
+            job_id: Optional[int] = None,
+            status: Optional[str] = None,
+            keyword: Optional[str] = None
+    ) -> int:
+        filters = await self._search_filters(session, job_id, status, keyword)
+        stmt = select(func.count()).select_from(DownloadTask).where(*filters)
+        return (await session.execute(stmt)).scalar_one()
+
     async def count_completed_by_day(
         self,
         session: AsyncSession,
@@ -229,24 +362,42 @@ class AsyncDownloadTaskRepository:
         end: datetime,
         timezone_info: ZoneInfo,
     ) -> dict[str, int]:
-        stmt = (
-            select(DownloadTask.completed_at)
-            .where(
-                DownloadTask.status == "completed",
-                DownloadTask.completed_at.is_not(None),
-                DownloadTask.completed_at >= start,
-                DownloadTask.completed_at < end,
-            )
+        """按本地日期统计 [start, end)（naive UTC）内完成的任务数（含已归档任务）。
+
+        读取触发器维护的 task_completion_rollup：UTC 15 分钟桶（所有现行时区偏移均为 15 分钟的整数倍），
+        在 Python 中把桶换算为本地日期；查询代价与时间窗口内的桶数成正比，与任务总数无关。
+        """
+        start_bucket = int(start.replace(tzinfo=timezone.utc).timestamp()) // COMPLETION_BUCKET_SECONDS
+        end_bucket = int(end.replace(tzinfo=timezone.utc).timestamp()) // COMPLETION_BUCKET_SECONDS
+        stmt = select(TaskCompletionRollup.bucket, TaskCompletionRollup.completed).where(
+            TaskCompletionRollup.bucket >= start_bucket,
+            TaskCompletionRollup.bucket < end_bucket,
+            TaskCompletionRollup.completed != 0,
         )
         result = await session.execute(stmt)
         counts: dict[str, int] = {}
 
-        for completed_at in result.scalars():
-            if completed_at is None:
-                continue
-            if completed_at.tzinfo is None:
-                completed_at = completed_at.replace(tzinfo=timezone.utc)
-            day = completed_at.astimezone(timezone_info).date().isoformat()
-            counts[day] = counts.get(day, 0) + 1
+        for bucket_index, count in result.all():
+            bucket_start = datetime.fromtimestamp(bucket_index * COMPLETION_BUCKET_SECONDS, tz=timezone.utc)
+            day = bucket_start.astimezone(timezone_info).date().isoformat()
+            counts[day] = counts.get(day, 0) + count
 
         return counts
+
+    async def rebuild_completion_rollup(self, session: AsyncSession) -> int:
+        """由任务表与归档表全量重建 task_completion_rollup，返回重建的桶数"""
+        completed = union_all(
+            select(DownloadTask.completed_at).where(
+                DownloadTask.status == "completed",
+                DownloadTask.completed_at.is_not(None),
+            ),
+            select(DownloadTaskArchive.completed_at).where(DownloadTaskArchive.completed_at.is_not(None)),
+        ).subquery()
+        bucket = func.cast(func.strftime("%s", completed.c.completed_at), Integer) // COMPLETION_BUCKET_SECONDS
+        buckets = select(bucket.label("bucket"), func.count()).select_from(completed).group_by("bucket")
+
+        await session.execute(delete(TaskCompletionRollup))
+        result = await session.execute(
+            insert(TaskCompletionRollup.__table__).from_select(["bucket", "completed"], buckets)
+        )
+        return max(result.rowcount or 0, 0)
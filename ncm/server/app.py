@@ -18,13 +18,17 @@ from .framework.auto_router import (
 )
 from .framework.vue_router import register_vue_routes
 from .framework.local_music_router import register_local_music_routes
+from .framework.responses import FastJSONResponse
 from .middleware.auth import AuthMiddleware
 from ncm.data.async_session import dispose_async_engine
 from ncm.data.engine import close_engine
 from ncm.client.protocol.session import close_session
+from ncm.client.protocol.cache import get_response_cache
 from ncm.core.logging import get_logger, setup_logging
 from ncm.core.constants import PACKAGE_CLIENT_APIS, PACKAGE_SERVER_ROUTERS
 from ncm.service.cookie import get_cookie_manager
+from ncm.service.download.library import get_library_index
+from ncm.service.download.archive import get_task_archiver
 from ncm import __version__, __url__
 
 logger = get_logger(__name__)
@@ -43,6 +47,15 @@ async def lifespan(app: FastAPI):
         # 异步刷新 CookieManager 中的用户信息
         cookie_manager = get_cookie_manager()
         await cookie_manager.initialize()
+
+        # 构建曲库索引，供扫描时快速判断歌曲是否已在曲库中
+        try:
+            await get_library_index().load()
+        except Exception as e:
+            logger.warning(f"Failed to build library index, will retry on next scan: {e}")
+
+        # 后台把完成已久的任务移入归档表，保持 download_task 精简
+        get_task_archiver().start()
         
         yield
     except asyncio.CancelledError:
@@ -52,6 +65,8 @@ async def lifespan(app: FastAPI):
     finally:
         logger.debug("Application shutdown: cleaning up resources...")
         logger.info("应用关闭触发")
+
+        await get_task_archiver().stop()
         
         # Cleanup service instances with cleanup method
         instances = getattr(app.state, "service_instances", [])
@@ -83,6 +98,12 @@ async def lifespan(app: FastAPI):
         except Exception as e:
             logger.error(f"Failed to close global HTTP session: {e}")
 
+        # Close response cache persistence (if enabled)
+        try:
+            await get_response_cache().close()
+        except Exception as e:
+            logger.error(f"Failed to close response cache: {e}")
+
         # Dispose sync DB engine (if initialized)
         try:
             logger.debug("Disposing sync database engine...")
@@ -155,6 +176,7 @@ def create_app(log_level: int = None) -> FastAPI:
         description="NCM Sync - A Python implementation of Netease Cloud Music Sync Service",
         version=__version__,
         lifespan=lifespan,
+        default_response_class=FastJSONResponse,
         docs_url=None,
         redoc_url=None,
         openapi_url=None,
@@ -3,9 +3,10 @@ from __future__ import annotations
 import hashlib
 
 from fastapi import FastAPI, HTTPException, Request
-from fastapi.responses import FileResponse, Response, JSONResponse
+from fastapi.responses import FileResponse, Response
 
 from ncm.core.logging import get_logger
+from ncm.server.framework.responses import FastJSONResponse
 from ncm.service.download.service.async_task_service import AsyncTaskService
 from ncm.service.music import (
     LocalMusicService,
@@ -23,7 +24,7 @@ def register_local_music_routes(app: FastAPI) -> None:
     @app.get("/local/music/detail/{task_id}", include_in_schema=False)
     async def local_music_detail(task_id: int):
         result = await service.get_detail(task_id)
-        return JSONResponse(status_code=result["status"], content=result["body"])
+        return FastJSONResponse(status_code=result["status"], content=result["body"])
 
     @app.get("/local/music/cover/{task_id}", include_in_schema=False)
     async def local_music_cover(task_id: int, request: Request):
@@ -86,11 +87,11 @@ def register_local_music_routes(app: FastAPI) -> None:
     @app.post("/local/music/delete", include_in_schema=False)
     async def local_music_delete(payload: dict):
         result = await service.delete(payload.get("task_id"))
-        return JSONResponse(status_code=result["status"], content=result["body"])
+        return FastJSONResponse(status_code=result["status"], content=result["body"])
 
     @app.post("/local/music/rename", include_in_schema=False)
     async def local_music_rename(payload: dict):
         result = await service.rename(payload.get("task_id"), payload.get("new_name"))
-        return JSONResponse(status_code=result["status"], content=result["body"])
+        return FastJSONResponse(status_code=result["status"], content=result["body"])
 
 
@@ -51,14 +51,14 @@ async def parse_request_params(request: Request) -> Dict[str, Any]:
     # These parameters are used by RequestOptions and should be handled specially
     ncm_config_params = {
         'proxy', 'user_agent', 'real_ip', 'random_cn_ip', 'device_id',
-        'crypto', 'encrypt_response', 'check_token', 'timeout', 'os_type'
+        'crypto', 'encrypt_response', 'check_token', 'timeout', 'os_type', 'cache'
     }
     
     # Convert string values to appropriate types for NCM config params
     for key, value in params.items():
         if key in ncm_config_params and isinstance(value, str):
             # Handle boolean conversions
-            if key in ['random_cn_ip', 'encrypt_response', 'check_token']:
+            if key in ['random_cn_ip', 'encrypt_response', 'check_token', 'cache']:
                 if value.lower() in ('true', '1', 'yes', 'on'):
                     params[key] = True
                 elif value.lower() in ('false', '0', 'no', 'off'):
@@ -0,0 +1,14 @@
+"""Response classes for the NCM http layer."""
+
+from typing import Any
+
+from fastapi.responses import JSONResponse
+
+from ncm.core import jsonlib
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse 的渲染改用 ncm.core.jsonlib（orjson/msgspec 可用时），输出格式与 JSONResponse 一致"""
+
+    def render(self, content: Any) -> bytes:
+        return jsonlib.dumps(content)
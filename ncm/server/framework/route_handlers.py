@@ -3,8 +3,8 @@
 import inspect
 from typing import Callable
 from fastapi import Request, HTTPException
-from fastapi.responses import JSONResponse
 from .request_parser import parse_request_params
+from .responses import FastJSONResponse
 from ncm.client import APIResponse
 from ncm.client.exceptions import (
     NCMError,
@@ -20,8 +20,8 @@ from ncm.core.logging import get_logger
 logger = get_logger(__name__)
 
 
-def _music_session_error_response(error: MusicSessionUnavailableError) -> JSONResponse:
-    return JSONResponse(
+def _music_session_error_response(error: MusicSessionUnavailableError) -> FastJSONResponse:
+    return FastJSONResponse(
         content={
             "code": getattr(error, "code", 401),
             "message": getattr(error, "message", str(error)),
@@ -30,7 +30,7 @@ def _music_session_error_response(error: MusicSessionUnavailableError) -> JSONRe
     )
 
 
-def _convert_api_response_to_json(result: APIResponse) -> JSONResponse:
+def _convert_api_response_to_json(result: APIResponse) -> FastJSONResponse:
     """Convert APIResponse to FastAPI JSONResponse with proper header filtering."""
     
     # Filter headers - only keep safe and useful ones
@@ -72,7 +72,7 @@ def _convert_api_response_to_json(result: APIResponse) -> JSONResponse:
                 safe_headers[key] = value
     
     # Convert APIResponse to FastAPI Response
-    response = JSONResponse(
+    response = FastJSONResponse(
         content=result.body,
         status_code=result.status,
         headers=safe_headers
@@ -160,7 +160,7 @@ def create_service_handler(service_method: Callable) -> Callable:
             
             # Return JSON response for legacy format
             status_code = 200 if result.get("success", True) else 400
-            return JSONResponse(
+            return FastJSONResponse(
                 content=result,
                 status_code=status_code
             )
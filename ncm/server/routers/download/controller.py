@@ -153,6 +153,10 @@ class DownloadController:
     async def get_stats(self, **kwargs) -> APIResponse:
         return await self.system.get_stats(**kwargs)
 
+    @ncm_service("/ncm/client/cache/invalidate", ["POST"])
+    async def invalidate_client_cache(self, **kwargs) -> APIResponse:
+        return await self.system.invalidate_client_cache(**kwargs)
+
     @ncm_service("/ncm/download/job/create", ["POST"])
     async def create_job(self, **kwargs) -> APIResponse:
         return await self.jobs.create_job(**kwargs)
@@ -165,6 +169,10 @@ class DownloadController:
     async def retry_job_tasks(self, **kwargs) -> APIResponse:
         return await self.jobs.retry_job_tasks(**kwargs)
 
+    @ncm_service("/ncm/download/job/reconcile", ["POST"])
+    async def reconcile_job_counters(self, **kwargs) -> APIResponse:
+        return await self.jobs.reconcile_job_counters(**kwargs)
+
     @ncm_service("/ncm/download/job/update", ["POST"])
     async def update_job(self, **kwargs) -> APIResponse:
         return await self.jobs.update_job(**kwargs)
@@ -202,6 +210,10 @@ class DownloadController:
     async def daemon_control(self, **kwargs) -> APIResponse:
         return await self.daemon.daemon_control(**kwargs)
 
+    @ncm_service("/ncm/dashboard/rollup/rebuild", ["POST"])
+    async def rebuild_dashboard_rollup(self, **kwargs) -> APIResponse:
+        return await self.dashboard.rebuild_rollup(**kwargs)
+
     @ncm_service("/ncm/dashboard/aggregate", ["GET", "POST"])
     async def dashboard_aggregate(self, **kwargs) -> APIResponse:
         return await self.dashboard.aggregate(**kwargs)
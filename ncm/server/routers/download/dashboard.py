@@ -3,7 +3,8 @@
 from __future__ import annotations
 
 from datetime import datetime, time, timedelta, timezone
-from zoneinfo import ZoneInfo
+from typing import Optional
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
 from ncm.client import APIResponse
 from ncm.server.routers.download import DownloadContext
@@ -11,6 +12,10 @@ from ncm.core.logging import get_logger
 
 logger = get_logger(__name__)
 
+_DEFAULT_TIMEZONE = "Asia/Shanghai"
+_DEFAULT_DAYS = 7
+_MAX_DAYS = 366
+
 
 class DownloadControllerDashboard:
     def __init__(self, context: DownloadContext):
@@ -19,9 +24,27 @@ class DownloadControllerDashboard:
         self._scheduler = context.scheduler
         self.process = context.process
 
-    async def aggregate(self, **kwargs) -> APIResponse:
+    async def aggregate(self, days: int = _DEFAULT_DAYS, tz: Optional[str] = None, **kwargs) -> APIResponse:
+        """Dashboard aggregate; ``days`` (1-366) and IANA timezone ``tz`` select the completion window."""
+        try:
+            days = int(days)
+            if not 1 <= days <= _MAX_DAYS:
+                raise ValueError(f"days must be between 1 and {_MAX_DAYS}")
+            try:
+                timezone_info = ZoneInfo(tz or _DEFAULT_TIMEZONE)
+            except (ZoneInfoNotFoundError, ValueError):
+                raise ValueError(f"Unknown timezone: {tz}")
+        except (TypeError, ValueError) as e:
+            return APIResponse(
+                status=400,
+                body={
+                    "code": 400,
+                    "message": str(e),
+                },
+            )
+
         try:
-            days = await self._get_recent_added_music_days()
+            day_counts = await self._get_recent_added_music_days(days, timezone_info)
             return APIResponse(
                 status=200,
                 body={
@@ -29,7 +52,8 @@ class DownloadControllerDashboard:
                     "message": "Dashboard aggregate retrieved successfully",
                     "data": {
                         "recent_added_music": {
-                            "days": days,
+                            "timezone": timezone_info.key,
+                            "days": day_counts,
                         },
                     },
                 },
@@ -44,10 +68,33 @@ class DownloadControllerDashboard:
                 },
             )
 
-    async def _get_recent_added_music_days(self) -> list[dict[str, int | str]]:
-        timezone_info = self._get_dashboard_timezone()
+    async def rebuild_rollup(self, **kwargs) -> APIResponse:
+        """Rebuild the completion rollup table from task history."""
+        try:
+            async with self.orchestrator.uow_factory() as uow:
+                buckets = await self.orchestrator.task_repo.rebuild_completion_rollup(uow.session)
+            return APIResponse(
+                status=200,
+                body={
+                    "code": 200,
+                    "message": "Completion rollup rebuilt",
+                    "data": {"buckets": buckets},
+                },
+            )
+        except Exception as e:
+            logger.exception("Failed to rebuild completion rollup")
+            return APIResponse(
+                status=500,
+                body={
+                    "code": 500,
+                    "message": f"Failed to rebuild completion rollup: {str(e)}",
+                },
+            )
+
+    async def _get_recent_added_music_days(self, days: int,
+                                           timezone_info: ZoneInfo) -> list[dict[str, int | str]]:
         today = datetime.now(timezone_info).date()
-        start_day = today - timedelta(days=6)
+        start_day = today - timedelta(days=days - 1)
         end_day = today + timedelta(days=1)
 
         start_local = datetime.combine(start_day, time.min, tzinfo=timezone_info)
@@ -56,7 +103,7 @@ class DownloadControllerDashboard:
         start_utc = start_local.astimezone(timezone.utc).replace(tzinfo=None)
         end_utc = end_local.astimezone(timezone.utc).replace(tzinfo=None)
 
-        async with self.orchestrator.uow_factory() as uow:
+        async with self.orchestrator.read_uow_factory() as uow:
             counts = await self.orchestrator.task_repo.count_completed_by_day(
                 uow.session,
                 start_utc,
@@ -69,8 +116,5 @@ class DownloadControllerDashboard:
                 "date": (start_day + timedelta(days=offset)).isoformat(),
                 "count": counts.get((start_day + timedelta(days=offset)).isoformat(), 0),
             }
-            for offset in range(7)
+            for offset in range(days)
         ]
-
-    def _get_dashboard_timezone(self) -> ZoneInfo:
-        return ZoneInfo("Asia/Shanghai")
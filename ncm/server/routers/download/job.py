@@ -136,6 +136,33 @@ class DownloadControllerJob:
                 }
             )
 
+    async def reconcile_job_counters(self, job_id: Optional[int] = None, **kwargs) -> APIResponse:
+        """Recompute total/completed/failed task counters and repair drifted jobs."""
+        try:
+            job_id = int(job_id) if job_id else None
+            repaired = await self.orchestrator.reconcile_job_counters(job_id)
+
+            return APIResponse(
+                status=200,
+                body={
+                    "code": 200,
+                    "message": f"Reconciled counters for {len(repaired)} jobs",
+                    "data": {
+                        "repaired_count": len(repaired),
+                        "repaired": repaired
+                    }
+                }
+            )
+        except Exception as e:
+            logger.exception("Failed to reconcile job counters")
+            return APIResponse(
+                status=500,
+                body={
+                    "code": 500,
+                    "message": f"Failed to reconcile job counters: {str(e)}"
+                }
+            )
+
     async def update_job(self,
                          job_id: int,
                          job_name: Optional[str] = None,
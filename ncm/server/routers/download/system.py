@@ -2,7 +2,14 @@
 
 from ncm.server.routers.download import DownloadContext
 from ncm.client import APIResponse
+from ncm.client.protocol.cache import get_response_cache
+from ncm.client.protocol.singleflight import get_single_flight
+from ncm.client.protocol.ratelimit import get_rate_limiter
+from ncm.client.protocol.batch import get_request_batcher
+from ncm.client.protocol.transport import get_transport_registry
 from ncm.core.logging import get_logger
+from ncm.service.cookie import get_session_pool
+from ncm.service.download.library import get_library_index
 
 logger = get_logger(__name__)
 
@@ -19,7 +26,7 @@ class DownloadControllerSystem:
         Unified status query endpoint.
 
         Args:
-            type: Status type ('system', 'process','scheduler','active_tasks')
+            type: Status type ('system', 'process','scheduler','active_tasks','library','client')
         """
         try:
             if type == "system":
@@ -35,6 +42,17 @@ class DownloadControllerSystem:
                 data = self.process.get_status()
             elif type == "scheduler":
                 data = self._scheduler.get_stats()
+            elif type == "library":
+                data = get_library_index().get_stats()
+            elif type == "client":
+                data = {
+                    "response_cache": get_response_cache().get_stats(),
+                    "single_flight": get_single_flight().get_stats(),
+                    "rate_limit": get_rate_limiter().get_stats(),
+                    "batch": get_request_batcher().get_stats(),
+                    "transports": get_transport_registry().get_stats(),
+                    "session_pool": get_session_pool().get_stats(),
+                }
             elif type == "active_tasks":
                 active_tasks_data = await self.orchestrator.list_active_tasks_dict()
                 data = {
@@ -46,7 +64,7 @@ class DownloadControllerSystem:
                     status=400,
                     body={
                         "code": 400,
-                        "message": f"Invalid stats type: {type}. Expected 'system', 'process', or 'active_tasks'."
+                        "message": f"Invalid stats type: {type}. Expected 'system', 'process', 'active_tasks', 'library' or 'client'."
                     }
                 )
 
@@ -68,3 +86,25 @@ class DownloadControllerSystem:
                     "message": f"Failed to get stats: {str(e)}"
                 }
             )
+
+    async def invalidate_client_cache(self, uri: str = None, **kwargs) -> APIResponse:
+        """Invalidate cached NCM responses for an upstream URI, or all of them when uri is omitted."""
+        try:
+            removed = await get_response_cache().invalidate(uri or None)
+            return APIResponse(
+                status=200,
+                body={
+                    "code": 200,
+                    "message": "Response cache invalidated",
+                    "data": {"uri": uri, "removed": removed}
+                }
+            )
+        except Exception as e:
+            logger.exception("Failed to invalidate response cache")
+            return APIResponse(
+                status=500,
+                body={
+                    "code": 500,
+                    "message": f"Failed to invalidate response cache: {str(e)}"
+                }
+            )
@@ -183,21 +183,36 @@ class DownloadControllerTask:
                         job_id: Optional[int] = None,
                         status: Optional[str] = None,
                         keyword: Optional[str] = None,
+                        cursor: Optional[str] = None,
+                        with_total: bool = True,
+                        archived: bool = False,
                         **kwargs) -> APIResponse:
-        """List tasks with pagination and filtering."""
+        """List tasks with pagination and filtering.
+
+        Pass ``cursor`` (empty string for the first page, then the returned ``next_cursor``)
+        for keyset pagination; ``page`` is ignored in that mode.
+        Pass ``archived=true`` to list completed tasks that were moved to the archive.
+        """
         try:
             page = int(page)
             limit = int(limit)
             offset = (page - 1) * limit
             if job_id:
                 job_id = int(job_id)
+            if isinstance(with_total, str):
+                with_total = with_total.lower() not in ("0", "false", "no")
+            if isinstance(archived, str):
+                archived = archived.lower() in ("1", "true", "yes")
 
             result = await self.orchestrator.search_tasks(
                 job_id=job_id,
                 status=status,
                 keyword=keyword,
                 limit=limit,
-                offset=offset
+                offset=offset,
+                cursor=cursor,
+                with_total=with_total,
+                archived=archived
             )
 
             return APIResponse(
@@ -208,6 +223,14 @@ class DownloadControllerTask:
                     "data": result
                 }
             )
+        except ValueError as e:
+            return APIResponse(
+                status=400,
+                body={
+                    "code": 400,
+                    "message": str(e)
+                }
+            )
         except Exception as e:
             logger.exception(f"Failed to list tasks")
             return APIResponse(
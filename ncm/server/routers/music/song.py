@@ -50,7 +50,7 @@ class SongController:
         return resp
 
     @ncm_service("/ncm/music/song/detail", ["GET", "POST"])
-    @with_cookie(max_retries=2)
+    @with_cookie(max_retries=2, pooled=True)
     async def song_detail(self,
                           ids: Union[int, str, List[int], List[str]],
                           **kwargs
@@ -77,7 +77,7 @@ class SongController:
 
 
     @ncm_service("/ncm/music/song/lyric", ["GET", "POST"])
-    @with_cookie(max_retries=2)
+    @with_cookie(max_retries=2, pooled=True)
     async def song_lyric(self,
         id: Union[str, int],
                           **kwargs
@@ -4,9 +4,9 @@ from dataclasses import dataclass
 from typing import Any, Dict, Optional, Protocol, Iterable, Callable, Set, Tuple, Awaitable
 
 import hashlib
-import json
 import time
 
+from ncm.core import jsonlib
 from ncm.core.logging import get_logger
 
 logger = get_logger(__name__)
@@ -91,10 +91,10 @@ class SnapshotDiffer:
 
     def _compute_hash(self, snapshot: Any) -> str:
         try:
-            payload = json.dumps(snapshot, sort_keys=True, ensure_ascii=False, default=str)
+            payload = jsonlib.dumps(snapshot, sort_keys=True, default=str)
         except Exception:
-            payload = repr(snapshot)
-        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+            payload = repr(snapshot).encode("utf-8")
+        return hashlib.sha256(payload).hexdigest()
 
     def _is_ignored(self, path: str) -> bool:
         ignore = self._config.ignore_fields
@@ -5,6 +5,7 @@ from typing import Any, Dict, List
 
 from fastapi import WebSocket, WebSocketDisconnect
 
+from ncm.core import jsonlib
 from ncm.core.logging import get_logger
 from .base import DownloadWsContext, WsModuleRegistry
 from .loader import load_ws_modules
@@ -25,7 +26,7 @@ class WsRouter:
         async def safe_send(payload: Dict[str, Any]) -> None:
             try:
                 async with send_lock:
-                    await websocket.send_json(payload)
+                    await websocket.send_text(jsonlib.dumps_str(payload))
             except Exception as exc:
                 logger.error(f"WS send error: {exc}")
 
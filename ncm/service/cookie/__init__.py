@@ -1,11 +1,14 @@
 
 from .manager import get_cookie_manager
+from .pool import get_session_pool, pin_sessions
 from .decorators import with_cookie
 
 
 
 __all__ = [
     "get_cookie_manager",
+    "get_session_pool",
+    "pin_sessions",
 
     "with_cookie", # 现在统一为 with_cookie
     # "with_cookie_retry", :@with_cookie(max_retries=2)
@@ -2,7 +2,8 @@
 Cookie session decorators.
 
 Provides a single `with_cookie` decorator for injecting the current NetEase
-Cloud Music session and handling retry/failure bookkeeping.
+Cloud Music session and handling retry/failure bookkeeping. With ``pooled=True``
+read-only calls draw their session from the multi-account session pool instead.
 """
 
 import functools
@@ -10,7 +11,8 @@ import logging
 from typing import Callable, Optional
 
 from . import get_cookie_manager
-from ncm.client.exceptions import AuthenticationError, MusicSessionUnavailableError
+from .pool import get_session_pool
+from ncm.client.exceptions import AuthenticationError, MusicSessionUnavailableError, RateLimitError
 
 logger = logging.getLogger(__name__)
 
@@ -20,31 +22,41 @@ async def _execute_with_cookie(
     *args,
     retries: int = 0,
     manual: bool = False,
+    pooled: bool = False,
     **kwargs,
 ):
     cookie_service = get_cookie_manager()
     last_exception: Optional[Exception] = None
+    # 调用方未显式传入 cookie 时，每次尝试都重新注入（重试时可能已切换到新的会话）
+    inject = not kwargs.get("cookie")
+    # 会话池未启用时与非池化调用完全一致
+    pool = get_session_pool() if pooled and inject else None
+    if pool is not None and not pool.enabled:
+        pool = None
 
     for attempt in range(retries + 1):
+        session = None
         try:
             # 尝试获取当前会话
             current_session = await cookie_service.get_current_session()
 
             # 自动注入 Cookie（若调用方未显式传入）
-            if not kwargs.get("cookie"):
+            if inject:
                 if not current_session:
                     raise MusicSessionUnavailableError(
                         "没有可用的网易云音乐登录会话，请先登录",
                         code=401,
                         details={"reason": "no_current_session"},
                     )
-                kwargs["cookie"] = current_session.cookie
-                kwargs["_session"] = current_session.to_dict()
+                session = await pool.acquire(current_session) if pool else current_session
+                kwargs["cookie"] = session.cookie
+                kwargs["_session"] = session.to_dict()
             # 即使调用方显式传入了 cookie，也尽量补充当前会话信息，
             # 避免依赖 _session 的下游 controller 出现 KeyError。
             elif current_session and "_session" not in kwargs:
                 kwargs["_session"] = current_session.to_dict()
 
+            session_id = session.id if session else None
             result = await func(*args, **kwargs)
 
             # 手动模式：期望返回 (result, success)
@@ -52,24 +64,39 @@ async def _execute_with_cookie(
                 if isinstance(result, tuple) and len(result) == 2:
                     actual_result, success = result
                     if success:
-                        await cookie_service.mark_cookie_success()
+                        if pool:
+                            pool.record_success(session_id)
+                        await cookie_service.mark_cookie_success(session_id)
                     else:
-                        await cookie_service.mark_cookie_failure()
+                        await cookie_service.mark_cookie_failure(session_id)
                     return actual_result
                 return result
 
             # 自动模式：成功即标记成功
-            await cookie_service.mark_cookie_success()
+            if pool:
+                pool.record_success(session_id)
+            await cookie_service.mark_cookie_success(session_id)
             return result
 
         except Exception as e:
             last_exception = e
 
+            # 池化调用：该账号被限流时，若池中还有其他可用账号则换号重试；
+            # 池未启用或没有其他账号时与非池化调用一致，直接抛出
+            if pool and session and isinstance(e, RateLimitError):
+                pool.record_throttle(session.id)
+                if attempt < retries and pool.can_rotate(current_session, session.id):
+                    logger.info(f"会话 {session.id} 被限流，换用其他账号重试")
+                    continue
+                raise
+
             if _is_auth_error(e):
                 logger.warning(
                     f"认证失败 (尝试 {attempt + 1}/{retries + 1}): {str(e)}"
                 )
-                await cookie_service.mark_cookie_failure()
+                if pool and session:
+                    pool.record_failure(session.id)
+                await cookie_service.mark_cookie_failure(session.id if session else None)
 
                 # 还有重试机会则继续
                 if attempt < retries:
@@ -99,8 +126,15 @@ def with_cookie(
     *,
     max_retries: int = 0,
     manual: bool = False,
+    pooled: bool = False,
 ):
-    """Inject current cookie session and handle auth failure bookkeeping."""
+    """
+    Inject current cookie session and handle auth failure bookkeeping.
+
+    pooled=True draws the session from the multi-account pool (when enabled) and retries
+    throttled calls on another account. Use it only for read-only calls whose result does
+    not depend on the account, never for URL resolution or per-user data.
+    """
 
     def decorator(func: Callable) -> Callable:
         @functools.wraps(func)
@@ -110,6 +144,7 @@ def with_cookie(
                 *args,
                 retries=max_retries,
                 manual=manual,
+                pooled=pooled,
                 **kwargs,
             )
 
@@ -15,6 +15,7 @@ from ncm.data.models.account_session import AccountSession
 from ncm.client.apis.user import login
 from ncm.core.time import UTC_CLOCK
 from ncm.service.cookie.models import SimpleSession
+from ncm.service.cookie.pool import get_session_pool
 from ncm.client.apis.user.login.models import LoginStatusResponse
 
 
@@ -122,6 +123,7 @@ class CookieManager:
             # 3. Set as current
             self._current_session = new_session
             self._login_status_cache = LoginStatusResponse.model_validate(body)
+            get_session_pool().invalidate()
 
             logger.debug(f"Added and switched to new session {session_id} for account {self._login_status_cache.profile.nickname}")
 
@@ -170,6 +172,7 @@ class CookieManager:
                 self._current_session = session
                 await self._async_repo.update_session_selected_time(uow.session, session.id)
                 await uow.commit()
+                get_session_pool().invalidate()
 
                 await self.refresh_status()
                 return True
@@ -183,6 +186,7 @@ class CookieManager:
             async with self._uow_factory() as uow:
                 success = await self._async_repo.invalidate_session(uow.session, session_id)
                 await uow.commit()
+                get_session_pool().invalidate()
 
                 if success and self._current_session and self._current_session.id == session_id:
                     self._current_session = None
@@ -205,17 +209,32 @@ class CookieManager:
             return SimpleSession(id=session.id, user_id=session.account_id, cookie=session.cookie, login_type=session.login_type, is_valid=session.is_valid)
         return None
 
-    async def mark_cookie_success(self) -> None:
-        if not self._current_session:
-            return
+    async def mark_cookie_success(self, session_id: Optional[int] = None) -> None:
+        """Mark a session as working; defaults to the current session (pooled calls pass their own)."""
+        if session_id is None:
+            if not self._current_session:
+                return
+            session_id = self._current_session.id
         try:
             async with self._uow_factory() as uow:
-                await self._async_repo.mark_session_success(uow.session, self._current_session.id)
+                await self._async_repo.mark_session_success(uow.session, session_id)
                 await uow.commit()
         except Exception as e:
             logger.error(f"Mark success failed: {str(e)}")
 
-    async def mark_cookie_failure(self) -> None:
+    async def mark_cookie_failure(self, session_id: Optional[int] = None) -> None:
+        """
+        Record an auth failure. For the current session (the default) switch to the next valid one;
+        for another pooled session only count the failure, the pool reloads on its next use.
+        """
+        if session_id is not None and session_id != self.get_current_session_id():
+            try:
+                async with self._uow_factory() as uow:
+                    await self._async_repo.mark_session_failure(uow.session, session_id)
+                    await uow.commit()
+            except Exception as e:
+                logger.error(f"Mark failure failed: {str(e)}")
+            return
         if not self._current_session:
             return
         try:
@@ -227,6 +246,7 @@ class CookieManager:
                 logger.warning(f"Session {self._current_session.id} invalidated due to failures. Switching...")
                 self._current_session = None
                 self._login_status_cache = None
+                get_session_pool().invalidate()
                 await self.initialize()
         except Exception as e:
             logger.error(f"Mark failure failed: {str(e)}")
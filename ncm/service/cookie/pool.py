@@ -0,0 +1,274 @@
+"""
+Multi-account session pool.
+
+Spreads read-only, account-agnostic NCM calls (song detail, lyrics) across every valid
+account session, so one account's upstream rate limit no longer caps sync throughput.
+Calls tied to the current account's entitlement (song URLs, user playlists) keep using
+the current session - see ``with_cookie(pooled=True)``.
+"""
+
+import asyncio
+import itertools
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Optional
+
+from ncm.client.apis.user import login
+from ncm.core.config import SessionPoolSettings, get_config_manager
+from ncm.data.async_session import get_uow_factory
+from ncm.data.repositories.async_account_session_repo import AsyncAccountSessionRepository
+from ncm.service.cookie.models import SimpleSession
+
+logger = logging.getLogger(__name__)
+
+# pinned 策略的固定键（通常为下载作业），由 pin_sessions 设置，子任务继承
+_pin_key: ContextVar[Optional[str]] = ContextVar("ncm_session_pin", default=None)
+
+
+@contextmanager
+def pin_sessions(key: str) -> Iterator[None]:
+    """在该上下文内（含其中创建的子任务），pinned 策略为同一 key 始终选择同一账号"""
+    token = _pin_key.set(key)
+    try:
+        yield
+    finally:
+        _pin_key.reset(token)
+        get_session_pool().release_pin(key)
+
+
+class _Member:
+    """池中的一个账号会话及其健康状态"""
+
+    # 健康分是成功 (1) / 失败 (0) 的指数加权平均
+    DECAY = 0.8
+
+    __slots__ = ("session", "vip_type", "score", "throttled_at", "failed_at",
+                 "requests", "throttles", "failures")
+
+    def __init__(self, session: SimpleSession, vip_type: int):
+        self.session = session
+        self.vip_type = vip_type
+        self.score = 1.0
+        self.throttled_at: Optional[float] = None
+        self.failed_at: Optional[float] = None
+        self.requests = 0
+        self.throttles = 0
+        self.failures = 0
+
+    def available(self, settings: SessionPoolSettings, now: float) -> bool:
+        cooldown = settings.throttle_cooldown_seconds
+        if self.throttled_at is not None and now - self.throttled_at < cooldown:
+            return False
+        # 健康分过低的账号冷却后放行探测请求，成功后逐步恢复
+        if self.score < settings.min_health and self.failed_at is not None and now - self.failed_at < cooldown:
+            return False
+        return True
+
+    def record(self, ok: bool) -> None:
+        self.score = self.score * self.DECAY + (1.0 - self.DECAY if ok else 0.0)
+
+
+class SessionPool:
+    """多账号会话池 - 按策略在健康的账号之间分配只读请求
+
+    成员来自 account_sessions 表中的有效会话（同一账号只取一个），首次加入时用 login.status 校验并记录 VIP 类型；
+    same_vip_type_only 时只在与当前账号 VIP 类型相同的账号之间分配，保证 privilege（可下载音质等）一致。
+    被限流的账号在 throttle_cooldown_seconds 内不参与分配；没有可用成员时退回当前会话。
+    """
+
+    def __init__(self):
+        self._repo = AsyncAccountSessionRepository()
+        self._uow_factory = get_uow_factory()
+        self._members: Dict[int, _Member] = {}
+        self._loaded_at: Optional[float] = None
+        self._lock = asyncio.Lock()
+        self._rr = itertools.count()
+        self._pins: Dict[str, int] = {}
+
+    @staticmethod
+    def _settings() -> SessionPoolSettings:
+        return get_config_manager().load_sync().session_pool
+
+    @property
+    def enabled(self) -> bool:
+        return self._settings().enabled
+
+    def invalidate(self) -> None:
+        """会话新增、切换或失效后调用，下次分配前重新加载成员"""
+        self._loaded_at = None
+
+    async def acquire(self, primary: SimpleSession) -> SimpleSession:
+        """为一次只读请求选择会话；未启用或没有可用成员时返回 primary（当前会话）"""
+        settings = self._settings()
+        if not settings.enabled:
+            return primary
+
+        await self._ensure_loaded(primary, settings)
+        member = self._pick(primary, settings)
+        if member is None:
+            return primary
+        member.requests += 1
+        return member.session
+
+    def can_rotate(self, primary: SimpleSession, session_id: int) -> bool:
+        """池已启用且除 session_id 外还有可用账号时返回 True（被限流的请求可换号重试）"""
+        settings = self._settings()
+        if not settings.enabled:
+            return False
+        return any(m.session.id != session_id for m in self._candidates(primary, settings))
+
+    def _candidates(self, primary: SimpleSession, settings: SessionPoolSettings) -> List[_Member]:
+        anchor = self._members.get(primary.id)
+        if anchor is None:
+            return []
+        now = time.monotonic()
+        return [
+            m for m in self._members.values()
+            if m.available(settings, now) and (not settings.same_vip_type_only or m.vip_type == anchor.vip_type)
+        ]
+
+    def _pick(self, primary: SimpleSession, settings: SessionPoolSettings) -> Optional[_Member]:
+        candidates = self._candidates(primary, settings)
+        if not candidates:
+            return None
+
+        if settings.policy == "round_robin":
+            return candidates[next(self._rr) % len(candidates)]
+        if settings.policy == "pinned":
+            key = _pin_key.get()
+            if key is not None:
+                pinned = self._members.get(self._pins.get(key, -1))
+                if pinned in candidates:
+                    return pinned
+                member = self._least_throttled(candidates)
+                self._pins[key] = member.session.id
+                return member
+        return self._least_throttled(candidates)
+
+    @staticmethod
+    def _least_throttled(candidates: List[_Member]) -> _Member:
+        # 从未被限流的优先，其次健康分高、请求少的，使负载在同等账号间均摊
+        return min(candidates, key=lambda m: (m.throttled_at or 0.0, -m.score, m.requests))
+
+    def release_pin(self, key: str) -> None:
+        self._pins.pop(key, None)
+
+    def record_success(self, session_id: int) -> None:
+        member = self._members.get(session_id)
+        if member is not None:
+            member.record(True)
+
+    def record_throttle(self, session_id: int) -> None:
+        member = self._members.get(session_id)
+        if member is None:
+            return
+        member.throttles += 1
+        member.throttled_at = time.monotonic()
+        member.record(False)
+        logger.warning(f"Pooled session {session_id} (user_id: {member.session.user_id}) throttled, cooling down")
+
+    def record_failure(self, session_id: int) -> None:
+        """认证失败：降低健康分，并在下次分配前重新加载（失败次数过多的会话会被数据库标记为无效）"""
+        member = self._members.get(session_id)
+        if member is None:
+            return
+        member.failures += 1
+        member.failed_at = time.monotonic()
+        member.record(False)
+        self.invalidate()
+
+    async def _ensure_loaded(self, primary: SimpleSession, settings: SessionPoolSettings) -> None:
+        if self._loaded_at is not None and time.monotonic() - self._loaded_at < settings.refresh_seconds:
+            return
+        async with self._lock:
+            if self._loaded_at is not None and time.monotonic() - self._loaded_at < settings.refresh_seconds:
+                return
+            try:
+                await self._reload(primary)
+            except Exception as e:
+                logger.error(f"Session pool reload failed: {str(e)}")
+            self._loaded_at = time.monotonic()
+
+    async def _reload(self, primary: SimpleSession) -> None:
+        async with self._uow_factory() as uow:
+            rows = await self._repo.get_valid_sessions_ordered_by_last_selected(uow.session)
+            candidates = [
+                SimpleSession(id=s.id, user_id=s.account_id, cookie=s.cookie, login_type=s.login_type, is_valid=s.is_valid)
+                for s in rows
+            ]
+
+        # 同一账号的多个登录共享上游限额，只保留一个（当前会话优先）
+        candidates.sort(key=lambda s: s.id != primary.id)
+        sessions: List[SimpleSession] = []
+        seen = set()
+        for session in candidates:
+            if session.user_id not in seen:
+                seen.add(session.user_id)
+                sessions.append(session)
+
+        fresh = [s for s in sessions if s.id not in self._members]
+        probes = await asyncio.gather(*(self._probe(s) for s in fresh))
+        vip_types = {s.id: vip_type for s, vip_type in zip(fresh, probes)}
+
+        members: Dict[int, _Member] = {}
+        for session in sessions:
+            member = self._members.get(session.id)
+            if member is None:
+                vip_type = vip_types.get(session.id)
+                if vip_type is None:
+                    continue
+                member = _Member(session, vip_type)
+            members[session.id] = member
+        self._members = members
+        logger.debug(f"Session pool loaded {len(members)}/{len(sessions)} verified accounts")
+
+    @staticmethod
+    async def _probe(session: SimpleSession) -> Optional[int]:
+        """校验会话并返回账号的 VIP 类型；无效或校验失败返回 None（下次加载时重试）"""
+        try:
+            resp = await login.status(cookie=session.cookie)
+        except Exception as e:
+            logger.warning(f"Session {session.id} verification failed: {str(e)}")
+            return None
+        body = resp.body if isinstance(resp.body, dict) else {}
+        account = body.get("account") or (body.get("data") or {}).get("account")
+        if not resp.success or not account:
+            logger.warning(f"Session {session.id} (user_id: {session.user_id}) has no account data, skipped")
+            return None
+        return int(account.get("vipType") or 0)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取会话池成员与健康状态"""
+        settings = self._settings()
+        now = time.monotonic()
+        members: List[Dict[str, Any]] = []
+        for member in self._members.values():
+            members.append({
+                "session_id": member.session.id,
+                "user_id": member.session.user_id,
+                "vip_type": member.vip_type,
+                "available": member.available(settings, now),
+                "health": round(member.score, 3),
+                "requests": member.requests,
+                "throttles": member.throttles,
+                "failures": member.failures,
+            })
+        return {
+            "enabled": settings.enabled,
+            "policy": settings.policy,
+            "members": members,
+            "pinned": len(self._pins),
+        }
+
+
+_session_pool: Optional[SessionPool] = None
+
+
+def get_session_pool() -> SessionPool:
+    global _session_pool
+    if _session_pool is None:
+        _session_pool = SessionPool()
+    return _session_pool
+
@@ -0,0 +1,104 @@
+"""Background archival of old completed tasks into download_task_archive."""
+
+import asyncio
+import time
+from datetime import timedelta
+from typing import Dict, Optional
+
+from ncm.core.config import get_config_manager
+from ncm.core.logging import get_logger
+from ncm.core.time import UTC_CLOCK
+from ncm.data.async_session import get_uow_factory
+from ncm.data.repositories.async_download_task_archive_repo import AsyncDownloadTaskArchiveRepository
+
+logger = get_logger(__name__)
+
+
+class TaskArchiver:
+    """任务归档器 - 后台把完成已久的任务从 download_task 移入归档表
+
+    每批在独立事务内移动 archive_batch_size 个任务，批间停顿 archive_batch_pause_ms，
+    避免长时间占用 SQLite 写锁；一轮处理完后等待 archive_interval_minutes 再开始下一轮。
+    归档行保留原任务ID与文件信息，曲库索引无需变更。
+    """
+
+    def __init__(self):
+        self.uow_factory = get_uow_factory()
+        self.archive_repo = AsyncDownloadTaskArchiveRepository()
+        self._worker: Optional[asyncio.Task] = None
+        self._archived = 0
+        self._runs = 0
+        self._last_run_at: Optional[float] = None
+        self._last_run_seconds = 0.0
+
+    async def run_once(self) -> int:
+        """执行一轮归档，返回本轮移动的任务数；archive_after_days 为 0 时不执行"""
+        settings = get_config_manager().load_sync().database
+        if settings.archive_after_days <= 0:
+            return 0
+
+        cutoff = UTC_CLOCK.now() - timedelta(days=settings.archive_after_days)
+        # SQLite 中以 naive UTC 存储时间
+        cutoff = cutoff.replace(tzinfo=None)
+        start = time.perf_counter()
+        moved = 0
+        while True:
+            async with self.uow_factory() as uow:
+                count = await self.archive_repo.archive_completed_before(
+                    uow.session, cutoff, limit=settings.archive_batch_size
+                )
+            moved += count
+            if count < settings.archive_batch_size:
+                break
+            await asyncio.sleep(settings.archive_batch_pause_ms / 1000)
+
+        self._archived += moved
+        self._runs += 1
+        self._last_run_at = time.time()
+        self._last_run_seconds = time.perf_counter() - start
+        if moved:
+            logger.info(f"已归档 {moved} 个完成超过 {settings.archive_after_days} 天的任务")
+        return moved
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.run_once()
+            except Exception as e:
+                logger.exception(f"Task archival failed: {e}")
+            interval = get_config_manager().load_sync().database.archive_interval_minutes
+            await asyncio.sleep(interval * 60)
+
+    def start(self) -> None:
+        """启动后台归档（幂等）"""
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+
+    def get_stats(self) -> Dict[str, object]:
+        """获取归档统计信息"""
+        return {
+            "running": self._worker is not None and not self._worker.done(),
+            "archived": self._archived,
+            "runs": self._runs,
+            "last_run_at": self._last_run_at,
+            "last_run_seconds": round(self._last_run_seconds, 3),
+        }
+
+
+_task_archiver: Optional[TaskArchiver] = None
+
+
+def get_task_archiver() -> TaskArchiver:
+    global _task_archiver
+    if _task_archiver is None:
+        _task_archiver = TaskArchiver()
+    return _task_archiver
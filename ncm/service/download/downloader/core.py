@@ -7,6 +7,7 @@ from pathlib import Path
 from typing import Optional
 
 import httpx
+from ncm.client.protocol.transport import TrafficClass, get_transport_registry
 from ncm.core.logging import get_logger
 from ncm.service.download.service.async_task_service import AsyncTaskService
 from ncm.service.download.models import get_task_cache_registry
@@ -34,14 +35,6 @@ class AudioDownloader:
         self._speed_samples = []
         self._speed_window = 3.0
         self._default_segment_size = 10 * 1024 * 1024  # 10MB
-        
-        # HTTP客户端配置
-        self._client = httpx.AsyncClient(
-            timeout=httpx.Timeout(30.0),
-            limits=httpx.Limits(max_connections=20, max_keepalive_connections=10),
-            http2=True,
-            follow_redirects=True
-        )
     
     def set_max_concurrent(self, n: int):
         """Update maximum concurrent downloads at runtime."""
@@ -53,6 +46,11 @@ class AudioDownloader:
         """Update default max threads per download at runtime."""
         n = max(1, int(n))
         self.max_threads = n
+
+    @staticmethod
+    async def _get_client() -> httpx.AsyncClient:
+        """音频 CDN 的共享客户端（连接池配置见 client.transports.audio）"""
+        return await get_transport_registry().get_client(TrafficClass.AUDIO)
     
 
 
@@ -148,7 +146,8 @@ class AudioDownloader:
                 'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
             }
             
-            async with self._client.stream('GET', url, headers=headers) as response:
+            client = await self._get_client()
+            async with client.stream('GET', url, headers=headers) as response:
                 if response.status_code == 403:
                     logger.warning(f"Download URL expired for task {task_id}")
                     registry = get_task_cache_registry()
@@ -269,7 +268,8 @@ class AudioDownloader:
                 'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
             }
             
-            async with self._client.stream('GET', url, headers=headers) as response:
+            client = await self._get_client()
+            async with client.stream('GET', url, headers=headers) as response:
                 if response.status_code not in [206, 200]:  # 206 Partial Content or 200 OK
                     return False
                 
@@ -322,6 +322,5 @@ class AudioDownloader:
             return 0
     
     async def close(self):
-        """关闭下载器并清理资源"""
-        await self._client.aclose()
+        """关闭下载器并清理资源（共享客户端由传输注册表在应用退出时统一关闭）"""
         logger.debug("Audio downloader closed")
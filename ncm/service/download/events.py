@@ -0,0 +1,75 @@
+"""In-process task event bus for download task state transitions."""
+
+import asyncio
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Dict, Iterator, Optional, Set
+
+from ncm.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+TERMINAL_STATUSES = ("completed", "failed", "cancelled")
+
+
+@dataclass(frozen=True, slots=True)
+class TaskEvent:
+    """任务事件；status 为新状态，progress_flag 为新置位的进度标志，finished 表示工作流已退出"""
+    task_id: int
+    status: Optional[str] = None
+    progress_flag: int = 0
+    finished: bool = False
+
+    @property
+    def terminal(self) -> bool:
+        return self.finished or self.status in TERMINAL_STATUSES
+
+
+class TaskEventBus:
+    """任务事件总线 - 状态流转在提交后发布，等待者按任务ID订阅
+
+    仅覆盖本进程内执行的任务；其他进程写入的状态变化仍需通过数据库获知。
+    """
+
+    def __init__(self):
+        self._subscribers: Dict[int, Set[asyncio.Queue]] = {}
+
+    @contextmanager
+    def subscribe(self, task_id: int) -> Iterator[asyncio.Queue]:
+        """订阅指定任务的事件，退出上下文时自动取消订阅"""
+        queue: asyncio.Queue = asyncio.Queue()
+        self._subscribers.setdefault(task_id, set()).add(queue)
+        try:
+            yield queue
+        finally:
+            queues = self._subscribers.get(task_id)
+            if queues is not None:
+                queues.discard(queue)
+                if not queues:
+                    del self._subscribers[task_id]
+
+    def publish(self, task_id: int, status: Optional[str] = None,
+                progress_flag: int = 0, finished: bool = False) -> None:
+        """发布任务事件；无订阅者时为空操作"""
+        queues = self._subscribers.get(task_id)
+        if not queues:
+            return
+        event = TaskEvent(task_id, status, progress_flag, finished)
+        for queue in queues:
+            queue.put_nowait(event)
+
+    def get_stats(self) -> Dict[str, int]:
+        return {
+            "subscribed_tasks": len(self._subscribers),
+            "subscribers": sum(len(q) for q in self._subscribers.values()),
+        }
+
+
+_task_event_bus: Optional[TaskEventBus] = None
+
+
+def get_task_event_bus() -> TaskEventBus:
+    global _task_event_bus
+    if _task_event_bus is None:
+        _task_event_bus = TaskEventBus()
+    return _task_event_bus
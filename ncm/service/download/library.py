@@ -0,0 +1,150 @@
+"""In-memory library index: music_id -> available qualities and file locations."""
+
+import asyncio
+import time
+from pathlib import Path
+from typing import Dict, Optional, Tuple, Union
+
+from ncm.client.apis.song.detail_models import QUALITY_INDEX, QUALITY_LIST
+from ncm.core.logging import get_logger
+from ncm.data.async_session import get_uow_factory
+from ncm.data.repositories.async_download_task_archive_repo import AsyncDownloadTaskArchiveRepository
+from ncm.data.repositories.async_download_task_repo import AsyncDownloadTaskRepository
+
+logger = get_logger(__name__)
+
+# (音质序号, 任务ID, 文件路径)；音质序号取 QUALITY_LIST 下标，越小音质越高
+LibraryEntry = Tuple[int, int, str]
+
+_UNKNOWN_RANK = len(QUALITY_LIST)
+
+
+def _key(music_id: Union[str, int]) -> Union[int, str]:
+    """网易云 music_id 均为数字，转为 int 作为键以节省内存"""
+    try:
+        return int(music_id)
+    except (TypeError, ValueError):
+        return str(music_id)
+
+
+def _rank(quality: Optional[str]) -> int:
+    return QUALITY_INDEX.get(quality or "", _UNKNOWN_RANK)
+
+
+def _satisfies(rank: int, target: int) -> bool:
+    """已有文件能否满足目标音质：只复用完全相同的音质，高音质文件的格式 / 码率与目标不同，不能替代"""
+    return rank == target and target != _UNKNOWN_RANK
+
+
+class LibraryIndex:
+    """曲库索引 - 启动时从数据库构建，任务完成/删除/重命名时增量维护
+
+    扫描时每首曲目只需一次字典查找即可判断是否已在曲库中，无需逐条查询数据库。
+    """
+
+    def __init__(self):
+        self._entries: Dict[Union[int, str], Tuple[LibraryEntry, ...]] = {}
+        self._lock = asyncio.Lock()
+        self._loaded = False
+        self._built_at: Optional[float] = None
+        self._build_seconds = 0.0
+        self._hits = 0
+        self._misses = 0
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded
+
+    async def load(self) -> int:
+        """从数据库全量构建索引，返回收录的文件数"""
+        async with self._lock:
+            start = time.perf_counter()
+            entries: Dict[Union[int, str], Tuple[LibraryEntry, ...]] = {}
+            count = 0
+            repo = AsyncDownloadTaskRepository()
+            archive_repo = AsyncDownloadTaskArchiveRepository()
+            async with get_uow_factory()() as uow:
+                # 已归档的任务同样收录，其文件仍可用于去重
+                for rows in (repo.stream_completed_files(uow.session), archive_repo.stream_files(uow.session)):
+                    async for task_id, music_id, quality, file_path in rows:
+                        key = _key(music_id)
+                        entries[key] = entries.get(key, ()) + ((_rank(quality), task_id, file_path),)
+                        count += 1
+            self._entries = entries
+            self._loaded = True
+            self._built_at = time.time()
+            self._build_seconds = time.perf_counter() - start
+        logger.debug(f"Library index built: {len(entries)} tracks, {count} files in {self._build_seconds:.3f}s")
+        return count
+
+    def invalidate(self) -> None:
+        """标记索引过期（如整个作业被删除），下次使用前从数据库重建"""
+        self._loaded = False
+
+    async def ensure_loaded(self) -> None:
+        if not self._loaded:
+            await self.load()
+
+    def add(self, music_id: str, quality: Optional[str], task_id: int, file_path: str) -> None:
+        """收录（或更新）一个已完成任务的文件"""
+        key = _key(music_id)
+        kept = tuple(e for e in self._entries.get(key, ()) if e[1] != task_id)
+        self._entries[key] = kept + ((_rank(quality), task_id, file_path),)
+
+    def discard(self, music_id: str, task_id: int) -> None:
+        """移除一个任务的文件"""
+        key = _key(music_id)
+        kept = tuple(e for e in self._entries.get(key, ()) if e[1] != task_id)
+        if kept:
+            self._entries[key] = kept
+        else:
+            self._entries.pop(key, None)
+
+    def lookup(self, music_id: str, quality: str) -> Optional[Tuple[int, str]]:
+        """
+        查找音质与 quality 完全相同的已有文件（是否可复用还需调用方比较作业的嵌入选项）
+
+        Returns:
+            (任务ID, 文件路径)，未命中返回 None
+        """
+        entries = self._entries.get(_key(music_id))
+        target = _rank(quality)
+        best: Optional[LibraryEntry] = None
+        for entry in entries or ():
+            if _satisfies(entry[0], target):
+                best = entry
+                break
+        if best is None:
+            self._misses += 1
+            return None
+        if not Path(best[2]).exists():
+            # 文件已在库外被删除，惰性清理
+            self.discard(music_id, best[1])
+            self._misses += 1
+            return None
+        self._hits += 1
+        return best[1], best[2]
+
+    def get_stats(self) -> Dict[str, object]:
+        """获取索引统计信息"""
+        lookups = self._hits + self._misses
+        return {
+            "loaded": self._loaded,
+            "tracks": len(self._entries),
+            "files": sum(len(v) for v in self._entries.values()),
+            "hits": self._hits,
+            "misses": self._misses,
+            "hit_rate": round(self._hits / lookups, 4) if lookups else 0.0,
+            "built_at": self._built_at,
+            "build_seconds": round(self._build_seconds, 3),
+        }
+
+
+_library_index: Optional[LibraryIndex] = None
+
+
+def get_library_index() -> LibraryIndex:
+    global _library_index
+    if _library_index is None:
+        _library_index = LibraryIndex()
+    return _library_index
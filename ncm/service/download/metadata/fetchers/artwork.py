@@ -1,7 +1,7 @@
 """Artwork fetcher implementation."""
 
-import httpx
 from typing import Optional
+from ncm.client.protocol.transport import TrafficClass, get_transport_registry
 from ncm.core.logging import get_logger
 
 logger = get_logger(__name__)
@@ -11,11 +11,7 @@ class ArtworkFetcher:
     """封面图片获取器"""
     
     def __init__(self):
-        """初始化封面获取器"""
-        self._client = httpx.AsyncClient(
-            timeout=httpx.Timeout(30.0),
-            follow_redirects=True
-        )
+        """初始化封面获取器；使用图片 CDN 的共享客户端（连接池配置见 client.transports.image）"""
     
     async def fetch(self, artwork_url: str) -> Optional[bytes]:
         """
@@ -38,7 +34,8 @@ class ArtworkFetcher:
                 'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
             }
             
-            response = await self._client.get(artwork_url, headers=headers)
+            client = await get_transport_registry().get_client(TrafficClass.IMAGE)
+            response = await client.get(artwork_url, headers=headers)
             
             if response.status_code != 200:
                 logger.warning(f"Failed to fetch artwork: HTTP {response.status_code}")
@@ -59,5 +56,4 @@ class ArtworkFetcher:
             return None
     
     async def close(self):
-        """关闭HTTP客户端"""
-        await self._client.aclose()
\ No newline at end of file
+        """共享客户端由传输注册表在应用退出时统一关闭"""
\ No newline at end of file
@@ -2,11 +2,19 @@
 from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 import asyncio
+from pydantic import ValidationError
 from ncm.core.logging import get_logger
 from ncm.core.time import UTC_CLOCK
-from ncm.client.apis.song.detail_models import SongDetailResponseOnlyOne, Song, Privilege
+from ncm.client.apis.song.detail_models import (
+    PRIVILEGE_LITE_LIST,
+    SONG_LITE_LIST,
+    Privilege,
+    Song,
+    SongDetailLite,
+    SongDetailResponseOnlyOne,
+)
 logger = get_logger(__name__)
 
 @dataclass
@@ -78,57 +86,66 @@ class DownloadDataCache:
     def __init__(self, task_id: int, music_id: str):
         self.task_id = task_id
         self.music_id = music_id
-        self.song_detail: Optional[SongDetailResponseOnlyOne] = None
+        # 精简投影，只含下载流水线读取的字段；完整字段见 load_full_song_detail
+        self.song_detail: Optional[SongDetailLite] = None
         self.play_url: Optional[Dict[str, Any]] = None
         self._detail_ts: Optional[datetime] = None
         self._url_ts: Optional[datetime] = None
         self._lock = asyncio.Lock()
-        
-    async def set_song_detail_detailed_tracks(self, tracks: Dict[str, Any]):
+
+    async def set_song_detail(self, detail: SongDetailLite) -> SongDetailLite:
         async with self._lock:
-            song = tracks.get("song") or []
-            if not song:
-                raise RuntimeError("tracks.song invalid")
-            song = Song.model_validate(song)
-            
-            privilege = tracks.get("privilege") or []
-            if not privilege:
-                raise RuntimeError("tracks.privilege invalid")
-            privilege = Privilege.model_validate(privilege)
-            
-            self.song_detail = SongDetailResponseOnlyOne(
-                song=song,
-                privilege=privilege,
-                code=tracks.get("code") or 200
-            )
+            self.song_detail = detail
             self._detail_ts = UTC_CLOCK.now()
-        return self.song_detail
+        return detail
 
-    async def ensure_song_detail(self, loader, force: bool = False) -> SongDetailResponseOnlyOne:
+    async def set_song_detail_detailed_tracks(self, tracks: Dict[str, Any]):
+        song = tracks.get("song") or []
+        if not song:
+            raise RuntimeError("tracks.song invalid")
+        privilege = tracks.get("privilege") or []
+        if not privilege:
+            raise RuntimeError("tracks.privilege invalid")
+        return await self.set_song_detail(SongDetailLite(
+            song=SONG_LITE_LIST.validate_python([song])[0],
+            privilege=PRIVILEGE_LITE_LIST.validate_python([privilege])[0],
+            code=tracks.get("code") or 200
+        ))
+
+    async def ensure_song_detail(self, loader, force: bool = False) -> SongDetailLite:
         async with self._lock:
             if self.song_detail is None or force:
-                resp = await loader(ids=self.music_id)
-                if not getattr(resp, "success", False):
-                    raise RuntimeError("song_detail request failed")
-                body = getattr(resp, "body", {})
-                songs = body.get("songs") or []
-                if not songs:
-                    raise RuntimeError("song_detail.songs invalid")
-                song = Song.model_validate(songs[0])
-                
-                privileges = body.get("privileges") or []
-                if not privileges:
-                    raise RuntimeError("song_detail.privileges invalid")
-                privilege = Privilege.model_validate(privileges[0])
-                
-                self.song_detail = SongDetailResponseOnlyOne(
-                    song=song,
-                    privilege=privilege,
-                    code=resp.body.get("code") or 200
+                song, privilege, code = await self._load_song_detail(loader)
+                self.song_detail = SongDetailLite(
+                    song=SONG_LITE_LIST.validate_python([song])[0],
+                    privilege=PRIVILEGE_LITE_LIST.validate_python([privilege])[0],
+                    code=code
                 )
                 self._detail_ts = UTC_CLOCK.now()
             return self.song_detail
 
+    async def load_full_song_detail(self, loader) -> SongDetailResponseOnlyOne:
+        """按需加载完整的 Song / Privilege 模型（不缓存在任务上；上游响应由客户端响应缓存复用）"""
+        song, privilege, code = await self._load_song_detail(loader)
+        return SongDetailResponseOnlyOne(
+            song=Song.model_validate(song),
+            privilege=Privilege.model_validate(privilege),
+            code=code
+        )
+
+    async def _load_song_detail(self, loader) -> Tuple[Dict[str, Any], Dict[str, Any], int]:
+        resp = await loader(ids=self.music_id)
+        if not getattr(resp, "success", False):
+            raise RuntimeError("song_detail request failed")
+        body = getattr(resp, "body", {})
+        songs = body.get("songs") or []
+        if not songs:
+            raise RuntimeError("song_detail.songs invalid")
+        privileges = body.get("privileges") or []
+        if not privileges:
+            raise RuntimeError("song_detail.privileges invalid")
+        return songs[0], privileges[0], body.get("code") or 200
+
     async def ensure_play_url(self, loader, level: Optional[str] = None, force: bool = False) -> Dict[str, Any]:
         async with self._lock:
             if self.play_url is None or force:
@@ -172,6 +189,49 @@ class TaskCacheRegistry:
     def get(self, task_id: int) -> Optional[DownloadDataCache]:
         return self._caches.get(task_id)
 
+    async def hydrate_song_details(self, tasks: List[Any], tracks: Dict[str, Dict[str, Any]]) -> int:
+        """批量注入歌曲详情；tasks 需有 id 与 music_id，tracks 为 music_id -> {"song", "privilege", "code"}。
+
+        整批一次校验；批量校验失败时逐条校验并跳过无效项。
+        未注入详情的任务（缺少详情或校验失败）在下载前由 ensure_song_detail 单独拉取。返回注入的任务数。
+        """
+        pairs = []
+        for task in tasks:
+            track = tracks.get(task.music_id) or {}
+            if track.get("song") and track.get("privilege"):
+                pairs.append((task, track))
+        if not pairs:
+            return 0
+
+        try:
+            songs = SONG_LITE_LIST.validate_python([track["song"] for _, track in pairs])
+            privileges = PRIVILEGE_LITE_LIST.validate_python([track["privilege"] for _, track in pairs])
+            details = [
+                SongDetailLite(song=song, privilege=privilege, code=track.get("code") or 200)
+                for song, privilege, (_, track) in zip(songs, privileges, pairs)
+            ]
+        except ValidationError:
+            details = []
+            for task, track in pairs:
+                try:
+                    details.append(SongDetailLite(
+                        song=SONG_LITE_LIST.validate_python([track["song"]])[0],
+                        privilege=PRIVILEGE_LITE_LIST.validate_python([track["privilege"]])[0],
+                        code=track.get("code") or 200
+                    ))
+                except ValidationError as e:
+                    logger.warning(f"Invalid song detail for {task.music_id}, fetching on demand: {e}")
+                    details.append(None)
+
+        hydrated = 0
+        for (task, _), detail in zip(pairs, details):
+            if detail is None:
+                continue
+            cache = await self.get_or_create(task.id, task.music_id)
+            await cache.set_song_detail(detail)
+            hydrated += 1
+        return hydrated
+
     async def prefetch(self, task_id: int, music_id: str) -> DownloadDataCache:
         """提前准备数据，用于刚启动时"""
         cache = await self.get_or_create(task_id, music_id)
@@ -1,30 +1,62 @@
 """Core download orchestrator implementation."""
 
+import base64
+import json
 import logging
 import asyncio
+import time
+from datetime import datetime
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple, Union
 
 from ncm.data.models.download_task import DownloadTask
+from ncm.data.models.download_task_archive import DownloadTaskArchive
 from ncm.data.models.download_job import DownloadJob
 from ncm.data.repositories.async_download_task_repo import AsyncDownloadTaskRepository
 from ncm.data.repositories.async_download_job_repo import AsyncDownloadJobRepository
+from ncm.data.repositories.async_download_task_archive_repo import AsyncDownloadTaskArchiveRepository
 from ncm.core.path import sanitize_filename
 from ncm.service.download.service import AsyncJobService
-from ncm.data.async_session import get_uow_factory
+from ncm.service.download.service.task_write_queue import get_task_write_queue
+from ncm.data.async_session import get_read_uow_factory, get_uow_factory
 from ncm.service.download.models import get_task_cache_registry
+from ncm.service.download.library import get_library_index
+from ncm.service.download.archive import get_task_archiver
+from ncm.service.download.events import get_task_event_bus, TERMINAL_STATUSES
 from ncm.core.time import UTC_CLOCK
 from ..downloader import AudioDownloader
 from ..metadata import MetadataProcessor
 from ..storage import StorageManager
 from .workflow import WorkflowEngine
 from .task_manager import TaskManager
+from .inflight import InflightRegistry, InflightKey
 from ncm.core.logging import get_logger
 
 
 
 logger = get_logger(__name__)
 
+# 非本进程执行的任务回退到数据库轮询的间隔（秒）
+_WAIT_POLL_INTERVAL = 0.1
+_MONITOR_POLL_INTERVAL = 0.5
+# 任务搜索总数缓存有效期（秒）
+_SEARCH_TOTAL_TTL = 30.0
+
+
+def _encode_cursor(task: DownloadTask) -> str:
+    """把 (created_at, id) 编码为不透明游标"""
+    raw = json.dumps([task.created_at.isoformat(), task.id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, task_id = json.loads(raw)
+        return datetime.fromisoformat(created_at), int(task_id)
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
 
 class DownloadOrchestrator:
     """下载编排器 - 协调整个下载流程"""
@@ -60,10 +92,15 @@ class DownloadOrchestrator:
             storage_manager=self.storage_manager
         )
         self.task_manager = TaskManager()
+        # 同一 (music_id, 音质) 的在途下载合并（跨作业）
+        self.inflight = InflightRegistry()
 
         # 异步数据库单元与仓库（统一管理的 DB URL）
         self.uow_factory = get_uow_factory()
+        # 只读连接池：列表、搜索与统计等快照读取，不与写入方争用连接（可能滞后于写入队列）
+        self.read_uow_factory = get_read_uow_factory()
         self.task_repo = AsyncDownloadTaskRepository()
+        self.archive_repo = AsyncDownloadTaskArchiveRepository()
         self.job_repo = AsyncDownloadJobRepository()
 
         self.job_service = AsyncJobService()
@@ -72,6 +109,8 @@ class DownloadOrchestrator:
         self._song_controller = None
         self._playlist_controller = None
         self._copy_locks: dict[str, asyncio.Lock] = {}
+        # 按过滤条件缓存的搜索总数 {(job_id, status, keyword): (total, expires_at)}
+        self._search_totals: Dict[tuple, Tuple[int, float]] = {}
     
     @property
     def song_controller(self):
@@ -105,7 +144,8 @@ class DownloadOrchestrator:
             任务ID
         """
         async with self.uow_factory() as uow:
-            existing_task = await self.task_repo.get_by_job_and_music(uow.session, job_id, music_id)
+            existing_task = await self.task_repo.get_by_job_and_music(uow.session, job_id, music_id) \
+                or await self.archive_repo.get_by_job_and_music(uow.session, job_id, music_id)
             if existing_task:
                 logger.debug(f"Task already exists for music {music_id} in job {job_id}")
                 return existing_task.id
@@ -119,15 +159,22 @@ class DownloadOrchestrator:
         logger.debug(f"Submitted download task {task.id} for music_id: {music_id}")
         return task.id
 
-    async def get_task(self, task_id: int) -> Optional[DownloadTask]:
-        """获取任务状态"""
+    async def _get_task_any(self, session, task_id: int) -> Optional[Union[DownloadTask, DownloadTaskArchive]]:
+        """按ID查找任务，download_task 中没有时回退到归档表"""
+        task = await self.task_repo.get_by_id(session, task_id)
+        if task is None:
+            task = await self.archive_repo.get_by_id(session, task_id)
+        return task
+
+    async def get_task(self, task_id: int) -> Optional[Union[DownloadTask, DownloadTaskArchive]]:
+        """获取任务状态（含已归档任务）"""
         async with self.uow_factory() as uow:
-            return await self.task_repo.get_by_id(uow.session, task_id)
+            return await self._get_task_any(uow.session, task_id)
 
     async def get_task_dict(self, task_id: int) -> Optional[dict]:
         """获取任务字典数据 (避免detached instance问题)"""
         async with self.uow_factory() as uow:
-            task = await self.task_repo.get_by_id(uow.session, task_id)
+            task = await self._get_task_any(uow.session, task_id)
             return task.to_dict() if task else None
 
     async def cancel_task(self, task_id: int) -> bool:
@@ -137,9 +184,10 @@ class DownloadOrchestrator:
 
         async with self.uow_factory() as uow:
             task = await self.task_repo.update_status(uow.session, task_id, "cancelled")
-            if task:
-                logger.debug(f"Cancelled task {task_id}")
-                return True
+        if task:
+            get_task_event_bus().publish(task_id, status="cancelled")
+            logger.debug(f"Cancelled task {task_id}")
+            return True
 
         return memory_cancelled
 
@@ -158,28 +206,28 @@ class DownloadOrchestrator:
     async def list_active_tasks(self) -> Dict[int, DownloadTask]:
         """列出活跃任务"""
         async with self.uow_factory() as uow:
-            tasks_downloading = await self.task_repo.get_by_status(uow.session, "downloading")
-            tasks_processing = await self.task_repo.get_by_status(uow.session, "processing")
-            active_tasks = tasks_downloading + tasks_processing
+            active_tasks = await self.task_repo.get_by_statuses(uow.session, ["downloading", "processing"])
             return {task.id: task for task in active_tasks}
 
     async def list_active_tasks_dict(self) -> Dict[int, dict]:
         """列出活跃任务字典数据 (避免detached instance问题)"""
-        async with self.uow_factory() as uow:
-            tasks_downloading = await self.task_repo.get_by_status(uow.session, "downloading")
-            tasks_processing = await self.task_repo.get_by_status(uow.session, "processing")
-            active_tasks = tasks_downloading + tasks_processing
+        async with self.read_uow_factory() as uow:
+            active_tasks = await self.task_repo.get_by_statuses(uow.session, ["downloading", "processing"])
             return {task.id: task.to_dict() for task in active_tasks}
 
-    async def list_all_tasks(self) -> Dict[int, DownloadTask]:
-        """列出所有任务"""
-        async with self.uow_factory() as uow:
-            # SQLAlchemy 2.0 async 不支持同步的 session.query
-            tasks = await self.task_repo.get_by_status(uow.session, "pending")
-            tasks += await self.task_repo.get_by_status(uow.session, "downloading")
-            tasks += await self.task_repo.get_by_status(uow.session, "processing")
-            tasks += await self.task_repo.get_by_status(uow.session, "completed")
-            tasks += await self.task_repo.get_by_status(uow.session, "failed")
+    async def list_all_tasks(self, after_id: int = 0, limit: int = 500) -> Dict[int, DownloadTask]:
+        """
+        分页列出所有任务 (按 id 键集分页)
+
+        Args:
+            after_id: 上一页最后一个任务ID，首页传 0
+            limit: 每页数量
+
+        Returns:
+            {任务ID: 任务}，按 id 升序；不足 limit 条表示已到末页
+        """
+        async with self.read_uow_factory() as uow:
+            tasks = await self.task_repo.list_page(uow.session, after_id=after_id, limit=limit)
             return {task.id: task for task in tasks}
 
     async def search_tasks(self,
@@ -187,23 +235,68 @@ class DownloadOrchestrator:
                           status: Optional[str] = None,
                           keyword: Optional[str] = None,
                           limit: int = 20,
-                          offset: int = 0) -> Dict[str, Any]:
-        """搜索任务 (支持分页)"""
-        async with self.uow_factory() as uow:
-            tasks, total = await self.task_repo.search(
-                uow.session,
-                job_id=job_id,
-                status=status,
-                keyword=keyword,
-                limit=limit,
-                offset=offset
-            )
-            return {
+                          offset: int = 0,
+                          cursor: Optional[str] = None,
+                          with_total: bool = True,
+                          archived: bool = False) -> Dict[str, Any]:
+        """
+        搜索任务 (支持分页)
+
+        传入 cursor 时使用 (created_at, id) 键集分页，空字符串表示第一页，offset 被忽略且不出现在结果中；
+        返回的 next_cursor 为 None 表示已到末页。总数按过滤条件缓存 _SEARCH_TOTAL_TTL 秒，
+        with_total=False 时不计算总数（total 为 None）。archived=True 时搜索归档表。
+        """
+        repo = self.archive_repo if archived else self.task_repo
+        async with self.read_uow_factory() as uow:
+            total = await self._search_total(uow.session, job_id, status, keyword, archived) if with_total else None
+            if cursor is None:
+                tasks, _ = await repo.search(
+                    uow.session,
+                    job_id=job_id,
+                    status=status,
+                    keyword=keyword,
+                    limit=limit,
+                    offset=offset,
+                    with_total=False
+                )
+                next_cursor = None
+            else:
+                tasks = await repo.search_after(
+                    uow.session,
+                    job_id=job_id,
+                    status=status,
+                    keyword=keyword,
+                    limit=limit + 1,
+                    after=_decode_cursor(cursor) if cursor else None
+                )
+                has_more = len(tasks) > limit
+                tasks = tasks[:limit]
+                next_cursor = _encode_cursor(tasks[-1]) if has_more and tasks else None
+            result = {
                 "tasks": [task.to_dict() for task in tasks],
                 "total": total,
                 "limit": limit,
-                "offset": offset
             }
+            # 键集分页没有 offset 的概念，只返回 next_cursor
+            if cursor is None:
+                result["offset"] = offset
+            result["next_cursor"] = next_cursor
+            return result
+
+    async def _search_total(self, session, job_id: Optional[int], status: Optional[str],
+                            keyword: Optional[str], archived: bool = False) -> int:
+        """按过滤条件缓存的搜索总数"""
+        key = (job_id, status or None, keyword or None, archived)
+        now = time.monotonic()
+        cached = self._search_totals.get(key)
+        if cached is not None and cached[1] > now:
+            return cached[0]
+        repo = self.archive_repo if archived else self.task_repo
+        total = await repo.count_search(session, job_id, status, keyword)
+        if len(self._search_totals) >= 256:
+            self._search_totals = {k: v for k, v in self._search_totals.items() if v[1] > now}
+        self._search_totals[key] = (total, now + _SEARCH_TOTAL_TTL)
+        return total
 
     async def create_download_job(self,
                                  job_name: str,
@@ -281,9 +374,28 @@ class DownloadOrchestrator:
             return job.to_dict() if job else None
 
     async def delete_download_job(self, job_id: int) -> bool:
+        """删除作业及其全部任务（含已归档任务），避免曲库索引与搜索指向已删除的作业"""
+        # 先落库排队中的写入，避免删除后又被写回
+        await get_task_write_queue().flush()
         async with self.uow_factory() as uow:
-            result = await self.job_repo.delete(uow.session, job_id)
-            return result
+            if not await self.job_repo.get_by_id(uow.session, job_id):
+                return False
+            tasks = await self.task_repo.delete_by_job(uow.session, job_id)
+            archived = await self.archive_repo.delete_by_job(uow.session, job_id)
+            await self.job_repo.delete(uow.session, job_id)
+        self._search_totals.clear()
+        get_library_index().invalidate()
+        logger.debug(f"Job {job_id} deleted with {tasks} tasks and {archived} archived tasks")
+        return True
+
+    async def reconcile_job_counters(self, job_id: Optional[int] = None) -> list[dict]:
+        """重新计算作业任务计数并修正漂移（计数平时由数据库触发器增量维护）"""
+        await get_task_write_queue().flush()
+        async with self.uow_factory() as uow:
+            repaired = await self.job_repo.reconcile_counters(uow.session, job_id)
+        if repaired:
+            logger.info(f"Reconciled task counters for {len(repaired)} job(s)")
+        return repaired
 
     async def list_download_jobs(self) -> list[DownloadJob]:
         """列出所有下载作业"""
@@ -322,9 +434,6 @@ class DownloadOrchestrator:
                 logger.warning(f"Failed to submit task for music {music_id}: {e}")
                 continue
 
-        async with self.uow_factory() as uow:
-            await self.job_repo.update_statistics(uow.session, job_id, total_tasks=len(task_ids))
-
         logger.debug(f"Submitted {len(task_ids)} tasks for job {job_id}")
         return task_ids
 
@@ -347,6 +456,11 @@ class DownloadOrchestrator:
                 await self.cancel_task(existing_task.id)
                 await self.task_repo.delete(uow.session, existing_task.id)
                 logger.debug(f"Removed existing task {existing_task.id} for quality upgrade")
+            else:
+                archived = await self.archive_repo.get_by_job_and_music(uow.session, job_id, music_id)
+                if archived:
+                    await self.archive_repo.delete(uow.session, archived.id)
+                    logger.debug(f"Removed archived task {archived.id} for quality upgrade")
             # job = await self.job_repo.get_by_id(uow.session, job_id)
             # if job and job.target_quality != new_target_quality:
                 # await self.job_repo.update(uow.session, job_id, target_quality=new_target_quality)
@@ -395,7 +509,8 @@ class DownloadOrchestrator:
                     # 重新提交任务
                     registry = get_task_cache_registry()
                     await registry.prefetch(task.id, task.music_id)
-                    asyncio.create_task(self._execute_download_workflow(task.id, job.target_quality))
+                    future = asyncio.create_task(self._execute_download_workflow(task.id, job.target_quality))
+                    self.task_manager.register_task(task.id, future)
                     restarted_tasks.append(task.id)
 
                 except Exception as e:
@@ -413,23 +528,26 @@ class DownloadOrchestrator:
         """获取统计信息"""
         memory_stats = self.task_manager.get_stats()
 
-        async with self.uow_factory() as uow:
-            downloading = await self.task_repo.get_by_status(uow.session, "downloading")
-            processing = await self.task_repo.get_by_status(uow.session, "processing")
-            completed = await self.task_repo.get_by_status(uow.session, "completed")
-            failed = await self.task_repo.get_by_status(uow.session, "failed")
-            total_tasks = len(downloading) + len(processing) + len(completed) + len(failed)
-            active_tasks = len(downloading) + len(processing)
-            completed_tasks = len(completed)
-            failed_tasks = len(failed)
+        async with self.read_uow_factory() as uow:
+            counts = await self.task_repo.count_by_status(uow.session)
+            archived_tasks = await self.archive_repo.count_search(uow.session)
+        active_tasks = counts.get("downloading", 0) + counts.get("processing", 0)
+        completed_tasks = counts.get("completed", 0) + archived_tasks
+        failed_tasks = counts.get("failed", 0)
+        total_tasks = active_tasks + completed_tasks + failed_tasks
 
         return {
             'memory': memory_stats,
+            'inflight': self.inflight.get_stats(),
+            'events': get_task_event_bus().get_stats(),
+            'write_queue': get_task_write_queue().get_stats(),
+            'archive': get_task_archiver().get_stats(),
             'database': {
                 'total_tasks': total_tasks,
                 'active_tasks': active_tasks,
                 'completed_tasks': completed_tasks,
-                'failed_tasks': failed_tasks
+                'failed_tasks': failed_tasks,
+                'archived_tasks': archived_tasks
             }
         }
     
@@ -458,24 +576,56 @@ class DownloadOrchestrator:
         Returns:
             完成的任务对象，如果任务不存在则返回None
         """
-        while True:
-            async with self.uow_factory() as uow:
-                task = await self.task_repo.get_by_id(uow.session, task_id)
+        # 先订阅再读库，避免错过两者之间发布的事件
+        with get_task_event_bus().subscribe(task_id) as events:
+            while True:
+                async with self.uow_factory() as uow:
+                    task = await self.task_repo.get_by_id(uow.session, task_id)
                 if not task:
                     return None
-                if task.status in ["completed", "failed", "cancelled"]:
+                if task.status in TERMINAL_STATUSES:
                     return task
-            await asyncio.sleep(0.1)
+                await self._next_task_event(task_id, events, _WAIT_POLL_INTERVAL, terminal_only=True)
+
+    async def _next_task_event(self, task_id: int, events: asyncio.Queue,
+                               poll_interval: float, terminal_only: bool = False) -> None:
+        """
+        等待任务的下一个事件
+
+        本进程执行中的任务只等事件总线；其他任务（其他进程、未托管）以 poll_interval 回退到数据库轮询。
+        """
+        while True:
+            if task_id in self.task_manager.get_active_task_ids():
+                event = await events.get()
+            else:
+                try:
+                    event = await asyncio.wait_for(events.get(), timeout=poll_interval)
+                except asyncio.TimeoutError:
+                    return
+            if not terminal_only or event.terminal:
+                return
 
 
     async def _execute_download_workflow(self, task_id: int, target_quality: str):
         """执行下载工作流"""
+        inflight_key: Optional[InflightKey] = None
         try:
             logger.debug(f"Starting download workflow for task {task_id}")
 
             # 更新任务状态为下载中
             async with self.uow_factory() as uow:
-                await self.task_repo.update_status(uow.session, task_id, "downloading")
+                await self.task_repo.update_status(uow.session, task_id, "downloading", returning=False)
+            get_task_event_bus().publish(task_id, status="downloading")
+
+            # 0. 同一 (music_id, 音质) 已有在途下载时，等待其完成并复用成品文件
+            key = await self._resolve_inflight_key(task_id, target_quality)
+            if key is not None:
+                while (leader := self.inflight.acquire(key, task_id)) is not None:
+                    # shield: 当前任务被取消时不影响 leader 的 Future
+                    source_task_id = await asyncio.shield(leader)
+                    if source_task_id is not None and await self._complete_from_source(task_id, source_task_id):
+                        return
+                inflight_key = key
 
             # 1. 准备下载信息
             await self._prepare_download_info(task_id, target_quality)
@@ -489,16 +639,109 @@ class DownloadOrchestrator:
             else:
                 logger.info(f"任务ID：{task_id} 下载失败，原因: {str(e)}")
             async with self.uow_factory() as uow:
-                await self.task_repo.update_status(uow.session, task_id, "failed", str(e))
+                await self.task_repo.update_status(uow.session, task_id, "failed", str(e), returning=False)
+            get_task_event_bus().publish(task_id, status="failed")
         finally:
+            # 先落库写入队列中的未写入更新，再读取最终状态
+            write_queue = get_task_write_queue()
+            if write_queue.has_pending(task_id):
+                try:
+                    await write_queue.flush()
+                except Exception as e:
+                    logger.warning(f"Failed to flush pending updates for task {task_id}: {e}")
+
             # 更新完成时间
+            final_status = None
             async with self.uow_factory() as uow:
                 task = await self.task_repo.get_by_id(uow.session, task_id)
                 if task:
-                    await self.task_repo.update(uow.session, task_id, completed_at=UTC_CLOCK.now())
+                    final_status = task.status
+                    if final_status == "completed" and task.file_path:
+                        get_library_index().add(task.music_id, task.quality, task_id, task.file_path)
+                    await self.task_repo.update(uow.session, task_id, returning=False, completed_at=UTC_CLOCK.now())
 
+            if inflight_key is not None:
+                self.inflight.release(inflight_key, task_id, task_id if final_status == "completed" else None)
             get_task_cache_registry().clear(task_id)
             self.task_manager.mark_completed(task_id)
+            get_task_event_bus().publish(task_id, status=final_status, finished=True)
+
+    async def _resolve_inflight_key(self, task_id: int, target_quality: str) -> Optional[InflightKey]:
+        """根据歌曲权限解析实际下载音质作为在途合并键（复用详情缓存，不请求播放链接）"""
+        async with self.uow_factory() as uow:
+            task = await self.task_repo.get_by_id(uow.session, task_id)
+            if not task:
+                raise RuntimeError(f"Task not found: {task_id}")
+            music_id = task.music_id
+        cache = await get_task_cache_registry().get_or_create(task_id, music_id)
+        detail = await cache.ensure_song_detail(
+            self.song_controller.song_detail,
+            force=(cache.song_detail is None)
+        )
+        down_level = detail.privilege.resolve_dl_level(target_quality)
+        if down_level == 'none':
+            return None
+        return music_id, down_level
+
+    async def _complete_from_source(self, task_id: int, source_task_id: int) -> bool:
+        """复制来源任务的成品文件并直接完成当前任务；失败返回 False 由调用方自行下载"""
+        target_path: Optional[Path] = None
+        try:
+            async with self.uow_factory() as uow:
+                source = await self._get_task_any(uow.session, source_task_id)
+                if not source or source.status != "completed" or not source.file_path \
+                        or not Path(source.file_path).exists():
+                    return False
+                task = await self.task_repo.get_by_id(uow.session, task_id)
+                if not task:
+                    return False
+                job = await self.job_repo.get_by_id(uow.session, task.job_id)
+                source_job = await self.job_repo.get_by_id(uow.session, source.job_id)
+                # 嵌入选项不同时成品文件的标签不同，不能直接复用，由调用方自行下载
+                if not job or not source_job or not self.storage_manager.can_share_inode(source_job, job):
+                    return False
+                task = await self.task_repo.update(uow.session, task_id,
+                    music_title=source.music_title,
+                    music_artist=source.music_artist,
+                    music_album=source.music_album,
+                    quality=source.quality,
+                    file_format=source.file_format,
+                    file_size=source.file_size,
+                    started_at=UTC_CLOCK.now()
+                )
+                final_path = self.storage_manager.unique_path(
+                    self.storage_manager._generate_final_path(task, job), task_id)
+                # 整文件复制可能耗时数秒，放到线程中执行以免阻塞事件循环
+                link_mode = await asyncio.to_thread(
+                    self.storage_manager.duplicate, source.file_path, final_path, allow_hardlink=True
+                )
+                target_path = final_path
+
+                await self.task_repo.update(uow.session, task_id, returning=False,
+                    status="completed",
+                    file_path=str(target_path),
+                    file_name=target_path.name,
+                    link_mode=link_mode,
+                    progress_flags=source.progress_flags,
+                    completed_at=UTC_CLOCK.now(),
+                    error_message=json.dumps({
+                        "copied_from": {
+                            "job_id": source.job_id,
+                            "task_id": source.id,
+                            "file_path": source.file_path,
+                        }
+                    }, ensure_ascii=False)
+                )
+                get_library_index().add(task.music_id, task.quality, task_id, str(target_path))
+            get_task_event_bus().publish(task_id, status="completed")
+            logger.debug(f"Task {task_id} completed from in-flight task {source_task_id}: {target_path}")
+            return True
+        except Exception as e:
+            # 回滚由 UnitOfWork 处理；清理已复制的残留文件
+            if target_path is not None:
+                target_path.unlink(missing_ok=True)
+            logger.warning(f"Coalesced copy failed for task {task_id} (source {source_task_id}): {e}")
+            return False
 
     async def _prepare_download_info(self, task_id: int, target_quality: str):
         logger.debug(f"Preparing download info for task {task_id}")
@@ -520,7 +763,7 @@ class DownloadOrchestrator:
             artists = [artist.name or "Unknown Artist" for artist in song.ar or []]
             artist = ", ".join(artists) if artists else "Unknown Artist"
 
-            await self.task_repo.update(uow.session, task_id,
+            await self.task_repo.update(uow.session, task_id, returning=False,
                 music_title=title,
                 music_artist=artist,
                 music_album=song.al.name or "Unknown Album",
@@ -549,7 +792,7 @@ class DownloadOrchestrator:
             # 使用包含task_id的唯一文件名以避免并发下载时的临时文件冲突
             filename = f"{safe_artist} - {safe_title}_{task_id}.{file_format}"
             temp_file_path = str(self.downloads_dir / filename)
-            await self.task_repo.update(uow.session, task_id,
+            await self.task_repo.update(uow.session, task_id, returning=False,
                 quality=url_data["level"],
                 file_path=temp_file_path,
                 file_name=filename,
@@ -595,23 +838,25 @@ class DownloadOrchestrator:
         )
 
     async def _monitor_progress(self, task_id: int, progress_callback: callable):
-        """监控任务进度"""
-        while True:
-            async with self.uow_factory() as uow:
-                task = await self.task_repo.get_by_id(uow.session, task_id)
+        """监控任务进度 (每个状态/进度事件回调一次)"""
+        with get_task_event_bus().subscribe(task_id) as events:
+            while True:
+                async with self.uow_factory() as uow:
+                    task = await self.task_repo.get_by_id(uow.session, task_id)
                 if not task:
                     break
                 try:
                     progress_callback(task)
                 except Exception as e:
                     logger.warning(f"Progress callback error: {e}")
-                if task.status in ["completed", "failed", "cancelled"]:
+                if task.status in TERMINAL_STATUSES:
                     break
-            await asyncio.sleep(0.5)
+                await self._next_task_event(task_id, events, _MONITOR_POLL_INTERVAL)
 
     async def close(self):
         """关闭编排器并清理资源"""
         await self.downloader.close()
+        await get_task_write_queue().close()
         logger.debug("Download orchestrator closed")
 
     def update_concurrency_settings(self, max_concurrent: int, max_threads: int):
@@ -0,0 +1,63 @@
+"""In-flight download registry for single-flight coalescing."""
+
+import asyncio
+from typing import Dict, Optional, Tuple
+
+from ncm.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+# (music_id, 解析后的实际下载音质)
+InflightKey = Tuple[str, str]
+
+
+class InflightRegistry:
+    """在途下载登记表 - 同一 (music_id, quality) 同时只允许一个任务真正下载
+
+    第一个登记的任务成为 leader 并执行下载；之后登记的任务拿到 leader 的 Future，
+    等待其完成后直接复用 leader 的成品文件。Future 的结果为 leader 的任务ID，
+    leader 失败时结果为 None，等待者应重新登记并自行下载。
+    """
+
+    def __init__(self):
+        self._owners: Dict[InflightKey, Tuple[int, asyncio.Future]] = {}
+        self._leaders = 0
+        self._coalesced = 0
+
+    def acquire(self, key: InflightKey, task_id: int) -> Optional[asyncio.Future]:
+        """
+        登记在途下载
+
+        Returns:
+            None 表示当前任务成为 leader；否则返回 leader 的 Future
+        """
+        entry = self._owners.get(key)
+        if entry is None:
+            future = asyncio.get_running_loop().create_future()
+            self._owners[key] = (task_id, future)
+            self._leaders += 1
+            return None
+        owner_id, future = entry
+        if owner_id == task_id:
+            return None
+        self._coalesced += 1
+        logger.debug(f"Task {task_id} coalesced onto in-flight task {owner_id} for {key}")
+        return future
+
+    def release(self, key: InflightKey, task_id: int, source_task_id: Optional[int]) -> None:
+        """leader 结束时释放登记，并通知所有等待者"""
+        entry = self._owners.get(key)
+        if entry is None or entry[0] != task_id:
+            return
+        del self._owners[key]
+        future = entry[1]
+        if not future.done():
+            future.set_result(source_task_id)
+
+    def get_stats(self) -> Dict[str, int]:
+        """获取在途登记统计信息"""
+        return {
+            "inflight": len(self._owners),
+            "leaders": self._leaders,
+            "coalesced": self._coalesced,
+        }
@@ -12,11 +12,13 @@ from __future__ import annotations
 import asyncio
 import json
 import os
-import shutil
 from typing import Dict, Any, List, Tuple
 
 from ncm.server.routers.music import PlaylistController
 from ncm.server.routers.music.song import SongController
+from ncm.client.exceptions import CircuitOpenError, RateLimitError
+from ncm.client.protocol.session import warm_up
+from ncm.core.config import get_config_manager
 from ncm.core.logging import get_logger
 from ncm.data.async_session import get_uow_factory
 from ncm.data.models.download_job import DownloadJob
@@ -27,6 +29,8 @@ from ncm.data.repositories.async_download_job_repo import (
 from ncm.data.repositories.async_download_task_repo import (
     AsyncDownloadTaskRepository,
 )
+from ncm.service.cookie import pin_sessions
+from ncm.service.download.library import get_library_index
 from ncm.service.download.models import get_task_cache_registry
 from ncm.service.download.orchestrator import DownloadOrchestrator
 from ncm.service.download.service import AsyncJobService
@@ -39,6 +43,8 @@ logger = get_logger(__name__)
 class DownloadProcess:
     """下载流程服务；与核心编排器解耦，负责作业扫描、任务准备、复制优化与批次调度。"""
 
+    INGEST_CHUNK_SIZE = 500  # 曲目入库的分块大小；每块一个事务
+
     def __init__(self, orchestrator: DownloadOrchestrator):
         """初始化流程服务；自建数据库与控制器依赖，并持有编排器以执行下载工作流。"""
         self.orch = orchestrator
@@ -49,9 +55,9 @@ class DownloadProcess:
         self.storage_manager = StorageManager()  # 存储管理器；生成最终路径与文件移动
         self._song_controller = None  # 懒加载歌曲控制器实例
         self._playlist_controller = None  # 懒加载歌单控制器实例
-        self._copy_locks: dict[str, asyncio.Lock] = (
+        self._copy_locks: dict[tuple[str, str], asyncio.Lock] = (
             {}
-        )  # 针对每个 music_id 的复制锁，避免并发复制冲突
+        )  # 针对每个 (music_id, 音质) 的复制锁，避免并发复制冲突
         self._run_lock = asyncio.Lock()
         self._status: Dict[str, Any] = {
             "running": False,
@@ -104,9 +110,14 @@ class DownloadProcess:
             if not jobs:
                 return await self._finalize_run()
 
+            if get_config_manager().load_sync().client.warm_up_on_sync:
+                await warm_up()
+
             for job in jobs:
                 try:
-                    await self._process_single_job(job, batch_size)
+                    # pinned 会话池策略下，同一作业（含其提交的下载任务）固定使用一个账号
+                    with pin_sessions(f"job:{job.id}"):
+                        await self._process_single_job(job, batch_size)
                 except Exception as e:
                     await self._handle_job_exception(job, e)
 
@@ -161,6 +172,7 @@ class DownloadProcess:
             raise ValueError(f"Unsupported job type: {job.job_type}")
 
         logger.info(f"扫描{job.get_job_name}完成，获取到 {len(tasks)} 首新歌曲")
+        tasks = await self._complete_from_library(job, tasks)
         if len(tasks) == 0:
             return
         submitted_count = await self._handle_batches(job, tasks, batch_size)
@@ -199,22 +211,83 @@ class DownloadProcess:
                 continue
             detail_map[str(music_id)] = track
 
-        async with self.uow_factory() as uow:
-            tasks = await self.task_repo.create_batch_ids_and_get_pending_music(
-                uow.session,
-                job.id,
-                fetch_result.get("effective_ids", []),
+        # _fetch_playlist_tracks 已完成入库并读取过 pending 任务，直接复用，避免再扫一遍
+        tasks: List[DownloadTask] = fetch_result.get("pending_tasks", [])
+
+        hydrated = await get_task_cache_registry().hydrate_song_details(tasks, detail_map)
+        if hydrated < len(tasks):
+            logger.debug(
+                f"Job {job.id}: {len(tasks) - hydrated} tasks without prefetched details"
             )
 
+        return tasks, failed_ids
+
+    async def _complete_from_library(
+        self, job: DownloadJob, tasks: List[DownloadTask]
+    ) -> List[DownloadTask]:
+        """按曲库索引直接完成曲库中已有相同音质、相同嵌入选项文件的任务；返回仍需下载的任务。"""
+        index = get_library_index()
+        await index.ensure_loaded()
         registry = get_task_cache_registry()
+        remaining: List[DownloadTask] = []
+        skipped = 0
         for task in tasks:
-            cache = await registry.get_or_create(task.id, task.music_id)
-            # cache.song_detail = detail_map.get(task.music_id)
-            await cache.set_song_detail_detailed_tracks(
-                detail_map.get(task.music_id, {})
+            hit = index.lookup(task.music_id, job.target_quality)
+            if hit is None:
+                remaining.append(task)
+                continue
+            source_task_id, _ = hit
+            if await self.orch._complete_from_source(task.id, source_task_id):
+                registry.clear(task.id)
+                skipped += 1
+            else:
+                # 仅当来源任务或文件确实已不存在（作业被删除等）时才从索引移除；
+                # 嵌入选项不同或临时的数据库 / IO 错误保留索引项，本次正常下载
+                if not await self._library_source_alive(source_task_id):
+                    index.discard(task.music_id, source_task_id)
+                remaining.append(task)
+        if skipped:
+            logger.info(f"{job.get_job_name}中 {skipped} 首歌曲已在曲库中，直接复用")
+        self._status["skipped_in_library"] = (
+            int(self._status.get("skipped_in_library", 0)) + skipped
+        )
+        return remaining
+
+    async def _library_source_alive(self, source_task_id: int) -> bool:
+        """曲库来源任务是否仍已完成且文件存在；无法确认（如数据库暂时不可用）时视为存在"""
+        try:
+            async with self.uow_factory() as uow:
+                source = await self.orch._get_task_any(uow.session, source_task_id)
+            return bool(
+                source
+                and source.status == "completed"
+                and source.file_path
+                and os.path.exists(source.file_path)
             )
+        except Exception as e:
+            logger.debug(f"Could not verify library source {source_task_id}: {e}")
+            return True
+
+    async def _ingest_music_ids(self, job_id: int, music_ids: List[str]) -> int:
+        """分块写入作业曲目；每块独立提交，避免超大歌单长时间占用 SQLite 写锁。"""
+        inserted = 0
+        chunk_size = self.INGEST_CHUNK_SIZE
+        for i in range(0, len(music_ids), chunk_size):
+            async with self.uow_factory() as uow:
+                inserted += await self.task_repo.upsert_music_ids(
+                    uow.session, job_id, music_ids[i : i + chunk_size]
+                )
+        return inserted
 
-        return tasks, failed_ids
+    async def _list_pending_tasks(self, job_id: int) -> List[DownloadTask]:
+        """通过流式游标读取作业内全部 pending 任务。"""
+        async with self.uow_factory() as uow:
+            return [
+                task
+                async for task in self.task_repo.stream_pending_by_job(
+                    uow.session, job_id
+                )
+            ]
 
     async def _handle_batches(
         self,
@@ -245,18 +318,25 @@ class DownloadProcess:
     async def _try_copy_existing(self, job: DownloadJob, data: dict) -> int | None:
         """尝试基于同音质来源任务进行文件复制并直接完成当前任务；失败则返回 None。"""
         source_task: DownloadTask | None = None  # 来源任务对象（若存在且音质匹配）
+        index = get_library_index()
+        await index.ensure_loaded()
+        hit = index.lookup(data["music_id"], job.target_quality)
+        if hit is None:
+            return None
         async with self.uow_factory() as uow:
-            source_task = await self.task_repo.find_completed_by_music_and_quality(
-                uow.session,
-                data["music_id"],
-                job.target_quality,
-            )
+            # 曲库索引同样收录已归档任务
+            source_task = await self.orch._get_task_any(uow.session, hit[0])
             if not source_task or not source_task.file_path:
                 return None
+            source_job = await self.job_repo.get_by_id(uow.session, source_task.job_id)
+            # 嵌入选项不同时成品文件的标签不同，不能直接复用
+            if not source_job or not self.storage_manager.can_share_inode(source_job, job):
+                return None
         lock = self._copy_locks.setdefault(
-            data["music_id"], asyncio.Lock()
-        )  # 针对 music_id 的复制锁
+            (data["music_id"], source_task.quality), asyncio.Lock()
+        )  # 针对 (music_id, 音质) 的复制锁
         async with lock:
+            target_path = None  # 仅在本次调用成功创建目标文件后赋值
             async with self.uow_factory() as uow:
                 try:
                     new_task = await self.task_repo.create(
@@ -271,22 +351,25 @@ class DownloadProcess:
                     )
 
                     job_obj = await self.job_repo.get_by_id(uow.session, job.id)
-                    target_path = self.storage_manager._generate_final_path(
-                        new_task, job_obj
+                    final_path = self.storage_manager.unique_path(
+                        self.storage_manager._generate_final_path(new_task, job_obj),
+                        new_task.id,
                     )
 
-                    # 确保目标目录存在
-                    from ncm.core.path import prepare_path
-
-                    prepare_path(target_path.parent)
-
-                    shutil.copy2(source_task.file_path, str(target_path))  # 复制文件
+                    link_mode = await asyncio.to_thread(
+                        self.storage_manager.duplicate,
+                        source_task.file_path,
+                        final_path,
+                        allow_hardlink=True,
+                    )  # reflink / 硬链接 / 复制，放到线程中执行以免阻塞事件循环
+                    target_path = final_path
                     await self.task_repo.update(
                         uow.session,
                         new_task.id,
                         status="completed",
                         file_path=str(target_path),
                         file_name=target_path.name,
+                        link_mode=link_mode,
                         progress_flags=source_task.progress_flags,
                         error_message=json.dumps(
                             {
@@ -301,14 +384,14 @@ class DownloadProcess:
                     )
                     return new_task.id
                 except Exception as ce:
-                    # 回滚由 UnitOfWork 处理；确保删除已复制的文件
-                    try:
-                        if "target_path" in locals() and os.path.exists(
-                            str(target_path)
-                        ):
-                            os.remove(str(target_path))  # 清理失败复制的残留目标文件
-                    except Exception:
-                        pass
+                    # 异常已被捕获，UnitOfWork 正常退出时会提交，需显式回滚新建的任务
+                    await uow.rollback()
+                    # 只删除本次创建的目标文件，已存在的文件属于其他任务
+                    if target_path is not None:
+                        try:
+                            target_path.unlink(missing_ok=True)
+                        except OSError:
+                            pass
                     logger.warning(
                         f"Copy optimization failed for music {data['music_id']}: {ce}"
                     )
@@ -359,18 +442,23 @@ class DownloadProcess:
                             ids.append(str(item))
                     all_ids = list(dict.fromkeys(ids))  # 去重保序
                     break
-                status = getattr(resp, "status", 0) or 0
-                if status in (429, 503):
-                    await asyncio.sleep(delay)
-                    delay = min(delay * 2, 8.0)
-                    continue
-                    # 触发降级路径；返回空结果以避免阻塞
+                # 触发降级路径；返回空结果以避免阻塞
                 return {
                     "tracks": [],
+                    "pending_tasks": [],
                     "effective_ids": [],
                     "failed_ids": [],
                     # "skipped_existing_ids": [],
                 }
+            except CircuitOpenError as e:
+                # 接口已熔断：熔断器本身就是退避，立即重试只会再次被拒绝
+                logger.warning(f"Fetch playlist detail for {playlist_id} skipped: {e}")
+                break
+            except RateLimitError as e:
+                # 被限流时共享限流器已降速，重试请求会在令牌桶中排队，不再额外 sleep
+                logger.warning(
+                    f"Fetch playlist detail throttled for {playlist_id} (attempt {attempt + 1}): {e}"
+                )
             except Exception as e:
                 logger.warning(
                     f"Fetch playlist detail failed for {playlist_id} (attempt {attempt + 1}): {e}"
@@ -380,11 +468,10 @@ class DownloadProcess:
 
         # 上述代码会取到all_ids，已知歌单的tracks包含歌单完整id列表
         # 作业内去重：排除已存在任务，仅保留 pending 状态
-        async with self.uow_factory() as uow:
-            pending_tasks = await self.task_repo.create_batch_ids_and_get_pending_music(
-                uow.session, job_id, all_ids
-            )
-            effective_ids = [t.music_id for t in pending_tasks]
+        await self._ingest_music_ids(job_id, all_ids)
+        # pending 任务只读取一次，随结果返回给调用方，不再重复扫描
+        pending_tasks = await self._list_pending_tasks(job_id)
+        effective_ids = [t.music_id for t in pending_tasks]
 
         # existing_ids: set[str] = set()  # 当前作业已存在任务的 music_id 集合
         # async with self.uow_factory() as uow:
@@ -435,6 +522,7 @@ class DownloadProcess:
                 failed_ids.extend(chunk)
         return {
             "tracks": detailed_tracks,
+            "pending_tasks": pending_tasks,
             "effective_ids": effective_ids,
             "failed_ids": failed_ids,
             # "skipped_existing_ids": skipped_existing_ids,
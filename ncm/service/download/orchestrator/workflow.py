@@ -75,16 +75,16 @@ class WorkflowEngine:
                 raise RuntimeError("Task or job not found during completion check")
             
             if TaskProgress.is_fully_completed(task.progress_flags, job):
-                await self.task_service.update_status(task_id, "completed")
+                await self.task_service.update_status(task_id, "completed", sync=True)
                 logger.info(f"{task.get_music_name} 下载完成")
                 logger.debug(f"Workflow completed successfully for task {task_id}")
             else:
-                await self.task_service.update_status(task_id, "failed", "Not all required steps completed")
+                await self.task_service.update_status(task_id, "failed", "Not all required steps completed", sync=True)
                 raise RuntimeError("Not all required steps completed")
             
         except Exception as e:
             logger.error(f"Workflow failed for task {task_id}: {str(e)}")
-            await self.task_service.update_status(task_id, "failed", str(e))
+            await self.task_service.update_status(task_id, "failed", str(e), sync=True)
             raise
     
     async def _execute_music_download(self, task_id: int):
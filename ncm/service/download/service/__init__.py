@@ -3,5 +3,6 @@
 from .async_task_service import AsyncTaskService
 from .async_task_uow_service import DownloadAsyncService
 from .async_job_service import AsyncJobService
+from .task_write_queue import TaskWriteQueue, get_task_write_queue
 
-__all__ = ['AsyncTaskService', 'DownloadAsyncService', 'AsyncJobService']
+__all__ = ['AsyncTaskService', 'DownloadAsyncService', 'AsyncJobService', 'TaskWriteQueue', 'get_task_write_queue']
@@ -1,34 +1,62 @@
 from __future__ import annotations
 
-from typing import Optional
+from typing import Optional, Union
 from ncm.data.async_session import get_uow_factory
 from ncm.data.repositories.async_download_task_repo import AsyncDownloadTaskRepository
+from ncm.data.repositories.async_download_task_archive_repo import AsyncDownloadTaskArchiveRepository
 from ncm.data.repositories.async_download_job_repo import AsyncDownloadJobRepository
 from ncm.data.models.download_task import TaskProgress
 from ncm.data.models.download_job import DownloadJob
 from ncm.data.models.download_task import DownloadTask
+from ncm.data.models.download_task_archive import DownloadTaskArchive
 from ncm.core.time import UTC_CLOCK
+from ncm.service.download.service.task_write_queue import get_task_write_queue
 
 
 
 class AsyncTaskService:
+    """任务读写服务；写入经 TaskWriteQueue 合并后批量落库，sync=True 时同步落库（阶段检查点）"""
+
     def __init__(self, db_url: Optional[str] = None):
         self.uow_factory = get_uow_factory(db_url)
         self.task_repo = AsyncDownloadTaskRepository()
+        self.archive_repo = AsyncDownloadTaskArchiveRepository()
         self.job_repo = AsyncDownloadJobRepository()
+        self.write_queue = get_task_write_queue()
+
+    async def _read_barrier(self, task_id: int) -> None:
+        """读己之写：读取前先落库该任务尚未写入的更新"""
+        if self.write_queue.has_pending(task_id):
+            await self.write_queue.flush()
+
+    async def _submit(self, task_id: int, sync: bool, progress_flag: int = 0, **fields) -> None:
+        self.write_queue.submit(task_id, progress_flag=progress_flag, **fields)
+        if sync:
+            await self.write_queue.flush()
 
-    async def get_task(self, task_id: int) -> Optional[DownloadTask]:
+    async def get_task(self, task_id: int) -> Optional[Union[DownloadTask, DownloadTaskArchive]]:
+        """读取任务；download_task 中没有时回退到归档表"""
+        await self._read_barrier(task_id)
         async with self.uow_factory() as uow:
-            return await self.task_repo.get_by_id(uow.session, task_id)
+            task = await self.task_repo.get_by_id(uow.session, task_id)
+            if task is None:
+                task = await self.archive_repo.get_by_id(uow.session, task_id)
+            return task
 
     async def get_job_for_task(self, task_id: int) -> Optional[DownloadJob]:
+        task = await self.get_task(task_id)
+        if not task:
+            return None
         async with self.uow_factory() as uow:
-            task = await self.task_repo.get_by_id(uow.session, task_id)
-            if not task:
-                return None
             return await self.job_repo.get_by_id(uow.session, task.job_id)
 
+    async def restore_archived(self, task_id: int) -> bool:
+        """修改已归档任务前先将其移回 download_task；未归档时返回 False"""
+        async with self.uow_factory() as uow:
+            return await self.archive_repo.restore(uow.session, task_id)
+
     async def is_flag_set(self, task_id: int, flag: int) -> bool:
+        await self._read_barrier(task_id)
         async with self.uow_factory() as uow:
             task = await self.task_repo.get_by_id(uow.session, task_id)
             if not task:
@@ -45,9 +73,8 @@ class AsyncTaskService:
     async def set_job_status_scanning(self, job_id: int):
         await self.update_job_status(job_id, "scanning")
 
-    async def update_progress(self, task_id: int, progress_flag: int):
-        async with self.uow_factory() as uow:
-            await self.task_repo.update_progress(uow.session, task_id, progress_flag)
+    async def update_progress(self, task_id: int, progress_flag: int, sync: bool = False):
+        await self._submit(task_id, sync, progress_flag=progress_flag)
 
     async def set_progress_music_downloaded(self, task_id: int):
         await self.update_progress(task_id, TaskProgress.MUSIC_DOWNLOADED)
@@ -66,15 +93,18 @@ class AsyncTaskService:
 
     
 
-    async def update_status(self, task_id: int, status: str, error_message: Optional[str] = None):
-        async with self.uow_factory() as uow:
-            await self.task_repo.update_status(uow.session, task_id, status, error_message)
+    async def update_status(self, task_id: int, status: str, error_message: Optional[str] = None,
+                            sync: bool = False):
+        fields = {"status": status}
+        if error_message is not None:
+            fields["error_message"] = error_message
+        await self._submit(task_id, sync, **fields)
 
-    async def update_fields(self, task_id: int, **kwargs):
-        async with self.uow_factory() as uow:
-            await self.task_repo.update(uow.session, task_id, **kwargs)
+    async def update_fields(self, task_id: int, sync: bool = False, **kwargs):
+        await self._submit(task_id, sync, **kwargs)
 
     async def check_fully_completed(self, task_id: int) -> bool:
+        await self._read_barrier(task_id)
         async with self.uow_factory() as uow:
             task = await self.task_repo.get_by_id(uow.session, task_id)
             if not task:
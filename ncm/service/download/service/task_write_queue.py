@@ -0,0 +1,205 @@
+"""Write-behind queue that coalesces task status/progress updates."""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from ncm.core.logging import get_logger
+from ncm.data.async_session import get_uow_factory
+from ncm.data.repositories.async_download_task_repo import AsyncDownloadTaskRepository
+from ncm.service.download.events import get_task_event_bus
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class _PendingUpdate:
+    fields: Dict[str, Any] = field(default_factory=dict)
+    progress_flags: int = 0
+    statuses: List[str] = field(default_factory=list)
+    attempts: int = 0
+
+    def merge(self, newer: "_PendingUpdate") -> None:
+        """合并更新的写入意图；字段后写覆盖，标志位按位或"""
+        self.fields.update(newer.fields)
+        self.progress_flags |= newer.progress_flags
+        self.statuses.extend(newer.statuses)
+
+
+class TaskWriteQueue:
+    """任务写入队列 - 单写者后台持久化
+
+    各工作流提交写入意图，同一任务的多次更新在内存中合并；
+    每 interval_ms 毫秒或累计 max_items 个任务时在一个事务内批量写入，
+    减少 SQLite 写锁争用。阶段检查点可调用 flush() 同步落库。
+    """
+
+    # 连续失败达到该次数时记录错误；写入意图不会被丢弃，状态与进度必须最终落库
+    ALERT_ATTEMPTS = 3
+    # 落库失败后后台重试的最长退避时间（秒）
+    MAX_BACKOFF = 5.0
+
+    def __init__(self, interval_ms: int = 50, max_items: int = 200):
+        self.interval = interval_ms / 1000
+        self.max_items = max_items
+        self.uow_factory = get_uow_factory()
+        self.task_repo = AsyncDownloadTaskRepository()
+        self._pending: Dict[int, _PendingUpdate] = {}
+        # 正在写入（事务尚未提交）的批次，读屏障同样需要等待它
+        self._inflight: Dict[int, _PendingUpdate] = {}
+        self._flush_lock = asyncio.Lock()
+        self._has_pending = asyncio.Event()
+        self._full = asyncio.Event()
+        self._worker: Optional[asyncio.Task] = None
+        self._submitted = 0
+        self._written = 0
+        self._flushes = 0
+        self._failed_writes = 0
+
+    def submit(self, task_id: int, progress_flag: int = 0, **fields) -> None:
+        """提交写入意图（不等待落库）"""
+        entry = self._pending.setdefault(task_id, _PendingUpdate())
+        entry.fields.update(fields)
+        entry.progress_flags |= progress_flag
+        if "status" in fields:
+            entry.statuses.append(fields["status"])
+        self._submitted += 1
+
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.create_task(self._run())
+        self._has_pending.set()
+        if len(self._pending) >= self.max_items:
+            self._full.set()
+
+    def has_pending(self, task_id: int) -> bool:
+        """该任务是否有尚未提交的写入（排队中或正在写入）"""
+        return task_id in self._pending or task_id in self._inflight
+
+    async def flush(self) -> None:
+        """同步落库：返回时此前提交的全部写入意图均已提交事务；写入失败时抛出异常，失败的意图保留在队列中"""
+        async with self._flush_lock:
+            if not self._pending:
+                return
+            batch, self._pending = self._pending, {}
+            self._inflight = batch
+            try:
+                written, failed, error = await self._write(batch)
+            except BaseException:
+                # 被取消时整批放回队列
+                self._inflight = {}
+                self._requeue(batch)
+                raise
+            # 与 _requeue 之间没有 await，读屏障不会看到既不在队列也不在写入中的空窗
+            self._inflight = {}
+            self._requeue(failed)
+            self._written += len(written)
+            self._flushes += 1
+
+        # 提交后再发布事件，订阅者读库即可看到最新状态
+        bus = get_task_event_bus()
+        for task_id, entry in written.items():
+            if entry.progress_flags:
+                bus.publish(task_id, progress_flag=entry.progress_flags)
+            for status in entry.statuses:
+                bus.publish(task_id, status=status)
+        if error is not None:
+            raise error
+
+    async def _apply(self, batch: Dict[int, _PendingUpdate]) -> None:
+        async with self.uow_factory() as uow:
+            for task_id, entry in batch.items():
+                await self.task_repo.apply_changes(
+                    uow.session, task_id, entry.progress_flags, **entry.fields
+                )
+
+    async def _write(
+        self, batch: Dict[int, _PendingUpdate]
+    ) -> Tuple[Dict[int, _PendingUpdate], Dict[int, _PendingUpdate], Optional[Exception]]:
+        """在一个事务内写入整批；失败时逐个任务重试，隔离出错的任务。返回 (已写入, 失败, 最后的异常)"""
+        try:
+            await self._apply(batch)
+            return batch, {}, None
+        except Exception as e:
+            if len(batch) == 1:
+                return {}, batch, e
+            logger.warning(f"Task write batch of {len(batch)} failed ({e}), retrying per task")
+
+        written: Dict[int, _PendingUpdate] = {}
+        failed: Dict[int, _PendingUpdate] = {}
+        error: Optional[Exception] = None
+        for task_id, entry in batch.items():
+            try:
+                await self._apply({task_id: entry})
+                written[task_id] = entry
+            except Exception as e:
+                failed[task_id] = entry
+                error = e
+        return written, failed, error
+
+    def _requeue(self, failed: Dict[int, _PendingUpdate]) -> None:
+        """写入失败时放回队列，后提交的意图优先；从不丢弃，连续失败过多时记录错误"""
+        for task_id, entry in failed.items():
+            entry.attempts += 1
+            self._failed_writes += 1
+            if entry.attempts == self.ALERT_ATTEMPTS:
+                logger.error(f"Task {task_id} updates failed {entry.attempts} times, still retrying: {entry.fields}")
+            newer = self._pending.get(task_id)
+            if newer is not None:
+                entry.merge(newer)
+            self._pending[task_id] = entry
+        if self._pending:
+            self._has_pending.set()
+
+    async def _run(self) -> None:
+        failures = 0
+        while True:
+            await self._has_pending.wait()
+            try:
+                await asyncio.wait_for(self._full.wait(), timeout=self.interval)
+            except asyncio.TimeoutError:
+                pass
+            self._has_pending.clear()
+            self._full.clear()
+            try:
+                await self.flush()
+                failures = 0
+            except Exception as e:
+                failures += 1
+                logger.exception(f"Task write queue flush failed: {e}")
+                # 数据库持续不可用时指数退避，避免空转
+                await asyncio.sleep(min(self.interval * 2 ** failures, self.MAX_BACKOFF))
+
+    async def close(self) -> None:
+        """落库剩余写入并停止后台任务"""
+        try:
+            await self.flush()
+        finally:
+            if self._worker is not None:
+                self._worker.cancel()
+                try:
+                    await self._worker
+                except asyncio.CancelledError:
+                    pass
+                self._worker = None
+
+    def get_stats(self) -> Dict[str, int]:
+        """获取队列统计信息"""
+        return {
+            "pending": len(self._pending),
+            "submitted": self._submitted,
+            "written": self._written,
+            "flushes": self._flushes,
+            "failed_writes": self._failed_writes,
+        }
+
+
+_task_write_queue: Optional[TaskWriteQueue] = None
+
+
+def get_task_write_queue() -> TaskWriteQueue:
+    global _task_write_queue
+    if _task_write_queue is None:
+        _task_write_queue = TaskWriteQueue()
+    return _task_write_queue
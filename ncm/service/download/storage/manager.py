@@ -1,8 +1,11 @@
 """Storage manager implementation for new task-driven architecture."""
 
+import os
 import shutil
+import sys
 from pathlib import Path
 
+from ncm.core.config import get_config_manager
 from ncm.core.logging import get_logger
 from ncm.service.download.service.async_task_service import AsyncTaskService
 from ncm.data.models.download_job import DownloadJob
@@ -11,6 +14,57 @@ from ncm.core.path import prepare_path, sanitize_filename
 
 logger = get_logger(__name__)
 
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+# linux/fs.h: _IOW(0x94, 9, int)
+_FICLONE = 0x40049409
+
+
+def _reflink(source: Path, target: Path) -> bool:
+    """写时复制克隆（btrfs / xfs / bcachefs 等）；不支持或目标已存在时返回 False 且不留下残留文件"""
+    if fcntl is None or not sys.platform.startswith("linux"):
+        return False
+    try:
+        dst_fd = os.open(target, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644)
+    except FileExistsError:
+        return False
+    try:
+        with open(source, "rb") as src:
+            fcntl.ioctl(dst_fd, _FICLONE, src.fileno())
+        cloned = True
+    except OSError:
+        cloned = False
+    finally:
+        os.close(dst_fd)
+    if not cloned:
+        target.unlink(missing_ok=True)
+        return False
+    shutil.copystat(source, target)
+    return True
+
+
+def _hardlink(source: Path, target: Path) -> bool:
+    """硬链接；跨设备、文件系统不支持或目标已存在时返回 False"""
+    try:
+        os.link(source, target)
+        return True
+    except OSError:
+        return False
+
+
+def _copy(source: Path, target: Path) -> None:
+    """完整复制；目标已存在时抛出 FileExistsError，绝不覆盖其他任务的文件"""
+    with open(source, "rb") as src, open(target, "xb") as dst:
+        try:
+            shutil.copyfileobj(src, dst, 1024 * 1024)
+        except BaseException:
+            dst.close()
+            target.unlink(missing_ok=True)
+            raise
+    shutil.copystat(source, target)
 
 
 class StorageManager:
@@ -56,9 +110,7 @@ class StorageManager:
             prepare_path(final_path.parent)
 
             # 检查目标文件是否存在，若存在则添加task_id后缀
-            if final_path.exists():
-                final_path = final_path.with_name(f"{final_path.stem}_{task_id}{final_path.suffix}")
-                logger.debug(f"Target file exists, renaming to: {final_path.name}")
+            final_path = self.unique_path(final_path, task_id)
 
             # 移动文件到最终位置
             temp_path = Path(task.file_path)
@@ -68,6 +120,7 @@ class StorageManager:
                 task_id
                 , file_path=str(final_path)
                 , file_name=final_path.name
+                , link_mode=None
             )
             logger.debug(f"File finalized successfully: {final_path}")
             return True
@@ -77,6 +130,60 @@ class StorageManager:
             await self.task_service.update_fields(task_id, error_message=f"Finalization failed: {str(e)}")
             return False
 
+    @staticmethod
+    def can_share_inode(source_job: DownloadJob, target_job: DownloadJob) -> bool:
+        """两个作业写入的标签一致时，成品文件内容相同，可以共享同一 inode"""
+        return (
+            bool(source_job.embed_metadata) == bool(target_job.embed_metadata)
+            and bool(source_job.embed_cover) == bool(target_job.embed_cover)
+            and bool(source_job.embed_lyrics) == bool(target_job.embed_lyrics)
+        )
+
+    def duplicate(self, source_path: str, target_path: Path, allow_hardlink: bool = False) -> str:
+        """
+        将已完成的成品文件去重到另一个作业的最终位置
+
+        按配置 download.dedup_mode 依次尝试 reflink -> hardlink -> copy。
+        同步阻塞（copy 需要读写整个文件），异步调用方应通过 asyncio.to_thread 执行。
+
+        Args:
+            source_path: 来源文件路径
+            target_path: 目标文件路径（不得已存在，可用 unique_path 生成）
+            allow_hardlink: 是否允许硬链接（见 can_share_inode）
+
+        Returns:
+            实际使用的方式：'reflink' / 'hardlink' / 'copy'
+
+        Raises:
+            FileExistsError: 目标已存在；此时不会修改或删除已有文件
+        """
+        mode = get_config_manager().model().download.dedup_mode
+        source = Path(source_path)
+        prepare_path(target_path.parent)
+
+        if target_path.exists():
+            raise FileExistsError(f"Duplicate target already exists: {target_path}")
+
+        if mode in ("auto", "reflink") and _reflink(source, target_path):
+            link_mode = "reflink"
+        elif mode in ("auto", "hardlink") and allow_hardlink and _hardlink(source, target_path):
+            link_mode = "hardlink"
+        else:
+            _copy(source, target_path)
+            link_mode = "copy"
+
+        logger.debug(f"File duplicated ({link_mode}): {source_path} -> {target_path}")
+        return link_mode
+
+    @staticmethod
+    def unique_path(path: Path, task_id: int) -> Path:
+        """目标文件已存在时添加 task_id 后缀，避免占用其他任务的文件"""
+        if not path.exists():
+            return path
+        unique = path.with_name(f"{path.stem}_{task_id}{path.suffix}")
+        logger.debug(f"Target file exists, renaming to: {unique.name}")
+        return unique
+
     def _generate_final_path(self, task: DownloadTask, job: DownloadJob) -> Path:
         """
         生成最终文件路径
@@ -2,6 +2,7 @@ from pathlib import Path
 from typing import Optional, Union
 
 from ncm.core.logging import get_logger
+from ncm.service.download.library import get_library_index
 from .base import BaseMusicService
 from ncm.service.music.utils import is_within, extract_lyrics
 
@@ -85,12 +86,21 @@ class DetailService(BaseMusicService):
             }
 
         try:
+            await self._task_service.restore_archived(int(task_id))
+            # 硬链接去重的文件与其他任务共享 inode，unlink 只移除本任务的目录项，磁盘空间不会释放
+            space_released = True
             if file_path.exists():
+                space_released = file_path.stat().st_nlink <= 1
                 file_path.unlink()
-            await self._task_service.update_fields(int(task_id), file_path=None, file_name=None, file_size=None)
+            if not space_released:
+                logger.debug(f"Deleted shared link for task {task_id} ({task.link_mode}): {file_path}")
+            await self._task_service.update_fields(
+                int(task_id), sync=True, file_path=None, file_name=None, file_size=None, link_mode=None
+            )
+            get_library_index().discard(task.music_id, task.id)
             return {
                 "status": 200,
-                "body": {"code": 200, "message": "OK"},
+                "body": {"code": 200, "message": "OK", "data": {"space_released": space_released}},
             }
         except Exception as e:
             logger.exception("Failed to delete local music file")
@@ -143,13 +153,17 @@ class DetailService(BaseMusicService):
             }
 
         try:
+            await self._task_service.restore_archived(int(task_id))
             file_path.rename(target_path)
             await self._task_service.update_fields(
                 int(task_id),
+                sync=True,
                 file_path=str(target_path),
                 file_name=target_path.name,
             )
             updated = await self._task_service.get_task(int(task_id))
+            if updated and updated.status == "completed":
+                get_library_index().add(updated.music_id, updated.quality, updated.id, str(target_path))
             return {
                 "status": 200,
                 "body": {
@@ -0,0 +1,76 @@
+"""download_task 归档 / 恢复与任务 id 分配"""
+
+import asyncio
+from datetime import timedelta
+
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from ncm.core.time import UTC_CLOCK
+from ncm.data.async_session import make_uow_factory
+from ncm.data.migration.auto import run_migrations
+from ncm.data.repositories.async_download_job_repo import AsyncDownloadJobRepository
+from ncm.data.repositories.async_download_task_archive_repo import AsyncDownloadTaskArchiveRepository
+from ncm.data.repositories.async_download_task_repo import AsyncDownloadTaskRepository
+
+
+def _migrated_uow_factory(tmp_path, monkeypatch):
+    db_path = tmp_path / "ncm.sqlite"
+    monkeypatch.setenv("ALEMBIC_DB_PATH", str(db_path))
+    engine = create_engine(f"sqlite:///{db_path}")
+    try:
+        run_migrations(engine, f"sqlite:///{db_path}")
+    finally:
+        engine.dispose()
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{db_path}")
+    return async_engine, make_uow_factory(async_sessionmaker(async_engine, expire_on_commit=False))
+
+
+def test_task_ids_are_not_reused_after_job_delete_and_archive(tmp_path, monkeypatch):
+    engine, uow_factory = _migrated_uow_factory(tmp_path, monkeypatch)
+    job_repo = AsyncDownloadJobRepository()
+    task_repo = AsyncDownloadTaskRepository()
+    archive_repo = AsyncDownloadTaskArchiveRepository()
+
+    async def scenario():
+        done_at = UTC_CLOCK.now() - timedelta(days=30)
+        async with uow_factory() as uow:
+            kept = await job_repo.create(uow.session, job_name="kept", job_type="playlist",
+                                         source_type="playlist", source_id="1", storage_path=str(tmp_path))
+            dropped = await job_repo.create(uow.session, job_name="dropped", job_type="playlist",
+                                            source_type="playlist", source_id="2", storage_path=str(tmp_path))
+            archived_ids = []
+            for music_id in ("1", "2"):
+                task = await task_repo.create(uow.session, music_id=music_id, job_id=kept.id)
+                await task_repo.update(uow.session, task.id, returning=False,
+                                       status="completed", completed_at=done_at)
+                archived_ids.append(task.id)
+            # 持有当前最大 id 的任务所在作业
+            await task_repo.create(uow.session, music_id="3", job_id=dropped.id)
+
+        # 删除作业（与 delete_download_job 相同的三步）
+        async with uow_factory() as uow:
+            await task_repo.delete_by_job(uow.session, dropped.id)
+            await archive_repo.delete_by_job(uow.session, dropped.id)
+            await job_repo.delete(uow.session, dropped.id)
+
+        async with uow_factory() as uow:
+            assert await archive_repo.archive_completed_before(uow.session, UTC_CLOCK.now()) == 2
+
+        async with uow_factory() as uow:
+            fresh = await task_repo.create(uow.session, music_id="4", job_id=kept.id)
+        assert fresh.id > max(archived_ids)
+
+        async with uow_factory() as uow:
+            for task_id in archived_ids:
+                assert await archive_repo.restore(uow.session, task_id)
+
+        async with uow_factory() as uow:
+            for task_id, music_id in zip(archived_ids, ("1", "2")):
+                restored = await task_repo.get_by_id(uow.session, task_id)
+                assert restored.music_id == music_id
+                assert restored.status == "completed"
+            assert (await task_repo.get_by_id(uow.session, fresh.id)).music_id == "4"
+        await engine.dispose()
+
+    asyncio.run(scenario())